@@ -0,0 +1,98 @@
+"""
+benchmarks.bench_project_parser
+
+Time sequential parsing against the parallel, cached project parser.
+
+Usage: python benchmarks/bench_project_parser.py [directory ...]
+
+Without arguments, the Python standard library is parsed. The cache is kept
+in a temporary directory, so the first run is always cold. With --outline,
+each tree is reduced to its top-level definitions, which is what is cached.
+"""
+
+import argparse
+import ast
+import glob
+import os
+import sys
+import tempfile
+import time
+
+from agentix.tools.project_parser import parse_project, parse_source
+
+
+def python_files(directories: list[str], limit: int) -> list[str]:
+    """Return up to limit Python files below the directories."""
+    paths = []
+    for directory in directories:
+        paths.extend(glob.glob(os.path.join(directory, "**", "*.py"), recursive=True))
+    return sorted(paths)[:limit]
+
+
+def outline(tree) -> list[str]:
+    """Return the names of the top-level definitions of an ast or LibCST module."""
+    names = []
+    for node in tree.body:
+        name = getattr(node, "name", None)
+        if name is not None:
+            names.append(getattr(name, "value", name))
+    return names
+
+
+def sequential(paths: list[str], parser: str, derive) -> int:
+    """Parse the files one after another, as cst_modules and ast_module did."""
+    parsed = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            source = f.read()
+        try:
+            parse_source(source, path, parser, derive)
+        except (SyntaxError, ValueError):
+            continue
+        parsed += 1
+    return parsed
+
+
+def timed(label: str, function) -> float:
+    """Run function once and print its duration."""
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    print(f"  {label}: {seconds:.2f} s ({result} files)")
+    return seconds
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "directories", nargs="*", default=[os.path.dirname(ast.__file__)]
+    )
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--parser", choices=("ast", "cst"), default="cst")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--outline", action="store_true")
+    args = parser.parse_args()
+    derive = outline if args.outline else None
+    paths = python_files(args.directories, args.files)
+    print(f"{len(paths)} files, {args.parser}{' outline' if derive else ''}")
+    with tempfile.TemporaryDirectory() as cache_dir, open(os.devnull, "w") as null:
+        stderr, sys.stderr = sys.stderr, null
+        try:
+            base = timed("sequential", lambda: sequential(paths, args.parser, derive))
+            for run in ("cold", "warm"):
+                seconds = timed(
+                    f"parallel {run}",
+                    lambda: len(
+                        parse_project(
+                            paths, args.parser, derive, cache_dir, args.workers
+                        )
+                    ),
+                )
+                print(f"    {base / seconds:.1f}x")
+        finally:
+            sys.stderr = stderr
+
+
+if __name__ == "__main__":
+    sys.exit(main())
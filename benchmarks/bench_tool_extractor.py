@@ -0,0 +1,70 @@
+"""
+benchmarks.bench_tool_extractor
+
+Compare the ast and LibCST tool extractor backends on large modules.
+
+Usage: python benchmarks/bench_tool_extractor.py [module.py ...]
+
+Without arguments, a synthetic module is generated by repeating agentix's own
+tool modules until it holds about --functions functions.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+from agentix.tools.describe_tools import extract_tools_from_code
+
+TOOLS_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "src", "agentix", "tools", "*.py"
+)
+
+
+def synthetic_module(functions: int) -> str:
+    """Repeat the agentix tool modules until they define `functions` functions."""
+    sources = []
+    for path in sorted(glob.glob(TOOLS_DIR)):
+        with open(path, "r", encoding="utf8") as f:
+            sources.append(f.read())
+    unit = "\n\n".join(sources)
+    per_unit = len(extract_tools_from_code(unit)) or 1
+    return "\n\n".join([unit] * max(1, functions // per_unit))
+
+
+def bench(name: str, source: str, repeat: int) -> None:
+    """Time both backends on one source and print the speedup."""
+    times = {}
+    for backend in ("ast", "libcst"):
+        times[backend] = min(
+            timeit.repeat(
+                lambda b=backend: extract_tools_from_code(source, backend=b),
+                number=1,
+                repeat=repeat,
+            )
+        )
+    tools = len(extract_tools_from_code(source))
+    print(
+        f"{name}: {len(source.splitlines())} lines, {tools} tools | "
+        f"ast {times['ast'] * 1000:.1f} ms | libcst {times['libcst'] * 1000:.1f} ms | "
+        f"{times['libcst'] / times['ast']:.1f}x"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("modules", nargs="*", help="Python modules to extract from")
+    parser.add_argument("--functions", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if not args.modules:
+        bench("synthetic", synthetic_module(args.functions), args.repeat)
+    for path in args.modules:
+        with open(path, "r", encoding="utf8") as f:
+            bench(path, f.read(), args.repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
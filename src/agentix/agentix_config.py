@@ -9,7 +9,16 @@ from dataclasses import dataclass
 
 import tomli
 
-from .constants import DEFAULT_SESSION_ID, DEFAULT_TEMPERATURE
+from .constants import (
+    ATTACHMENT_BUDGET_TOKENS,
+    ATTACHMENT_MAX_BYTES,
+    ATTACHMENT_MAX_TOKENS,
+    DEFAULT_SESSION_ID,
+    DEFAULT_TEMPERATURE,
+    REPO_MAP_BUDGET_TOKENS,
+    TOOLS_BUDGET_TOKENS,
+    TOOLS_TOP_K,
+)
 
 # pylint: disable=too-many-instance-attributes
 
@@ -29,10 +38,21 @@ class AgentixConfig:
     user: list[str] | None = None
     file_path: list[str] | None = None
     replace_file: bool = False
+    edit_mode: str = "whole"
+    validate_edits: bool = False
     serve: bool = False
     port: int = 8000
     with_frontend: bool = False
     tools: list[str] | None = None
+    embedding_model: str | None = None
+    attachment_max_bytes: int = ATTACHMENT_MAX_BYTES
+    attachment_max_tokens: int = ATTACHMENT_MAX_TOKENS
+    attachment_budget_tokens: int = ATTACHMENT_BUDGET_TOKENS
+    slice_code: bool = False
+    repo_map: str | None = None
+    repo_map_tokens: int = REPO_MAP_BUDGET_TOKENS
+    tools_top_k: int = TOOLS_TOP_K
+    tools_budget_tokens: int = TOOLS_BUDGET_TOKENS
 
     @property
     def action(self) -> str:
@@ -118,7 +138,10 @@ class AgentixConfig:
             type=str,
             action="append",
             dest="file_path",
-            help="Path to the file containing the prompt",
+            help=(
+                "File, directory, or glob pattern to attach (honors .gitignore); "
+                "add ::minify, ::outline or ::slice to reduce Python files"
+            ),
         )
         args.add_argument(
             "--replace-file",
@@ -127,6 +150,21 @@ class AgentixConfig:
             action="store_true",
             help="Replace the file contents with the LLM output",
         )
+        args.add_argument(
+            "--edit-mode",
+            type=str,
+            dest="edit_mode",
+            choices=["whole", "diff"],
+            default="whole",
+            help="With --replace-file, have the LLM send whole files or diffs",
+        )
+        args.add_argument(
+            "--validate-edits",
+            dest="validate_edits",
+            default=False,
+            action="store_true",
+            help="Check replaced Python files with black, isort and flake8",
+        )
         args.add_argument(
             "--debug", type=bool, default=False, help="Enable debug output"
         )
@@ -159,6 +197,69 @@ class AgentixConfig:
             dest="tools",
             help="Specify tools to use",
         )
+        args.add_argument(
+            "--embedding-model",
+            type=str,
+            dest="embedding_model",
+            default=None,
+            help="Ollama embedding model for cross-session memory (disabled if unset)",
+        )
+        args.add_argument(
+            "--attachment-max-bytes",
+            type=int,
+            dest="attachment_max_bytes",
+            default=ATTACHMENT_MAX_BYTES,
+            help="Larger attachments are sampled from their head and tail",
+        )
+        args.add_argument(
+            "--attachment-max-tokens",
+            type=int,
+            dest="attachment_max_tokens",
+            default=ATTACHMENT_MAX_TOKENS,
+            help="Token budget per attachment; reading stops once it is used up",
+        )
+        args.add_argument(
+            "--attachment-budget-tokens",
+            type=int,
+            dest="attachment_budget_tokens",
+            default=ATTACHMENT_BUDGET_TOKENS,
+            help="Token budget for all attachments; the most relevant files go first",
+        )
+        args.add_argument(
+            "--slice-code",
+            dest="slice_code",
+            default=False,
+            action="store_true",
+            help="Send only the Python symbols relevant to the prompt, outline the rest",
+        )
+        args.add_argument(
+            "--repo-map",
+            type=str,
+            dest="repo_map",
+            default=None,
+            help="Send an outline of the Python modules under this directory",
+        )
+        args.add_argument(
+            "--repo-map-tokens",
+            type=int,
+            dest="repo_map_tokens",
+            default=REPO_MAP_BUDGET_TOKENS,
+            help="Token budget for the repo map; the most relevant modules go first",
+        )
+        args.add_argument(
+            "--tools-top-k",
+            type=int,
+            dest="tools_top_k",
+            default=TOOLS_TOP_K,
+            help="Most tools to describe; the most relevant to the prompt are kept",
+        )
+        args.add_argument(
+            "--tools-budget-tokens",
+            type=int,
+            dest="tools_budget_tokens",
+            default=TOOLS_BUDGET_TOKENS,
+            help="Token budget for the tools prompt",
+        )
         args: Namespace = args.parse_args()
 
         return AgentixConfig(
@@ -172,10 +273,21 @@ class AgentixConfig:
             user=args.user,
             file_path=args.file,
             replace_file=args.replace_file,
+            edit_mode=args.edit_mode,
+            validate_edits=args.validate_edits,
             serve=args.serve,
             port=args.port,
             with_frontend=args.with_frontend,
             tools=args.tools,
+            embedding_model=args.embedding_model,
+            attachment_max_bytes=args.attachment_max_bytes,
+            attachment_max_tokens=args.attachment_max_tokens,
+            attachment_budget_tokens=args.attachment_budget_tokens,
+            slice_code=args.slice_code,
+            repo_map=args.repo_map,
+            repo_map_tokens=args.repo_map_tokens,
+            tools_top_k=args.tools_top_k,
+            tools_budget_tokens=args.tools_budget_tokens,
             debug=args.debug,
         )
 
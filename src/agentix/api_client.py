@@ -2,6 +2,7 @@
 
 import json
 import sys
+from typing import Iterator
 
 import requests
 
@@ -64,6 +65,46 @@ def query_api(args: AgentixConfig, payload: QueryPayload) -> dict:
         return {}
 
 
+def stream_api(args: AgentixConfig, payload: QueryPayload | dict) -> Iterator[str]:
+    """
+    Send a streaming request to the Ollama API and yield the answer as it arrives.
+
+    The OpenAI-compatible endpoint sends server-sent events, one JSON chunk per
+    `data:` line, ending with `data: [DONE]`.
+    """
+    if isinstance(payload, QueryPayload):
+        payload = vars(payload)
+    headers = {
+        "Content-Type": "application/json",
+    }
+
+    if args.debug:
+        print("Payload:", file=sys.stderr)
+        print(json.dumps(payload, indent=2), file=sys.stderr)
+
+    with requests.post(
+        f"{OLLAMA_API_BASE}{OLLAMA_CHAT_ENDPOINT}",
+        headers=headers,
+        # messages are serialized by their fields
+        data=json.dumps({**payload, "stream": True}, default=vars),
+        stream=True,
+        timeout=300,
+    ) as response:
+        if response.status_code != 200:
+            print("Error:", response.status_code, response.text)
+            return
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                return
+            choices = json.loads(data).get("choices") or [{}]
+            content = choices[0].get("delta", {}).get("content")
+            if content:
+                yield content
+
+
 def summarize_user_prompt(args: AgentixConfig) -> str:
     """Generate a session summary name based on the user prompt."""
     # Use query_api to generate a session summary name based on the user prompt
@@ -0,0 +1,37 @@
+"""
+Docstring for agentix.attachments
+"""
+
+from .blob_store import blob_path, get_blob, has_blob, put_blob
+from .cache import AttachmentCache, attachment_cache
+from .ingest import (
+    IgnoreRules,
+    expand_attachment_paths,
+    expand_attachment_specs,
+    load_parallel,
+    pack_by_relevance,
+    parse_attachment_spec,
+)
+from .minify import minify_source, original_lines
+from .reader import cap_tokens, is_binary, iter_chunks, read_attachment
+
+__all__ = [
+    "AttachmentCache",
+    "IgnoreRules",
+    "attachment_cache",
+    "blob_path",
+    "cap_tokens",
+    "expand_attachment_paths",
+    "expand_attachment_specs",
+    "get_blob",
+    "has_blob",
+    "is_binary",
+    "iter_chunks",
+    "load_parallel",
+    "minify_source",
+    "original_lines",
+    "pack_by_relevance",
+    "parse_attachment_spec",
+    "put_blob",
+    "read_attachment",
+]
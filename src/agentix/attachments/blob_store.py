@@ -0,0 +1,57 @@
+"""
+agentix.attachments.blob_store
+
+Content-addressed blob store for attachment contents.
+
+Each distinct content is written once under BLOBS_DIR, named by its sha256 digest
+and fanned out by the first two hex characters. Messages reference blobs by
+digest, so re-attaching an unchanged file costs no additional storage.
+"""
+
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+
+from ..constants import BLOBS_DIR
+
+
+def blob_path(digest: str) -> str:
+    """Return the path of the blob with the given digest."""
+    return os.path.join(BLOBS_DIR, digest[:2], digest[2:])
+
+
+def has_blob(digest: str) -> bool:
+    """Check if a blob is stored."""
+    return os.path.isfile(blob_path(digest))
+
+
+def put_blob(content: str) -> str:
+    """
+    Store content, if not already present, and return its digest.
+
+    Blobs are written to a temporary file and renamed into place, so readers never
+    observe a partially written blob.
+    """
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest)
+    if os.path.isfile(path):
+        return digest
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return digest
+
+
+@lru_cache(maxsize=64)
+def get_blob(digest: str) -> str:
+    """Load a blob's content (blobs are immutable, so recent loads are cached)."""
+    with open(blob_path(digest), "r", encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,142 @@
+"""
+agentix.attachments.cache
+
+Attachment content and token-count cache.
+
+Entries are keyed by the file's absolute path and validated against its
+(mtime, size, inode) stat key, so an unchanged file costs a `stat` call instead
+of a read. The in-process tier keeps the loaded content; the on-disk tier keeps
+the blob digest and token count, which is all a blob reference needs.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from typing import Callable, Optional
+
+from ..constants import ATTACHMENT_CACHE_FILE
+from .blob_store import get_blob, put_blob
+
+# Cache shared by all attachment loads in this process
+_ATTACHMENT_CACHE: Optional["AttachmentCache"] = None
+
+
+def stat_key(st: os.stat_result) -> list[int]:
+    """Return the (mtime, size, inode) key that identifies a file's content."""
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+class AttachmentCache:
+    """
+    Two-tier cache of attachment contents.
+
+    :param path: JSON file persisting the entries (None keeps the cache in memory).
+    """
+
+    def __init__(self, path: Optional[str] = ATTACHMENT_CACHE_FILE):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.contents: dict[str, str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self.entries = {}
+
+    def get(
+        self,
+        file_path: str,
+        load: Callable[[str], str],
+        variant: str = "",
+        tag: Optional[str] = None,
+    ) -> dict:
+        """
+        Return the cache entry for a file, loading it only if it changed.
+
+        `variant` distinguishes loads of the same file with different options
+        (e.g. size caps); each variant is cached separately. `tag` names an input
+        the content also depends on but that takes unbounded values (e.g. the
+        query a slice was made for): a new tag replaces the variant's entry
+        rather than adding one, so the cache holds one entry per variant.
+
+        Entries are {"key", "blob", "size", "tokens"}. A file that cannot be stat'ed
+        is loaded without being cached: its entry has no key or blob and carries
+        the content inline.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            content = load(file_path)
+            return {
+                **self._measure(content),
+                "key": None,
+                "blob": None,
+                "content": content,
+            }
+        path = os.path.abspath(file_path) + (f"::{variant}" if variant else "")
+        key = stat_key(st)
+        with self._lock:
+            entry = self.entries.get(path)
+        if entry is not None and entry["key"] == key and entry.get("tag") == tag:
+            return entry
+        content = load(file_path)
+        entry = {**self._measure(content), "key": key, "blob": put_blob(content)}
+        if tag is not None:
+            entry["tag"] = tag
+        with self._lock:
+            stale = self.entries.get(path)
+            if stale is not None:
+                self.contents.pop(stale["blob"], None)
+            self.entries[path] = entry
+            self.contents[entry["blob"]] = content
+            self._dirty = True
+        return entry
+
+    @staticmethod
+    def _measure(content: str) -> dict:
+        return {
+            "size": len(content.encode("utf-8")),
+            # Assuming 1 token per 4 characters, as in trimming
+            "tokens": len(content) // 4,
+        }
+
+    def content(self, entry: dict) -> str:
+        """Return the content of an entry, from memory or the blob store."""
+        if entry["blob"] is None:
+            return entry["content"]
+        digest = entry["blob"]
+        content = self.contents.get(digest)
+        if content is None:
+            content = get_blob(digest)
+            with self._lock:
+                self.contents[digest] = content
+        return content
+
+    def save(self) -> None:
+        """Persist the entries if they changed (atomically replacing the cache file)."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            entries = dict(self.entries)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving attachment cache: {e}", file=sys.stderr)
+
+
+def attachment_cache() -> AttachmentCache:
+    """Return the process-wide attachment cache."""
+    global _ATTACHMENT_CACHE  # pylint: disable=global-statement
+    if _ATTACHMENT_CACHE is None:
+        _ATTACHMENT_CACHE = AttachmentCache()
+    return _ATTACHMENT_CACHE
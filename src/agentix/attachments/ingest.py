@@ -0,0 +1,300 @@
+"""
+agentix.attachments.ingest
+
+Directory and glob attachments.
+
+`--file` arguments may name files, directories, or glob patterns. Directories
+and globs are expanded honoring `.gitignore` files and common exclusions (VCS
+metadata, virtual environments, caches, build output). Files are read on a
+thread pool, and when they do not all fit the token budget the files most
+relevant to the prompt are packed first.
+"""
+
+import fnmatch
+import glob
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from ..constants import ATTACHMENT_MODES
+
+# Directory and file names never attached from a directory or glob
+DEFAULT_EXCLUDES = (
+    ".git",
+    ".hg",
+    ".svn",
+    ".venv",
+    "venv",
+    "env",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".tox",
+    ".nox",
+    "node_modules",
+    "build",
+    "dist",
+    "*.egg-info",
+    ".ipynb_checkpoints",
+    "*.pyc",
+    "*.so",
+    ".DS_Store",
+)
+
+
+def _gitignore_regex(pattern: str) -> re.Pattern:
+    """Translate a gitignore glob into a regex over '/'-separated relative paths."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1 :]:
+            end = pattern.index("]", i + 1)
+            out.append("[" + pattern[i + 1 : end].replace("!", "^", 1) + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+class IgnoreRules:
+    """
+    `.gitignore` matcher rooted at a directory.
+
+    Ignore files are loaded lazily for each directory a path passes through, and
+    the last matching pattern wins, as in git. Negations, directory-only
+    patterns (trailing `/`), anchored patterns and `**` are supported.
+    """
+
+    def __init__(self, root: str, excludes: tuple[str, ...] = DEFAULT_EXCLUDES):
+        self.root = os.path.abspath(root)
+        self.excludes = excludes
+        self._rules: dict[str, list[tuple[re.Pattern, bool, bool]]] = {}
+
+    def _load(self, directory: str) -> list[tuple[re.Pattern, bool, bool]]:
+        if directory not in self._rules:
+            rules = []
+            try:
+                with open(
+                    os.path.join(directory, ".gitignore"), "r", encoding="utf-8"
+                ) as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                lines = []
+            for line in lines:
+                line = line.rstrip()
+                if not line or line.startswith("#"):
+                    continue
+                negate = line.startswith("!")
+                line = line[1:] if negate else line
+                dir_only = line.endswith("/")
+                line = line.rstrip("/")
+                # Patterns containing a slash are relative to the ignore file's directory
+                if "/" not in line:
+                    line = "**/" + line
+                rules.append((_gitignore_regex(line.lstrip("/")), negate, dir_only))
+            self._rules[directory] = rules
+        return self._rules[directory]
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """Check a path (inside the root) against the exclusions and ignore files."""
+        path = os.path.abspath(path)
+        name = os.path.basename(path)
+        if any(fnmatch.fnmatch(name, pattern) for pattern in self.excludes):
+            return True
+        ignored = False
+        directory = os.path.dirname(path)
+        ancestors = []
+        while _within(directory, self.root):
+            ancestors.append(directory)
+            if directory == self.root:
+                break
+            directory = os.path.dirname(directory)
+        for base in reversed(ancestors):
+            relative = os.path.relpath(path, base).replace(os.sep, "/")
+            for regex, negate, dir_only in self._load(base):
+                if (not dir_only or is_dir) and regex.match(relative):
+                    ignored = not negate
+        return ignored
+
+
+def _within(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def find_root(path: str) -> str:
+    """Return the enclosing git work tree of a path, or the path's directory."""
+    start = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path))
+    directory = start
+    while True:
+        if os.path.exists(os.path.join(directory, ".git")):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return start
+        directory = parent
+
+
+def _is_ignored_under(rules: IgnoreRules, path: str) -> bool:
+    """Check a path and each of its parent directories below the rules' root."""
+    path = os.path.abspath(path)
+    if rules.is_ignored(path, os.path.isdir(path)):
+        return True
+    directory = os.path.dirname(path)
+    while _within(directory, rules.root) and directory != rules.root:
+        if rules.is_ignored(directory, True):
+            return True
+        directory = os.path.dirname(directory)
+    return False
+
+
+def walk_directory(directory: str, rules: Optional[IgnoreRules] = None) -> list[str]:
+    """List the files under a directory that are not ignored, in sorted order."""
+    rules = rules or IgnoreRules(find_root(directory))
+    files = []
+    for current, dirs, names in os.walk(directory):
+        dirs[:] = sorted(
+            d for d in dirs if not rules.is_ignored(os.path.join(current, d), True)
+        )
+        files.extend(
+            os.path.join(current, name)
+            for name in sorted(names)
+            if not rules.is_ignored(os.path.join(current, name))
+        )
+    return files
+
+
+def parse_attachment_spec(spec: str) -> tuple[str, Optional[str]]:
+    """
+    Split a `--file` argument into its path and its "::<mode>" suffix, if any.
+
+    Suffixes that are not one of ATTACHMENT_MODES are part of the path.
+    """
+    path, sep, mode = spec.rpartition("::")
+    if sep and path and mode in ATTACHMENT_MODES:
+        return path, mode
+    return spec, None
+
+
+def expand_attachment_specs(
+    specs: list[str],
+) -> list[tuple[str, bool, Optional[str]]]:
+    """
+    Expand `--file` arguments into file paths.
+
+    Files are kept as given (even if missing, so the error surfaces when loading);
+    directories and glob patterns are expanded honoring the ignore rules. A mode
+    suffix applies to every file its argument expands to.
+
+    :return: (path, explicit, mode) triples without duplicates; explicit marks
+        named files and mode is None unless a suffix was given.
+    """
+    seen = set()
+    expanded = []
+    for spec in specs:
+        spec, mode = parse_attachment_spec(spec)
+        if os.path.isdir(spec):
+            paths, explicit = walk_directory(spec), False
+        elif glob.has_magic(spec):
+            matches = sorted(glob.glob(spec, recursive=True))
+            rules = IgnoreRules(find_root(matches[0])) if matches else None
+            paths = [
+                m
+                for m in matches
+                if os.path.isfile(m) and not _is_ignored_under(rules, m)
+            ]
+            explicit = False
+        else:
+            paths, explicit = [spec], True
+        for path in paths:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                expanded.append((path, explicit, mode))
+    return expanded
+
+
+def expand_attachment_paths(specs: list[str]) -> list[tuple[str, bool]]:
+    """
+    Expand `--file` arguments into (path, explicit) pairs.
+
+    See `expand_attachment_specs`.
+    """
+    return [(path, explicit) for path, explicit, _ in expand_attachment_specs(specs)]
+
+
+def load_parallel(
+    paths: list[str], load: Callable[[str], object], max_workers: int
+) -> list:
+    """
+    Load paths on a thread pool, returning results (or exceptions) in path order.
+
+    Threads overlap the I/O latency of each read, which dominates on network
+    filesystems.
+    """
+
+    def attempt(path):
+        try:
+            return load(path)
+        except Exception as e:  # pylint: disable=broad-except
+            return e
+
+    if len(paths) <= 1:
+        return [attempt(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(attempt, paths))
+
+
+def pack_by_relevance(
+    items: list[tuple[str, bool, int]],
+    query: str,
+    budget: int,
+    text_of: Callable[[int], str],
+) -> list[int]:
+    """
+    Choose which attachments fit the token budget.
+
+    :param items: (path, explicit, tokens) per attachment.
+    :param query: The user prompt the attachments should serve.
+    :param budget: Total attachment tokens allowed.
+    :param text_of: Returns the content of an item; only called when over budget.
+    :return: Indexes of the chosen items, in their original order.
+
+    Explicitly named files are packed first, then expanded files by BM25
+    relevance of their path and content to the query.
+    """
+    if sum(tokens for _, _, tokens in items) <= budget:
+        return list(range(len(items)))
+
+    # imported here: the context package imports the attachment loaders
+    from ..context.relevance import BM25Index
+
+    index = BM25Index()
+    for position, (path, _, _) in enumerate(items):
+        index.add(str(position), f"{path}\n{text_of(position)}")
+    scores = dict(index.search(query or "", top_k=len(items)))
+    order = sorted(
+        range(len(items)),
+        key=lambda i: (not items[i][1], -scores.get(str(i), 0.0), i),
+    )
+    chosen = []
+    for position in order:
+        tokens = items[position][2]
+        if tokens <= budget:
+            chosen.append(position)
+            budget -= tokens
+    return sorted(chosen)
@@ -0,0 +1,185 @@
+"""
+agentix.attachments.minify
+
+Token-saving minification of Python attachments.
+
+Comments, docstrings, blank lines and trailing whitespace are dropped, and the
+bodies of functions nested past a depth are replaced with `...`. The result is
+still valid Python. Whenever lines are dropped, a `#L<n>` marker line gives the
+original number of the line that follows, so every line of the minified text
+can be mapped back to the source (see `original_lines`).
+"""
+
+import ast
+import io
+import re
+import tokenize
+from functools import lru_cache
+from typing import Optional
+
+from ..constants import MINIFY_MAX_DEPTH
+
+_LINE_MARKER = re.compile(r"#L(\d+)\Z")
+
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+# f-string (3.12+) and t-string (3.14+) delimiter tokens; absent before
+_FSTRING_STARTS = tuple(
+    getattr(tokenize, name)
+    for name in ("FSTRING_START", "TSTRING_START")
+    if hasattr(tokenize, name)
+)
+_FSTRING_ENDS = tuple(
+    getattr(tokenize, name)
+    for name in ("FSTRING_END", "TSTRING_END")
+    if hasattr(tokenize, name)
+)
+
+
+def _is_docstring(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Constant)
+        and isinstance(node.value.value, str)
+    )
+
+
+def _first_line(node: ast.stmt) -> int:
+    """Return the first line of a statement, decorators included."""
+    decorators = getattr(node, "decorator_list", None)
+    if decorators:
+        return min(node.lineno, *(d.lineno for d in decorators))
+    return node.lineno
+
+
+class _Planner(ast.NodeVisitor):
+    """Collect the line ranges to drop and the `...` lines replacing them."""
+
+    def __init__(self, strip_docstrings: bool, max_depth: Optional[int]):
+        self.strip_docstrings = strip_docstrings
+        self.max_depth = max_depth
+        self.dropped: set[int] = set()
+        self.replaced: dict[int, str] = {}
+        self._depth = 0
+
+    def _replace(self, body: list[ast.stmt], first: int, last: int) -> None:
+        self.dropped.update(range(first, last + 1))
+        self.replaced[first] = " " * body[0].col_offset + "..."
+
+    def _strip_docstring(self, node, body: list[ast.stmt]) -> None:
+        doc = body[0]
+        # a docstring sharing its line with other code is left alone
+        if not self.strip_docstrings or not _is_docstring(doc):
+            return
+        if isinstance(node, _SCOPES) and doc.lineno == node.lineno:
+            return
+        if len(body) > 1 and body[1].lineno == doc.end_lineno:
+            return
+        if len(body) == 1:
+            self._replace(body, doc.lineno, doc.end_lineno)
+        else:
+            self.dropped.update(range(doc.lineno, doc.end_lineno + 1))
+
+    def visit_Module(self, node: ast.Module) -> None:
+        if node.body:
+            self._strip_docstring(node, node.body)
+        self.generic_visit(node)
+
+    def _visit_scope(self, node) -> None:
+        body = node.body
+        is_function = not isinstance(node, ast.ClassDef)
+        if (
+            is_function
+            and self.max_depth is not None
+            and self._depth >= self.max_depth
+            and body[0].lineno > node.lineno
+        ):
+            self._replace(body, _first_line(body[0]), body[-1].end_lineno)
+            return
+        self._strip_docstring(node, body)
+        self._depth += 1
+        self.generic_visit(node)
+        self._depth -= 1
+
+    visit_FunctionDef = _visit_scope
+    visit_AsyncFunctionDef = _visit_scope
+    visit_ClassDef = _visit_scope
+
+
+@lru_cache(maxsize=128)
+def minify_source(
+    source: str,
+    strip_comments: bool = True,
+    strip_docstrings: bool = True,
+    max_depth: Optional[int] = MINIFY_MAX_DEPTH,
+) -> str:
+    """
+    Minify Python source, keeping original line numbers recoverable.
+
+    :param strip_comments: Drop comments.
+    :param strip_docstrings: Drop module, class and function docstrings.
+    :param max_depth: Replace the bodies of functions nested in this many classes
+        or functions with `...` (0 leaves only top-level signatures, None keeps
+        all bodies).
+    :return: The minified source; sources that do not parse are returned as-is.
+    """
+    try:
+        tree = ast.parse(source)
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    except (SyntaxError, tokenize.TokenError):
+        return source
+    planner = _Planner(strip_docstrings, max_depth)
+    planner.visit(tree)
+
+    comments: dict[int, int] = {}
+    in_strings: set[int] = set()  # lines continuing a multi-line string
+    fstrings: list[int] = []  # start lines of the f-strings being read
+    for token in tokens:
+        if token.type == tokenize.COMMENT and strip_comments:
+            comments[token.start[0]] = token.start[1]
+        elif token.type == tokenize.STRING and token.end[0] > token.start[0]:
+            in_strings.update(range(token.start[0] + 1, token.end[0] + 1))
+        elif token.type in _FSTRING_STARTS:
+            # f-strings (3.12+) are split into parts, replacement fields included
+            fstrings.append(token.start[0])
+        elif token.type in _FSTRING_ENDS:
+            in_strings.update(range(fstrings.pop() + 1, token.end[0] + 1))
+
+    out = []
+    previous = 0
+    # number lines as tokenize does (universal newlines)
+    for lineno, line in enumerate(io.StringIO(source), start=1):
+        line = line.rstrip("\n")
+        if lineno in planner.replaced:
+            line = planner.replaced[lineno]
+        elif lineno in planner.dropped:
+            continue
+        elif lineno not in in_strings:
+            if lineno in comments:
+                line = line[: comments[lineno]]
+            line = line.rstrip()
+            if not line:
+                continue
+        if lineno != previous + 1:
+            out.append(f"#L{lineno}")
+        out.append(line)
+        previous = lineno
+    return "\n".join(out) + "\n"
+
+
+def original_lines(minified: str) -> list[Optional[int]]:
+    """
+    Map each line of minified source to its line number in the original.
+
+    Marker lines map to None.
+    """
+    numbers: list[Optional[int]] = []
+    next_line = 1
+    for line in minified.splitlines():
+        marker = _LINE_MARKER.match(line)
+        if marker:
+            next_line = int(marker.group(1))
+            numbers.append(None)
+        else:
+            numbers.append(next_line)
+            next_line += 1
+    return numbers
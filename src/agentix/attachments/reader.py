@@ -0,0 +1,154 @@
+"""
+agentix.attachments.reader
+
+Size-bounded streaming reader for attachments.
+
+Files are streamed in chunks (through mmap for large files) and decoded
+incrementally, so reading stops as soon as the attachment's token budget is
+used up. Binary files are replaced with a placeholder, and files larger than
+the byte cap are sampled from their head and tail.
+"""
+
+import codecs
+import mmap
+import os
+from functools import partial
+from typing import BinaryIO, Iterator
+
+from ..constants import (
+    ATTACHMENT_MAX_BYTES,
+    ATTACHMENT_MAX_TOKENS,
+    MMAP_THRESHOLD,
+    READ_CHUNK_SIZE,
+)
+
+BINARY_SNIFF_BYTES = 8192
+
+# Bytes that do not occur in text files (control characters other than \t\n\f\r\b\e)
+_NON_TEXT = bytes(set(range(32)) - {7, 8, 9, 10, 12, 13, 27}) + b"\x7f"
+
+
+def is_binary(sample: bytes) -> bool:
+    """
+    Detect binary content from a leading sample of a file.
+
+    NUL bytes, more than 10% control characters, or invalid UTF-8 mark a sample
+    as binary; a multi-byte sequence cut by the end of the sample is tolerated.
+    """
+    if not sample:
+        return False
+    if b"\x00" in sample:
+        return True
+    if len(sample.translate(None, _NON_TEXT)) < len(sample) * 0.9:
+        return True
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
+def iter_chunks(
+    f: BinaryIO,
+    start: int = 0,
+    end: int | None = None,
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Stream the decoded text of a byte range of an open file.
+
+    Ranges of MMAP_THRESHOLD bytes or more are read through mmap; invalid UTF-8
+    is replaced rather than raised, since ranges may start mid-character.
+    """
+    size = os.fstat(f.fileno()).st_size
+    end = size if end is None else min(end, size)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    if end - start >= MMAP_THRESHOLD:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(start, end, chunk_size):
+                yield decoder.decode(mm[offset : min(offset + chunk_size, end)])
+    else:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield decoder.decode(data)
+    yield decoder.decode(b"", final=True)
+
+
+def take_chars(chunks: Iterator[str], max_chars: int) -> tuple[str, bool]:
+    """
+    Consume chunks until `max_chars` characters are collected.
+
+    :return: The text and whether it was cut short.
+    """
+    parts = []
+    count = 0
+    for chunk in chunks:
+        if count + len(chunk) > max_chars:
+            parts.append(chunk[: max_chars - count])
+            return "".join(parts), True
+        parts.append(chunk)
+        count += len(chunk)
+    return "".join(parts), False
+
+
+def cap_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to a token budget, marking the cut."""
+    # Assuming 1 token per 4 characters, as in trimming
+    if len(text) <= max_tokens * 4:
+        return text
+    return text[: max_tokens * 4] + f"\n[... truncated at {max_tokens} tokens ...]"
+
+
+def read_attachment(
+    file_path: str,
+    max_bytes: int = ATTACHMENT_MAX_BYTES,
+    max_tokens: int = ATTACHMENT_MAX_TOKENS,
+) -> str:
+    """
+    Read an attachment within byte and token caps.
+
+    - binary files become a one-line placeholder,
+    - files up to `max_bytes` are streamed until `max_tokens` is used up,
+    - larger files are sampled: the first and last `max_bytes / 2` bytes (within
+      the token cap), joined by an omission marker,
+    - pipes and other special files are streamed as text until `max_tokens`.
+    """
+    # Assuming 1 token per 4 characters, as in trimming
+    max_chars = max_tokens * 4
+    if not os.path.isfile(file_path):
+        # pipes and other special files cannot be sized or mapped: stream them as text
+        with open(file_path, "r", encoding="utf-8") as f:
+            text, truncated = take_chars(
+                iter(partial(f.read, READ_CHUNK_SIZE), ""), max_chars
+            )
+        if truncated:
+            text += f"\n[... truncated at {max_tokens} tokens ...]"
+        return text
+
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if is_binary(f.read(BINARY_SNIFF_BYTES)):
+            return f"[binary content omitted: {size} bytes]"
+
+        if size <= max_bytes:
+            text, truncated = take_chars(iter_chunks(f), max_chars)
+            if truncated:
+                text += f"\n[... truncated at {max_tokens} tokens ...]"
+            return text
+
+        # A character is at least one byte, so each sample stays within its share
+        sample = min(max_bytes, max_chars) // 2
+        head = "".join(iter_chunks(f, 0, sample))
+        tail = "".join(iter_chunks(f, size - sample))
+        # Cut both samples on line boundaries so no partial lines are sent
+        if "\n" in head:
+            head = head[: head.rindex("\n") + 1]
+        if "\n" in tail:
+            tail = tail[tail.index("\n") + 1 :]
+        omitted = size - len(head.encode("utf-8")) - len(tail.encode("utf-8"))
+        return f"{head}[... {omitted} bytes omitted ...]\n{tail}"
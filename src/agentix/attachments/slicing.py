@@ -0,0 +1,140 @@
+"""
+agentix.attachments.slicing
+
+Code-aware slicing of Python attachments.
+
+The file is parsed once with LibCST, its classes, methods and top-level
+functions are scored against the user prompt with BM25, and only the relevant
+symbols are sent in full. Every other function keeps its signature (and
+decorators) with its body replaced by `...`, so the model still sees an outline
+of the whole module. Imports and other top-level statements are kept as-is.
+"""
+
+from typing import Optional
+
+import libcst as cst
+
+from ..constants import SLICE_MIN_TOKENS, SLICE_TOP_K
+from ..tools.cst_tools import extract_function_defs_from_class_node
+
+# Keep symbols scoring at least this fraction of the best score
+_RELATIVE_SCORE_CUTOFF = 0.25
+
+_ELLIPSIS_BODY = cst.SimpleStatementSuite(body=[cst.Expr(value=cst.Ellipsis())])
+
+
+def _class_header(module: cst.Module, node: cst.ClassDef) -> str:
+    """Render a class without its methods (name, bases, class-level statements)."""
+    body = [s for s in node.body.body if not isinstance(s, cst.FunctionDef)]
+    header = node.with_changes(
+        body=node.body.with_changes(
+            body=body or [cst.SimpleStatementLine([cst.Pass()])]
+        )
+    )
+    return module.code_for_node(header)
+
+
+def module_symbols(module: cst.Module) -> list[tuple[str, str]]:
+    """
+    List the sliceable symbols of a module as (qualified name, source text).
+
+    Symbols are top-level functions, top-level classes, and the methods directly
+    in those classes.
+    """
+    symbols = []
+    for stmt in module.body:
+        if isinstance(stmt, cst.FunctionDef):
+            symbols.append((stmt.name.value, module.code_for_node(stmt)))
+        elif isinstance(stmt, cst.ClassDef):
+            symbols.append((stmt.name.value, _class_header(module, stmt)))
+            method_names = [
+                s.name.value for s in stmt.body.body if isinstance(s, cst.FunctionDef)
+            ]
+            methods = extract_function_defs_from_class_node(
+                stmt, method_names, module_for_code=module
+            )
+            symbols.extend(
+                (f"{stmt.name.value}.{name}", method["source"] or name)
+                for name, method in methods.items()
+            )
+    return symbols
+
+
+def rank_symbols(
+    symbols: list[tuple[str, str]], query: str, top_k: int = SLICE_TOP_K
+) -> set[str]:
+    """Return the qualified names of the symbols most relevant to the query."""
+    # imported here: the context package imports the attachment loaders
+    from ..context.relevance import BM25Index
+
+    index = BM25Index()
+    for qualname, text in symbols:
+        index.add(qualname, f"{qualname.replace('.', ' ')}\n{text}")
+    ranked = index.search(query, top_k)
+    if not ranked:
+        return set()
+    cutoff = ranked[0][1] * _RELATIVE_SCORE_CUTOFF
+    return {qualname for qualname, score in ranked if score >= cutoff}
+
+
+class _Slicer(cst.CSTTransformer):
+    """Replace the bodies of functions outside `keep` with `...`."""
+
+    def __init__(self, keep: set[str]):
+        self.keep = keep
+        self._stack: list[str] = []
+        self._kept_depth = 0  # > 0 while inside a symbol that is kept whole
+
+    def _enter(self, name: str) -> None:
+        self._stack.append(name)
+        if self._kept_depth or ".".join(self._stack) in self.keep:
+            self._kept_depth += 1
+
+    def _leave(self) -> bool:
+        """Pop the current symbol; return True if it is kept whole."""
+        kept = self._kept_depth > 0
+        if kept:
+            self._kept_depth -= 1
+        self._stack.pop()
+        return kept
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> Optional[bool]:
+        self._enter(node.name.value)
+        return True
+
+    def leave_ClassDef(
+        self, original_node: cst.ClassDef, updated_node: cst.ClassDef
+    ) -> cst.ClassDef:
+        return original_node if self._leave() else updated_node
+
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> Optional[bool]:
+        self._enter(node.name.value)
+        # The body is either kept whole or dropped; no need to visit it
+        return False
+
+    def leave_FunctionDef(
+        self, original_node: cst.FunctionDef, updated_node: cst.FunctionDef
+    ) -> cst.FunctionDef:
+        if self._leave():
+            return original_node
+        return updated_node.with_changes(body=_ELLIPSIS_BODY)
+
+
+def slice_source(source: str, query: str, min_tokens: int = SLICE_MIN_TOKENS) -> str:
+    """
+    Slice Python source down to the symbols relevant to `query`.
+
+    Sources below `min_tokens`, sources that do not parse, and sources where no
+    symbol matches the query are returned unchanged.
+    """
+    # Assuming 1 token per 4 characters, as in trimming
+    if len(source) // 4 < min_tokens or not query:
+        return source
+    try:
+        module = cst.parse_module(source)
+    except cst.ParserSyntaxError:
+        return source
+    keep = rank_symbols(module_symbols(module), query)
+    if not keep:
+        return source
+    return module.visit(_Slicer(keep)).code
@@ -9,15 +9,71 @@ AGENTIX_HOME = os.getenv("AGENTIX_HOME", os.path.expanduser("~/.agentix"))
 # Token limits
 MAX_TOKENS = 4096
 
+# Relevance retrieval: when history overflows the budget, up to RELEVANCE_TOP_K older
+# turns are recalled by BM25 into a RELEVANCE_BUDGET_FRACTION share of the budget
+RELEVANCE_TOP_K = 5
+RELEVANCE_BUDGET_FRACTION = 0.5
+
+# Attachment reading: default per-attachment caps; byte ranges of MMAP_THRESHOLD or
+# more are streamed through mmap in READ_CHUNK_SIZE chunks
+ATTACHMENT_MAX_BYTES = 512 * 1024
+ATTACHMENT_MAX_TOKENS = 8192
+MMAP_THRESHOLD = 256 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+# Directory and glob attachments: total token budget and reader threads
+ATTACHMENT_BUDGET_TOKENS = 32768
+ATTACHMENT_WORKERS = 8
+# Python attachments of SLICE_MIN_TOKENS or more can be sliced to the SLICE_TOP_K
+# symbols most relevant to the prompt
+SLICE_MIN_TOKENS = 1024
+SLICE_TOP_K = 5
+# Per-attachment modes, selected with a "::<mode>" suffix on --file. Minified Python
+# keeps the bodies of functions nested in fewer than MINIFY_MAX_DEPTH classes/functions
+ATTACHMENT_MODES = ("full", "slice", "minify", "outline")
+MINIFY_MAX_DEPTH = 2
+# Repository map: token budget for the outline of a project's modules, and the
+# most module outlines its cache keeps (the least recently used are evicted)
+REPO_MAP_BUDGET_TOKENS = 4096
+REPO_MAP_CACHE_MAX_OUTLINES = 20000
+# Tools prompt: the TOOLS_TOP_K public tools most relevant to the prompt, within
+# TOOLS_BUDGET_TOKENS
+TOOLS_TOP_K = 8
+TOOLS_BUDGET_TOKENS = 1024
+# Tool extraction backends; the first is the default. Both produce the same specs
+TOOL_EXTRACTOR_BACKENDS = ("ast", "libcst")
+# Tool index: seconds between polls of tool sources where inotify is unavailable,
+# and between full rescans (for new directories) where it is
+TOOL_INDEX_POLL_SECONDS = 2.0
+TOOL_INDEX_RESCAN_SECONDS = 60.0
+# AST JSON export: text fragments joined into each streamed chunk
+NODE_JSON_CHUNK_SIZE = 4096
+
+# Diff-based edits: hunks whose context differs are matched fuzzily down to this
+# difflib similarity ratio
+FUZZY_MATCH_CUTOFF = 0.8
+# Generated code is validated against black's line length; the results of the
+# VALIDATION_CACHE_SIZE most recently validated sources are kept
+VALIDATION_LINE_LENGTH = 88
+VALIDATION_CACHE_SIZE = 256
+
 # Directory paths
 SYSTEM_PROMPTS_DIR = f"{AGENTIX_HOME}/system_prompts/"
 SESSIONS_DIR = f"{AGENTIX_HOME}/sessions/"
 SESSIONS_METADATA_FILE = f"{AGENTIX_HOME}/agentix_sessions.json"
+EMBEDDINGS_DIR = f"{AGENTIX_HOME}/embeddings/"
+BLOBS_DIR = f"{AGENTIX_HOME}/blobs/"
+ATTACHMENT_CACHE_FILE = f"{AGENTIX_HOME}/cache/attachments.json"
+REPO_MAP_CACHE_FILE = f"{AGENTIX_HOME}/cache/repo_map.json"
+TOOL_CACHE_DIR = f"{AGENTIX_HOME}/cache/tools/"
+PARSE_CACHE_DIR = f"{AGENTIX_HOME}/cache/parsed/"
+SYMBOL_INDEX_FILE = f"{AGENTIX_HOME}/cache/symbols.sqlite3"
 
 # API configuration
 OLLAMA_API_BASE = "http://localhost:11434"
 OLLAMA_MODELS_ENDPOINT = "/api/tags"
 OLLAMA_CHAT_ENDPOINT = "/v1/chat/completions"
+OLLAMA_EMBED_ENDPOINT = "/api/embed"
+EMBEDDING_BATCH_SIZE = 32
 
 # Default values
 DEFAULT_TEMPERATURE = 0.2
@@ -26,3 +82,5 @@ CONTINUE_SESSION_ID = "__continue"
 
 # All user prompts are classified before processing
 PROMPT_CLASSIFICATION = "prompt_classification"
+# With --edit-mode diff, file edits are requested as diffs with this system prompt
+DIFF_EDITS_PROMPT = "diff_edits"
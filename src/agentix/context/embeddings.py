@@ -0,0 +1,320 @@
+"""
+agentix.context.embeddings
+
+Embedding memory across sessions.
+
+Messages are embedded through the local Ollama embeddings endpoint in batches and
+stored as unit vectors in memory-mapped NumPy arrays: one store per session plus a
+global store spanning every session under SESSIONS_DIR. Embeddings are computed
+once per content hash; a message whose content was already embedded anywhere
+reuses the stored vector.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import Optional
+
+import numpy as np
+import requests
+
+from ..constants import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDINGS_DIR,
+    OLLAMA_API_BASE,
+    OLLAMA_EMBED_ENDPOINT,
+    SESSIONS_DIR,
+)
+from .message import Message
+from .relevance import message_field, message_text
+
+GLOBAL_STORE = "_global"
+
+# Cache of open embedding memories, keyed by model name
+_MEMORIES: dict[str, "EmbeddingMemory"] = {}
+
+
+def content_hash(text: str) -> str:
+    """Return the sha256 hex digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class VectorStore:
+    """
+    Append-only, memory-mapped matrix of unit vectors with string keys.
+
+    Layout of `path`:
+      - `vectors.f32`: raw float32 rows, grown geometrically,
+      - `meta.json`: the vector dimension,
+      - `keys.jsonl`: one {"key", "hash"} line per stored row.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.dim: Optional[int] = None
+        self.keys: list[str] = []
+        self.hashes: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.hash_rows: dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._load()
+
+    @property
+    def _vectors_file(self) -> str:
+        return os.path.join(self.path, "vectors.f32")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    def _load(self) -> None:
+        try:
+            with open(os.path.join(self.path, "meta.json"), "r", encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+        except FileNotFoundError:
+            return
+        with open(os.path.join(self.path, "keys.jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._remember(entry["key"], entry["hash"])
+        self._map()
+
+    def _remember(self, key: str, digest: str) -> None:
+        self.rows[key] = len(self.keys)
+        self.hash_rows.setdefault(digest, len(self.keys))
+        self.keys.append(key)
+        self.hashes.append(digest)
+
+    def _map(self) -> None:
+        capacity = os.path.getsize(self._vectors_file) // (4 * self.dim)
+        self._vectors = (
+            np.memmap(self._vectors_file, dtype=np.float32, mode="r+").reshape(
+                capacity, self.dim
+            )
+            if capacity
+            else None
+        )
+
+    def _reserve(self, rows: int) -> None:
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, 2 * capacity, 64)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(self._vectors_file, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self._map()
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The stored vectors, one row per key."""
+        if self._vectors is None:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return self._vectors[: len(self.keys)]
+
+    def vector_for_hash(self, digest: str) -> Optional[np.ndarray]:
+        """Return a stored vector with the given content hash, if any."""
+        row = self.hash_rows.get(digest)
+        return None if row is None else np.array(self._vectors[row])
+
+    def append(self, keys: list[str], hashes: list[str], vectors: np.ndarray) -> None:
+        """Append unit vectors for new keys; existing keys are skipped."""
+        fresh = [i for i, key in enumerate(keys) if key not in self.rows]
+        if not fresh:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"dim": self.dim}, f)
+        start = len(self.keys)
+        self._reserve(start + len(fresh))
+        self._vectors[start : start + len(fresh)] = vectors[fresh]
+        self._vectors.flush()
+        # Keys are written after the vectors so a crash never exposes unwritten rows
+        with open(os.path.join(self.path, "keys.jsonl"), "a", encoding="utf-8") as f:
+            for i in fresh:
+                f.write(json.dumps({"key": keys[i], "hash": hashes[i]}) + "\n")
+                self._remember(keys[i], hashes[i])
+
+    def search(self, query: np.ndarray, top_k: int = 5) -> list[tuple[str, float]]:
+        """Vectorized cosine top-k (vectors and query are unit length)."""
+        vectors = self.vectors
+        if not len(vectors) or top_k <= 0:
+            return []
+        scores = vectors @ query
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [(self.keys[i], float(scores[i])) for i in best]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class EmbeddingMemory:
+    """
+    Per-session and global embedding stores for one embedding model.
+
+    :param model: Ollama embedding model name.
+    :param root: Directory holding the stores.
+    :param batch_size: Texts per embeddings request.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        root: str = EMBEDDINGS_DIR,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+    ):
+        self.model = model
+        self.root = os.path.join(root, model.replace("/", "_").replace(":", "_"))
+        self.batch_size = batch_size
+        self.stores: dict[str, VectorStore] = {}
+
+    def store(self, name: str) -> VectorStore:
+        """Return the vector store for a session (or GLOBAL_STORE)."""
+        if name not in self.stores:
+            self.stores[name] = VectorStore(os.path.join(self.root, name))
+        return self.stores[name]
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts through the Ollama embeddings endpoint, in batches."""
+        rows = []
+        for start in range(0, len(texts), self.batch_size):
+            response = requests.post(
+                f"{OLLAMA_API_BASE}{OLLAMA_EMBED_ENDPOINT}",
+                json={
+                    "model": self.model,
+                    "input": texts[start : start + self.batch_size],
+                },
+                timeout=300,
+            )
+            response.raise_for_status()
+            rows.extend(response.json()["embeddings"])
+        return _normalize(np.asarray(rows, dtype=np.float32))
+
+    def add_messages(self, session: str, messages: list[Message]) -> int:
+        """
+        Embed saved messages of a session that are not stored yet.
+
+        :return: The number of texts sent to the embeddings endpoint.
+        """
+        session_store = self.store(session)
+        global_store = self.store(GLOBAL_STORE)
+        pending = [
+            m
+            for m in messages
+            if message_field(m, "filename")
+            and message_field(m, "filename") not in session_store
+        ]
+        if not pending:
+            return 0
+        keys = [message_field(m, "filename") for m in pending]
+        texts = [message_text(m) for m in pending]
+        hashes = [content_hash(t) for t in texts]
+
+        # Reuse vectors for content embedded before, in any session
+        known = {h: global_store.vector_for_hash(h) for h in set(hashes)}
+        missing = [h for h, v in known.items() if v is None]
+        if missing:
+            first_text = dict(zip(hashes, texts))
+            for h, vector in zip(missing, self.embed([first_text[h] for h in missing])):
+                known[h] = vector
+        vectors = np.stack([known[h] for h in hashes])
+
+        session_store.append(keys, hashes, vectors)
+        global_store.append([f"{session}/{k}" for k in keys], hashes, vectors)
+        return len(missing)
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        session: Optional[str] = None,
+        exclude_session: Optional[str] = None,
+    ) -> list[tuple[str, str, float]]:
+        """
+        Cosine top-k over one session or, by default, every session.
+
+        :return: (session, message filename, score) triples, best first.
+        """
+        query_vector = self.embed([query])[0]
+        if session is not None:
+            return [
+                (session, key, score)
+                for key, score in self.store(session).search(query_vector, top_k)
+            ]
+        global_store = self.store(GLOBAL_STORE)
+        # Over-fetch so excluding the current session still leaves top_k results
+        fetch = top_k if exclude_session is None else top_k * 4
+        results = []
+        for key, score in global_store.search(query_vector, fetch):
+            found_session, filename = key.split("/", 1)
+            if found_session != exclude_session:
+                results.append((found_session, filename, score))
+        return results[:top_k]
+
+    def recall(
+        self, query: str, top_k: int = 5, exclude_session: Optional[str] = None
+    ) -> list[Message]:
+        """Load the messages most similar to the query from other sessions."""
+        recalled = []
+        for session, filename, _ in self.search(
+            query, top_k, exclude_session=exclude_session
+        ):
+            try:
+                with open(
+                    os.path.join(f"{SESSIONS_DIR}{session}", filename),
+                    "r",
+                    encoding="utf-8",
+                ) as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue  # the message was deleted or is unreadable
+            message = Message(
+                role=data["role"],
+                content=data["content"],
+                attachments=data.get("attachments"),
+            )
+            message.filename = filename
+            recalled.append(message)
+        return recalled
+
+
+def embedding_memory(model: str) -> EmbeddingMemory:
+    """Return the (cached) embedding memory for a model."""
+    if model not in _MEMORIES:
+        _MEMORIES[model] = EmbeddingMemory(model)
+    return _MEMORIES[model]
+
+
+def get_memory_prompt(args, query: str, top_k: int = 5) -> Optional[str]:
+    """
+    Assemble a memory prompt from related messages in other sessions.
+
+    Returns None when embeddings are disabled, nothing relevant is found, or the
+    embeddings endpoint is unavailable.
+    """
+    if not args.embedding_model or not query:
+        return None
+    try:
+        recalled = embedding_memory(args.embedding_model).recall(
+            query, top_k, exclude_session=args.session
+        )
+    except (requests.RequestException, KeyError, ValueError) as e:
+        print(f"Error recalling embedding memory: {e}", file=sys.stderr)
+        return None
+    if not recalled:
+        return None
+    memory = "\n\n".join(f"({m.role}) {message_text(m)}" for m in recalled)
+    return f"[MEMORY]\n{memory}\n[END MEMORY]\n\n"
@@ -2,7 +2,7 @@
 Docstring for agentix.message
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Optional
 
 
@@ -16,12 +16,8 @@ class Message:
         self.role = role
         self.content = content
         self.attachments: Optional[list] = attachments
-        self.filename: Optional[str] = field(
-            default=None, init=False, repr=False, compare=False
-        )  # Track filename without serialization
-        self._exclude_from_context: bool = field(
-            default=False, init=False, repr=False, compare=False
-        )  # Internal use only
+        self.filename: Optional[str] = None  # Track filename without serialization
+        self._exclude_from_context: bool = False  # Internal use only
 
     def exclude_from_context(self):
         """Mark this message to be excluded from context trimming."""
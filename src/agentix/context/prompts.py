@@ -3,12 +3,18 @@
 import glob
 import json
 import sys
+from typing import Optional
 
 from ..agentix_config import AgentixConfig
-from ..constants import SYSTEM_PROMPTS_DIR
+from ..constants import DIFF_EDITS_PROMPT, SYSTEM_PROMPTS_DIR
 from ..file_utils import get_file
-from ..tools import ast_tools, cst_tools
-from ..tools.describe_tools import extract_tools_from_file, to_openai_tools
+from ..tools.describe_tools.select import render_tools, select_tools
+from ..tools.tool_index import tool_index
+
+
+def uses_diff_edits(args: AgentixConfig) -> bool:
+    """Check if file edits are requested as diffs rather than whole files."""
+    return args.replace_file and args.edit_mode == "diff"
 
 
 def get_system_prompt(args: AgentixConfig) -> str:
@@ -24,7 +30,10 @@ def get_system_prompt(args: AgentixConfig) -> str:
             f"Available system prompts: {json.dumps(prompts, indent=2)}",
             file=sys.stderr,
         )
-    for canned_system_prompt_path in args.system or []:
+    names = list(args.system or [])
+    if uses_diff_edits(args):
+        names.append(DIFF_EDITS_PROMPT)
+    for canned_system_prompt_path in names:
         prompt_path = prompts[canned_system_prompt_path]
         if args.debug:
             print(f"Loading system prompt from: {prompt_path}", file=sys.stderr)
@@ -38,33 +47,44 @@ def get_user_prompt(args: AgentixConfig) -> str:
 
 
 def get_tools_prompt(args: AgentixConfig) -> str:
-    """Assemble tools prompt from CLI arguments."""
-    f = ""
-    tools = []
-    for t in args.tools or []:
-        if args.debug:
-            print(f"Processing tool: {t}", file=sys.stderr)
-        match t:
-            case "cst":
-                f = cst_tools.__file__
-            case "ast":
-                f = ast_tools.__file__
-            case _:
-                if args.debug:
-                    print(f"Unknown tool: {t}", file=sys.stderr)
-                f = ""
-        if f:
-            tool_data = {}
-            try:
-                tool_data = extract_tools_from_file(
-                    f, debug=args.debug, return_dicts=False
-                )
-                tools.append(to_openai_tools(tool_data))
-            except Exception as e:
-                print("tool_data:", tool_data, file=sys.stderr)
-                print(f"Error extracting tools from {f}: {e}", file=sys.stderr)
+    """
+    Assemble tools prompt from CLI arguments.
+
+    Besides the built-in "cst" and "ast" tools, a tool may name a directory or
+    a package, whose modules all contribute module-qualified tools. Tools are
+    read from the in-memory tool index, which extracts a source when first seen
+    and then only files that changed. Only the public tools most relevant to the
+    user prompt are described, with JSON Schema parameters, as compact JSON in
+    definition order.
+    """
+    names = args.tools or []
+    specs, tools = tool_index().tools(names)
+    if args.debug:
+        print(f"Processing tools: {names} ({len(specs)} found)", file=sys.stderr)
+
+    selected = select_tools(
+        specs,
+        tools,
+        get_user_prompt(args),
+        top_k=args.tools_top_k,
+        budget=args.tools_budget_tokens,
+    )
+    return f"[TOOLS]\n{render_tools(selected)}\n[END TOOLS]\n\n"
+
+
+def get_repo_map_prompt(args: AgentixConfig) -> Optional[str]:
+    """Assemble the repository map prompt, or None if no repo map was requested."""
+    if not args.repo_map:
+        return None
+    # imported here: only sessions with a repo map need the walker and parser pool
+    from ..tools.repo_map import build_repo_map
 
-    return f"[TOOLS]\n{json.dumps(tools, indent=2)}\n[END TOOLS]\n\n"
+    repo_map = build_repo_map(
+        args.repo_map, get_user_prompt(args), budget=args.repo_map_tokens
+    )
+    if not repo_map:
+        return None
+    return f"[REPO MAP]\n{repo_map}\n[END REPO MAP]\n\n"
 
 
 def get_prompts(args: AgentixConfig) -> dict:
@@ -0,0 +1,240 @@
+"""
+agentix.context.relevance
+
+BM25 relevance retrieval over session history.
+
+Each session keeps an append-only inverted index log next to its message files.
+Appending a message writes a single line (its term frequencies), so index
+updates cost O(new message); the postings are rebuilt from the log the first
+time a session's index is used in a process.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+from ..constants import SESSIONS_DIR
+
+BM25_INDEX_FILE = ".index/bm25.jsonl"
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do for from has have how i in is it its of on or "
+    "so that the this to was what when where which who why will with you".split()
+)
+
+# Cache of loaded session indexes, keyed by session id
+_SESSION_INDEXES: dict[str, "BM25Index"] = {}
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """
+    Split text into lowercase search terms.
+
+    Identifiers are also split on snake_case and camelCase boundaries so that
+    `trim_context` matches a query for "trim context" and `ToolSpec` matches "tool".
+    """
+    terms = []
+    for word in _TOKEN_RE.findall(text or ""):
+        lowered = word.lower()
+        if lowered not in _STOPWORDS:
+            terms.append(lowered)
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            terms.extend(p.lower() for p in parts if p.lower() not in _STOPWORDS)
+    return terms
+
+
+def message_field(message, key: str):
+    """Read a field from a Message or a plain message dict."""
+    if isinstance(message, dict):
+        return message.get(key)
+    return getattr(message, key, None)
+
+
+def message_text(message) -> str:
+    """Return the searchable text of a message: its content plus attachments."""
+    parts = [message_field(message, "content") or ""]
+    for attachment in message_field(message, "attachments") or []:
+        if isinstance(attachment, str):
+            parts.append(attachment)
+        elif isinstance(attachment, dict):
+            # blob references are indexed by path to keep their content lazy
+            parts.append(attachment.get("path", ""))
+    return "\n".join(parts)
+
+
+class BM25Index:
+    """
+    Incremental Okapi BM25 inverted index.
+
+    :param path: Optional append-only log file; when set, `add` persists each document.
+    :param k1: Term frequency saturation.
+    :param b: Document length normalization.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, dict[str, int]] = {}
+        self.doc_lengths: dict[str, int] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_lengths
+
+    @property
+    def average_length(self) -> float:
+        """Average document length in terms."""
+        return self.total_length / len(self.doc_lengths) if self.doc_lengths else 0.0
+
+    def _index(self, doc_id: str, term_counts: dict[str, int], length: int) -> None:
+        if doc_id in self.doc_lengths:
+            return
+        for term, count in term_counts.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document; cost is proportional to the document, not the index."""
+        if doc_id in self.doc_lengths:
+            return
+        terms = tokenize(text)
+        term_counts = dict(Counter(terms))
+        self._index(doc_id, term_counts, len(terms))
+        if self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(
+                    json.dumps({"id": doc_id, "len": len(terms), "tf": term_counts})
+                    + "\n"
+                )
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of a term."""
+        df = len(self.postings.get(term, ()))
+        n = len(self.doc_lengths)
+        return math.log((n - df + 0.5) / (df + 0.5) + 1.0)
+
+    def _term_score(self, idf: float, tf: int, length: int) -> float:
+        avgdl = self.average_length or 1.0
+        norm = self.k1 * (1.0 - self.b + self.b * length / avgdl)
+        return idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+    def search(
+        self, query: str, top_k: int = 5, doc_ids: Optional[Iterable[str]] = None
+    ) -> list[tuple[str, float]]:
+        """
+        Rank indexed documents against a query.
+
+        :param query: Free text query.
+        :param top_k: Maximum number of results.
+        :param doc_ids: Optional restriction of the candidate documents.
+        :return: (doc_id, score) pairs, best first; documents scoring 0 are omitted.
+        """
+        allowed = set(doc_ids) if doc_ids is not None else None
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in posting.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                scores[doc_id] = scores.get(doc_id, 0.0) + self._term_score(
+                    idf, tf, self.doc_lengths[doc_id]
+                )
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    def score_text(self, query: str, text: str) -> float:
+        """Score a document that is not in the index, using the index's corpus statistics."""
+        term_counts = Counter(tokenize(text))
+        length = sum(term_counts.values())
+        return sum(
+            self._term_score(self.idf(term), term_counts[term], length)
+            for term in set(tokenize(query))
+            if term in term_counts
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Rebuild an index from its append-only log (missing log means empty index)."""
+        index = cls(path=path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # tolerate a torn trailing write
+                    index._index(entry["id"], entry["tf"], entry["len"])
+        except FileNotFoundError:
+            pass
+        return index
+
+
+def session_index(session: str) -> BM25Index:
+    """Return the (cached) BM25 index for a session."""
+    index = _SESSION_INDEXES.get(session)
+    if index is None:
+        index = BM25Index.load(
+            os.path.join(f"{SESSIONS_DIR}{session}", BM25_INDEX_FILE)
+        )
+        _SESSION_INDEXES[session] = index
+    return index
+
+
+def recall_relevant(
+    session: str,
+    candidates: list,
+    query: str,
+    budget: int,
+    top_k: int,
+    token_counter: Callable[[object], int],
+) -> list:
+    """
+    Select the older messages most relevant to `query` that fit in `budget` tokens.
+
+    Saved messages are scored through the session index; messages not yet saved
+    are scored against the same corpus statistics.
+
+    :return: Up to `top_k` messages from `candidates`, in their original order.
+    """
+    if budget <= 0 or top_k <= 0 or not candidates:
+        return []
+    index = session_index(session)
+    by_filename = {
+        message_field(m, "filename"): position
+        for position, m in enumerate(candidates)
+        if message_field(m, "filename") in index
+    }
+    scored = [
+        (score, by_filename[doc_id])
+        for doc_id, score in index.search(query, len(by_filename), by_filename)
+    ]
+    scored.extend(
+        (index.score_text(query, message_text(m)), position)
+        for position, m in enumerate(candidates)
+        if message_field(m, "filename") not in by_filename
+    )
+    selected = []
+    for score, position in sorted(scored, key=lambda item: item[0], reverse=True):
+        if score <= 0 or len(selected) >= top_k:
+            break
+        tokens = token_counter(candidates[position])
+        if tokens <= budget:
+            selected.append(position)
+            budget -= tokens
+    return [candidates[position] for position in sorted(selected)]
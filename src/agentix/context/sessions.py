@@ -6,14 +6,30 @@ import os
 import sys
 from datetime import UTC, datetime
 
+import requests
+
 from agentix import Message
 
 from ..agentix_config import AgentixConfig
 from ..api_client import summarize_user_prompt
-from ..constants import PROMPT_CLASSIFICATION, SESSIONS_DIR, SESSIONS_METADATA_FILE
-from ..file_utils import get_attachments
+from ..constants import (
+    PROMPT_CLASSIFICATION,
+    RELEVANCE_BUDGET_FRACTION,
+    RELEVANCE_TOP_K,
+    SESSIONS_DIR,
+    SESSIONS_METADATA_FILE,
+)
+from ..file_utils import attachment_tokens, get_attachment_refs, resolve_attachment
 from ..query_payload import QueryPayload
-from .prompts import get_system_prompt, get_tools_prompt, get_user_prompt
+from .embeddings import embedding_memory, get_memory_prompt
+from .prompts import (
+    get_repo_map_prompt,
+    get_system_prompt,
+    get_tools_prompt,
+    get_user_prompt,
+    uses_diff_edits,
+)
+from .relevance import message_field, message_text, recall_relevant, session_index
 
 
 def assemble_classification_prompt(
@@ -39,10 +55,15 @@ def assemble_prompts(
     """Construct API request payload with messages and configuration."""
 
     # add system prompts if provided
-    if args.system:
+    if args.system or uses_diff_edits(args):
         history.append(Message(role="system", content=get_system_prompt(args)))
     if args.tools:
         history.append(Message(role="tool_calls", content=get_tools_prompt(args)))
+    if args.repo_map:
+        # an outline of the project, cheaper than attaching its files
+        repo_map = get_repo_map_prompt(args)
+        if repo_map:
+            history.append(Message(role="system", content=repo_map))
     if args.user or args.file_path:
         # add user prompts if provided
         role = ("user",)
@@ -50,8 +71,13 @@ def assemble_prompts(
         attachment = None
         if args.user:
             content = get_user_prompt(args)
+            # recall related messages from other sessions if embeddings are enabled
+            memory = get_memory_prompt(args, content)
+            if memory:
+                history.append(Message(role="system", content=memory))
         if args.file_path:
-            attachment = get_attachments(args)
+            # attachments are stored once as blobs; messages carry only references
+            attachment = get_attachment_refs(args)
         history.append(Message(role=role, content=content, attachments=attachment))
 
     # Trim context based on max_tokens
@@ -64,10 +90,52 @@ def assemble_prompts(
     )
 
 
+def message_tokens(message: Message) -> int:
+    """Estimate the tokens of a message and its attachments."""
+    # Assuming 1 token per 4 characters as a rough approximation
+    tokens = len(message_field(message, "content") or "") // 4
+    for attachment in message_field(message, "attachments") or []:
+        tokens += attachment_tokens(attachment)
+    return tokens
+
+
+def materialize_attachments(messages: list[Message]) -> list[Message]:
+    """
+    Load the blob-referenced attachments of messages that survived trimming.
+
+    Messages with references are copied, so the history keeps its references.
+    """
+    materialized = []
+    for message in messages:
+        attachments = message_field(message, "attachments")
+        if not attachments or all(isinstance(a, str) for a in attachments):
+            materialized.append(message)
+            continue
+        resolved = [resolve_attachment(a) for a in attachments]
+        if isinstance(message, dict):
+            materialized.append({**message, "attachments": resolved})
+        else:
+            copy = Message(
+                role=message.role, content=message.content, attachments=resolved
+            )
+            copy.filename = message.filename
+            materialized.append(copy)
+    return materialized
+
+
 def trim_context(
-    args: AgentixConfig, messages: list[Message], max_tokens: int
+    args: AgentixConfig,
+    messages: list[Message],
+    max_tokens: int,
+    top_k: int = RELEVANCE_TOP_K,
 ) -> list[Message]:
-    """Handle message history with token-based trimming."""
+    """
+    Handle message history with token-based trimming.
+
+    When the history does not fit, the most recent turns are kept and up to `top_k`
+    older turns are recalled by BM25 relevance to the newest message. Attachment
+    blobs are only loaded for the messages that are kept.
+    """
 
     # save the untrimmed history first
     os.makedirs(f"{SESSIONS_DIR}{args.session}", exist_ok=True)
@@ -77,30 +145,45 @@ def trim_context(
         json.dump(messages, f, indent=2)
 
     # Trim history based on token limits (max_tokens)
+    token_counts = [message_tokens(message) for message in messages]
+    if sum(token_counts) <= max_tokens:
+        return materialize_attachments(messages)
+
+    # The history overflows: fill the recent tail into what remains after reserving
+    # a share of the budget for older turns relevant to the current prompt
+    relevance_budget = int(max_tokens * RELEVANCE_BUDGET_FRACTION) if top_k else 0
     total_tokens = 0
     trimmed_history = []
+    cut = len(messages)
 
     # Iterate over messages from the most recent to the oldest
-    for message in reversed(messages):
-        # Estimate tokens for the current message
-        # Assuming 1 token per 4 characters as a rough approximation
-        message_tokens = len(message["content"]) // 4
-        if "attachments" in message:
-            for attachment in message["attachments"]:
-                message_tokens += len(attachment) // 4
-
+    for position in range(len(messages) - 1, -1, -1):
         # Check if adding this message exceeds the token limit
-        if total_tokens + message_tokens > max_tokens:
+        limit = max_tokens if not trimmed_history else max_tokens - relevance_budget
+        if total_tokens + token_counts[position] > limit:
             break  # Stop adding messages if the limit is exceeded
 
         # Add the message to the trimmed history and update the token count
-        trimmed_history.append(message)
-        total_tokens += message_tokens
+        trimmed_history.append(messages[position])
+        total_tokens += token_counts[position]
+        cut = position
 
     # Reverse the trimmed history to maintain chronological order
     trimmed_history.reverse()
 
-    return trimmed_history
+    # Pull the most relevant older turns back in instead of dropping them blindly
+    if trimmed_history and cut > 0:
+        recalled = recall_relevant(
+            args.session,
+            messages[:cut],
+            message_text(messages[-1]),
+            max_tokens - total_tokens,
+            top_k,
+            message_tokens,
+        )
+        trimmed_history = recalled + trimmed_history
+
+    return materialize_attachments(trimmed_history)
 
 
 def manage_sessions(args: AgentixConfig) -> list[Message]:
@@ -165,6 +248,7 @@ def update_session(args: AgentixConfig, history: list[Message], response: str):
     """Update session history with the latest interaction."""
     session_dir = f"{SESSIONS_DIR}{args.session}"
     os.makedirs(session_dir, exist_ok=True)
+    index = session_index(args.session)
 
     # Save each message in the history that hasn't been saved yet
     for message in history:
@@ -187,6 +271,13 @@ def update_session(args: AgentixConfig, history: list[Message], response: str):
                 )
 
             message.filename = filename  # Assign the filename to the message
+            index.add(filename, message_text(message))
+
+    if args.embedding_model:
+        try:
+            embedding_memory(args.embedding_model).add_messages(args.session, history)
+        except (requests.RequestException, KeyError, ValueError) as e:
+            print(f"Error updating embedding memory: {e}", file=sys.stderr)
 
 
 def get_session_history(args: AgentixConfig) -> list[Message]:
@@ -0,0 +1,57 @@
+"""
+Docstring for agentix.edits
+"""
+
+from .atomic import atomic_write
+from .patch import (
+    Hunk,
+    PatchError,
+    apply_edit,
+    apply_hunks,
+    find_block,
+    parse_edit,
+    parse_search_replace,
+    parse_unified_diff,
+    validate_python,
+)
+from .stream import AttachmentStream, decode_base64_stream
+
+# Validation is loaded on first use (PEP 562): most runs never validate
+_VALIDATE_ATTRIBUTES = (
+    "Diagnostic",
+    "ValidationResult",
+    "format_diagnostics",
+    "validate_source",
+    "validate_sources",
+)
+
+
+def __getattr__(name: str):
+    if name not in _VALIDATE_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import validate
+
+    value = getattr(validate, name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "AttachmentStream",
+    "Diagnostic",
+    "Hunk",
+    "PatchError",
+    "ValidationResult",
+    "apply_edit",
+    "apply_hunks",
+    "atomic_write",
+    "decode_base64_stream",
+    "find_block",
+    "format_diagnostics",
+    "parse_edit",
+    "parse_search_replace",
+    "parse_unified_diff",
+    "validate_python",
+    "validate_source",
+    "validate_sources",
+]
@@ -0,0 +1,85 @@
+"""
+agentix.edits.atomic
+
+Atomic file replacement.
+
+Content is written to a temporary file next to the target, validated, flushed
+to disk with fsync, and renamed over the target with `os.replace`. Readers see
+either the old file or the complete new one, and a failed or rejected write
+leaves the target untouched.
+"""
+
+import os
+import secrets
+from contextlib import contextmanager
+from typing import IO, Callable, Iterator, Optional
+
+
+def _create_temporary(directory: str, name: str, mode: int) -> tuple[int, str]:
+    """Create and open a new temporary file; the process umask applies to mode."""
+    while True:
+        path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, mode), path
+        except FileExistsError:
+            continue
+
+
+def _fsync_directory(directory: str) -> None:
+    # persist the rename itself; not supported on every platform
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(
+    path: str,
+    mode: str = "w",
+    encoding: Optional[str] = "utf-8",
+    validate: Optional[Callable[[str], None]] = None,
+) -> Iterator[IO]:
+    """
+    Open a temporary file that replaces `path` when the block exits cleanly.
+
+    :param mode: "w" for text or "wb" for bytes.
+    :param validate: Called with the temporary file's path before the swap; an
+        exception it raises aborts the replacement.
+
+    The target's permissions are kept. If the block or validation raises, the
+    temporary file is removed and the exception propagates.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        target_mode: Optional[int] = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        target_mode = None
+    # a new file gets the permissions open() would give it, under the current
+    # umask; a replacement stays private until it takes the target's mode
+    fd, tmp_path = _create_temporary(
+        directory, os.path.basename(path), 0o666 if target_mode is None else 0o600
+    )
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if validate is not None:
+            validate(tmp_path)
+        if target_mode is not None:
+            os.chmod(tmp_path, target_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
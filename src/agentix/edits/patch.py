@@ -0,0 +1,209 @@
+"""
+agentix.edits.patch
+
+Tolerant patch engine for model-generated edits.
+
+Instead of regenerating a whole file, the model returns either a unified diff
+or SEARCH/REPLACE blocks:
+
+    <<<<<<< SEARCH
+    old lines
+    =======
+    new lines
+    >>>>>>> REPLACE
+
+Each hunk's old lines are located in the file exactly, then ignoring
+indentation and trailing whitespace, then by fuzzy matching (difflib), so
+stale line numbers, re-indented context and small transcription errors do not
+reject the edit. Python results are validated with `ast.parse` before they are
+returned.
+"""
+
+import ast
+import difflib
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from ..constants import FUZZY_MATCH_CUTOFF
+
+_HUNK_HEADER = re.compile(r"@@ -(\d+)(?:,(\d+))? \+\d+(?:,(\d+))? @@")
+_SEARCH = re.compile(r"^<{5,9} SEARCH\s*$")
+_DIVIDER = re.compile(r"^={5,9}\s*$")
+_REPLACE = re.compile(r"^>{5,9} REPLACE\s*$")
+
+
+class PatchError(ValueError):
+    """An edit that cannot be parsed, located, or that breaks the file's syntax."""
+
+
+@dataclass
+class Hunk:
+    """
+    One replacement: `old` lines become `new` lines.
+
+    `start` is the 0-based line the hunk claims to start at (None if unknown);
+    it only breaks ties between several matches.
+    """
+
+    old: list[str]
+    new: list[str]
+    start: Optional[int] = None
+
+
+def parse_unified_diff(text: str) -> list[Hunk]:
+    """Parse the hunks of a unified diff; file headers are ignored."""
+    hunks: list[Hunk] = []
+    hunk: Optional[Hunk] = None
+    old_count = new_count = 0  # lines the current hunk header announced
+    for line in text.splitlines():
+        header = _HUNK_HEADER.match(line)
+        if header:
+            old_count = int(header.group(2) or 1)
+            new_count = int(header.group(3) or 1)
+            # "-N,0" inserts after line N; otherwise the hunk starts at line N
+            start = int(header.group(1))
+            hunk = Hunk([], [], start if old_count == 0 else max(start - 1, 0))
+            hunks.append(hunk)
+            continue
+        # "--- x" is a removed "-- x" line until the hunk has all its lines
+        if line.startswith(("--- ", "+++ ")) and (
+            hunk is None or (len(hunk.old) >= old_count and len(hunk.new) >= new_count)
+        ):
+            hunk = None
+            continue
+        if hunk is None:
+            continue
+        if line.startswith("-"):
+            hunk.old.append(line[1:])
+        elif line.startswith("+"):
+            hunk.new.append(line[1:])
+        elif line.startswith(" ") or not line:
+            hunk.old.append(line[1:])
+            hunk.new.append(line[1:])
+        # "\ No newline at end of file" and other lines carry no content
+    return [h for h in hunks if h.old or h.new]
+
+
+def parse_search_replace(text: str) -> list[Hunk]:
+    """Parse SEARCH/REPLACE blocks."""
+    hunks = []
+    section = None
+    old: list[str] = []
+    new: list[str] = []
+    for line in text.splitlines():
+        if _SEARCH.match(line):
+            section, old, new = "old", [], []
+        elif section == "old" and _DIVIDER.match(line):
+            section = "new"
+        elif section == "new" and _REPLACE.match(line):
+            hunks.append(Hunk(old, new))
+            section = None
+        elif section == "old":
+            old.append(line)
+        elif section == "new":
+            new.append(line)
+    if section is not None:
+        raise PatchError("Unterminated SEARCH/REPLACE block")
+    return hunks
+
+
+def parse_edit(text: str) -> list[Hunk]:
+    """Parse an edit as SEARCH/REPLACE blocks or, failing that, a unified diff."""
+    hunks = parse_search_replace(text)
+    if not hunks:
+        hunks = parse_unified_diff(text)
+    if not hunks:
+        raise PatchError("No unified diff hunks or SEARCH/REPLACE blocks found")
+    return hunks
+
+
+def _closest(candidates: list[int], start: Optional[int]) -> int:
+    return min(candidates, key=lambda i: abs(i - start) if start is not None else i)
+
+
+def find_block(
+    lines: list[str],
+    block: list[str],
+    start: Optional[int] = None,
+    cutoff: float = FUZZY_MATCH_CUTOFF,
+) -> int:
+    """
+    Locate a block of lines in a file.
+
+    :param start: Expected position; the closest of several matches wins.
+    :param cutoff: Minimum difflib similarity ratio for a fuzzy match.
+    :return: The 0-based index of the first line of the match.
+    """
+    n = len(block)
+    if n == 0:
+        return min(start, len(lines)) if start is not None else len(lines)
+    windows = range(len(lines) - n + 1)
+
+    exact = [i for i in windows if lines[i : i + n] == block]
+    if exact:
+        return _closest(exact, start)
+
+    stripped = [line.strip() for line in block]
+    loose = [
+        i for i in windows if [line.strip() for line in lines[i : i + n]] == stripped
+    ]
+    if loose:
+        return _closest(loose, start)
+
+    target = "\n".join(stripped)
+    best, best_ratio = None, cutoff
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    matcher.set_seq2(target)
+    for i in windows:
+        matcher.set_seq1("\n".join(line.strip() for line in lines[i : i + n]))
+        # the cheap upper bounds skip most windows before the full ratio
+        if (
+            matcher.real_quick_ratio() < best_ratio
+            or matcher.quick_ratio() < best_ratio
+        ):
+            continue
+        ratio = matcher.ratio()
+        if ratio < best_ratio:
+            continue
+        if best is None or ratio > best_ratio or _closest([best, i], start) == i:
+            best, best_ratio = i, ratio
+    if best is None:
+        preview = block[0].strip() if block else ""
+        raise PatchError(f"Could not locate hunk starting with {preview!r}")
+    return best
+
+
+def apply_hunks(source: str, hunks: list[Hunk]) -> str:
+    """Apply hunks in order, each located relative to the edits before it."""
+    trailing_newline = source.endswith("\n") or not source
+    lines = source.splitlines()
+    offset = 0
+    for hunk in hunks:
+        start = hunk.start + offset if hunk.start is not None else None
+        index = find_block(lines, hunk.old, start)
+        lines[index : index + len(hunk.old)] = hunk.new
+        offset += len(hunk.new) - len(hunk.old)
+    return "\n".join(lines) + ("\n" if trailing_newline and lines else "")
+
+
+def validate_python(source: str, path: str = "<edit>") -> None:
+    """Raise PatchError if Python source does not parse."""
+    try:
+        ast.parse(source, filename=path)
+    except SyntaxError as e:
+        raise PatchError(f"Edit breaks {path} at line {e.lineno}: {e.msg}") from e
+
+
+def apply_edit(source: str, edit: str, path: str = "") -> str:
+    """
+    Apply a unified diff or SEARCH/REPLACE edit to a file's source.
+
+    Python files (by extension) are validated before the result is returned.
+
+    :raises PatchError: if the edit cannot be parsed or located, or breaks syntax.
+    """
+    patched = apply_hunks(source, parse_edit(edit))
+    if path.endswith(".py"):
+        validate_python(patched, path)
+    return patched
@@ -0,0 +1,145 @@
+"""
+agentix.edits.stream
+
+Stream file attachments out of a model response as it is generated.
+
+The structured response (see system_prompts/structured_response.md) carries a
+file's contents as the JSON string value of an attachment's "data" key. The
+`AttachmentStream` scanner decodes that string incrementally, chunk by chunk,
+so the file can be written while tokens are still arriving and the whole
+response is never held in memory.
+"""
+
+import base64
+import binascii
+from typing import Iterator, Optional
+
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+# Attachment fields captured whole; any other string value is skipped unread
+_FIELDS = ("name", "encoding", "language")
+_MAX_FIELD_CHARS = 4096
+
+
+class AttachmentStream:
+    """
+    Incremental scanner for the attachments of a structured response.
+
+    `feed` takes response chunks and yields events:
+        ("name" | "encoding" | "language", value) once a field is complete,
+        ("data", text) for each decoded piece of a "data" string,
+        ("end", None) when a "data" string is complete.
+    """
+
+    def __init__(self):
+        self._in_string = False
+        self._escape = ""  # pending escape sequence, e.g. "\\u00"
+        self._high_surrogate: Optional[str] = None
+        self._buffer: list[str] = []  # current key or captured value
+        self._capture: Optional[str] = None  # field whose value is being read
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None  # key awaiting its value
+
+    def _decode_escape(self, sequence: str) -> str:
+        if sequence[1] != "u":
+            return _ESCAPES.get(sequence[1], sequence[1])
+        char = chr(int(sequence[2:], 16))
+        if "\ud800" <= char <= "\udbff":
+            self._high_surrogate = char
+            return ""
+        if "\udc00" <= char <= "\udfff" and self._high_surrogate:
+            pair = self._high_surrogate + char
+            self._high_surrogate = None
+            return pair.encode("utf-16", "surrogatepass").decode("utf-16")
+        return char
+
+    def _string_chunk(self, chunk: str, i: int) -> tuple[int, str, bool]:
+        """Decode string content from chunk[i:]; return (next index, text, closed)."""
+        out = []
+        n = len(chunk)
+        while i < n:
+            if self._escape:
+                self._escape += chunk[i]
+                i += 1
+                if self._escape[1] != "u" or len(self._escape) == 6:
+                    out.append(self._decode_escape(self._escape))
+                    self._escape = ""
+                continue
+            # copy the run of plain characters in one slice
+            end = i
+            while end < n and chunk[end] not in '"\\':
+                end += 1
+            out.append(chunk[i:end])
+            if end == n:
+                return n, "".join(out), False
+            if chunk[end] == "\\":
+                self._escape = "\\"
+                i = end + 1
+                continue
+            return end + 1, "".join(out), True
+        return i, "".join(out), False
+
+    def feed(self, chunk: str) -> Iterator[tuple[str, Optional[str]]]:
+        """Scan the next chunk of the response."""
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if self._in_string:
+                i, text, closed = self._string_chunk(chunk, i)
+                if self._capture == "data":
+                    if text:
+                        yield "data", text
+                elif self._capture is not None or self._key is None:
+                    # a captured field or a candidate key
+                    if sum(map(len, self._buffer)) < _MAX_FIELD_CHARS:
+                        self._buffer.append(text)
+                if closed:
+                    self._in_string = False
+                    value = "".join(self._buffer)
+                    self._buffer = []
+                    if self._capture == "data":
+                        yield "end", None
+                    elif self._capture is not None:
+                        yield self._capture, value
+                    else:
+                        self._last_string = value
+                    self._capture = None
+                    self._key = None
+                continue
+            char = chunk[i]
+            i += 1
+            if char == '"':
+                self._in_string = True
+                if self._key in _FIELDS + ("data",):
+                    self._capture = self._key
+                self._last_string = None
+            elif char == ":":
+                self._key = self._last_string
+            elif char in ",{}[]":
+                self._key = None
+                self._last_string = None
+
+
+def decode_base64_stream(pieces: Iterator[str]) -> Iterator[bytes]:
+    """Decode base64 text arriving in arbitrary pieces."""
+    pending = ""
+    for piece in pieces:
+        pending += "".join(piece.split())
+        usable = len(pending) - len(pending) % 4
+        if usable:
+            try:
+                yield base64.b64decode(pending[:usable], validate=True)
+            except binascii.Error as e:
+                raise ValueError(f"Invalid base64 attachment data: {e}") from e
+            pending = pending[usable:]
+    if pending:
+        raise ValueError("Truncated base64 attachment data")
@@ -1,6 +1,32 @@
 # File I/O utilities for Agentix CLI
 
+import hashlib
 import sys
+from functools import partial
+from typing import TYPE_CHECKING, Optional
+
+from .attachments import (
+    attachment_cache,
+    cap_tokens,
+    expand_attachment_specs,
+    get_blob,
+    load_parallel,
+    minify_source,
+    pack_by_relevance,
+    put_blob,
+    read_attachment,
+)
+from .constants import ATTACHMENT_MAX_BYTES, ATTACHMENT_MAX_TOKENS, ATTACHMENT_WORKERS
+from .edits import (
+    AttachmentStream,
+    apply_edit,
+    atomic_write,
+    decode_base64_stream,
+    validate_python,
+)
+
+if TYPE_CHECKING:
+    from .edits.validate import ValidationResult
 
 
 def load_file(file_path: str) -> str:
@@ -9,11 +35,97 @@ def load_file(file_path: str) -> str:
         return file.read()
 
 
-def get_file(file_path: str) -> str:
-    """Load a file and return it with formatted output wrapper."""
+def wrap_file_content(file_path: str, content: str) -> str:
+    """Wrap file content in the attachment markers sent to the model."""
+    return f"[FILE: {file_path}]\n{content}\n[END OF FILE]\n\n"
+
+
+def transform_python(source: str, mode: str, query: Optional[str] = None) -> str:
+    """
+    Reduce Python source according to an attachment mode.
+
+    - "slice": the symbols relevant to the query in full, other functions stubbed,
+    - "minify": no comments, docstrings or blank lines, deep bodies elided,
+    - "outline": signatures and docstring summaries only,
+    - anything else: the source unchanged.
+    """
+    # imported here so LibCST is only loaded when a mode needs it
+    if mode == "slice":
+        from .attachments.slicing import slice_source
+
+        return slice_source(source, query or "")
+    if mode == "minify":
+        return minify_source(source)
+    if mode == "outline":
+        from .tools.repo_map import outline_source
+
+        return outline_source(source) or source
+    return source
+
+
+def load_transformed(
+    file_path: str, mode: str, query: Optional[str], max_bytes: int, max_tokens: int
+) -> str:
+    """Read a Python file and reduce it according to an attachment mode."""
+    # the token cap applies to the result, not to the source being reduced
+    source = read_attachment(file_path, max_bytes, max_tokens=max_bytes)
+    return cap_tokens(transform_python(source, mode, query), max_tokens)
+
+
+def load_attachment_entry(
+    file_path: str,
+    max_bytes: int = ATTACHMENT_MAX_BYTES,
+    max_tokens: int = ATTACHMENT_MAX_TOKENS,
+    query: Optional[str] = None,
+    mode: str = "full",
+) -> dict:
+    """
+    Return the attachment cache entry for a file read within byte and token caps.
+
+    Binary files become a placeholder and oversized files a head/tail sample
+    (see `agentix.attachments.reader`). Python files can be sliced to the symbols
+    relevant to the query, minified, or outlined (see `transform_python`); each
+    mode is cached separately, slices only for the latest query.
+    """
+    variant = f"{max_bytes}:{max_tokens}"
+    if mode != "full" and file_path.endswith(".py"):
+        variant = f"{variant}:{mode}"
+        tag = None
+        if mode == "slice":
+            # one slice per file: every prompt has its own query
+            tag = hashlib.sha256((query or "").encode("utf-8")).hexdigest()[:16]
+        return attachment_cache().get(
+            file_path,
+            partial(
+                load_transformed,
+                mode=mode,
+                query=query,
+                max_bytes=max_bytes,
+                max_tokens=max_tokens,
+            ),
+            variant=variant,
+            tag=tag,
+        )
+    return attachment_cache().get(
+        file_path,
+        partial(read_attachment, max_bytes=max_bytes, max_tokens=max_tokens),
+        variant=variant,
+    )
+
+
+def get_file(
+    file_path: str,
+    max_bytes: int = ATTACHMENT_MAX_BYTES,
+    max_tokens: int = ATTACHMENT_MAX_TOKENS,
+) -> str:
+    """
+    Load a file and return it with formatted output wrapper.
+
+    Contents come from the attachment cache, so an unchanged file is not re-read.
+    """
     try:
-        content = load_file(file_path)
-        return f"[FILE: {file_path}]\n{content}\n[END OF FILE]\n\n"
+        entry = load_attachment_entry(file_path, max_bytes, max_tokens)
+        return wrap_file_content(file_path, attachment_cache().content(entry))
     except Exception as e:
         print(f"Error loading file {file_path}: {e}", file=sys.stderr)
         return ""
@@ -27,15 +139,249 @@ def get_attachments(args) -> list:
             attachments.append(get_file(attachment_path))
         except Exception as e:
             print(f"Error loading attachment {attachment_path}: {e}", file=sys.stderr)
+    attachment_cache().save()
     return attachments
 
 
-def replace_file_content(args, attachment: dict) -> None:
-    """replace the content of a file with the provided attachment data."""
+def store_attachment(
+    file_path: str,
+    max_bytes: int = ATTACHMENT_MAX_BYTES,
+    max_tokens: int = ATTACHMENT_MAX_TOKENS,
+    query: Optional[str] = None,
+    mode: str = "full",
+) -> dict:
+    """
+    Store a file's content in the blob store and return a reference to it.
+
+    The reference holds only the digest and metadata:
+        {"blob": <sha256>, "path": ..., "size": <bytes>, "tokens": <estimate>}
+    An unchanged file is served from the attachment cache at the cost of a `stat`.
+    """
+    entry = load_attachment_entry(file_path, max_bytes, max_tokens, query, mode)
+    return {
+        "blob": entry["blob"] or put_blob(attachment_cache().content(entry)),
+        "path": file_path,
+        "size": entry["size"],
+        "tokens": entry["tokens"] + len(wrap_file_content(file_path, "")) // 4,
+    }
+
+
+def get_attachment_refs(args) -> list[dict]:
+    """
+    Store the files provided in args as blobs and return their references.
+
+    Directories and glob patterns are expanded honoring `.gitignore`, files are
+    read on a thread pool, and when they exceed `args.attachment_budget_tokens`
+    the files most relevant to the user prompt are kept. A "::<mode>" suffix
+    (full, slice, minify, outline) selects how an argument's Python files are sent.
+    """
+    query = "\n".join(args.user or [])
+    default_mode = "slice" if args.slice_code else "full"
+    expanded = expand_attachment_specs(args.file_path or [])
+    modes = {path: mode or default_mode for path, _, mode in expanded}
+    results = load_parallel(
+        [path for path, _, _ in expanded],
+        lambda path: store_attachment(
+            path,
+            max_bytes=args.attachment_max_bytes,
+            max_tokens=args.attachment_max_tokens,
+            query=query,
+            mode=modes[path],
+        ),
+        ATTACHMENT_WORKERS,
+    )
+    refs = []
+    items = []
+    for (path, explicit, _), result in zip(expanded, results):
+        if isinstance(result, Exception):
+            print(f"Error loading attachment {path}: {result}", file=sys.stderr)
+            continue
+        refs.append(result)
+        items.append((path, explicit, result["tokens"]))
+    attachment_cache().save()
+
+    chosen = pack_by_relevance(
+        items,
+        query,
+        args.attachment_budget_tokens,
+        lambda i: get_blob(refs[i]["blob"]),
+    )
+    if len(chosen) < len(refs):
+        print(
+            f"Attachment budget: kept {len(chosen)} of {len(refs)} files",
+            file=sys.stderr,
+        )
+    return [refs[i] for i in chosen]
+
+
+def is_attachment_ref(attachment) -> bool:
+    """Check if an attachment is a blob reference rather than inline content."""
+    return isinstance(attachment, dict) and "blob" in attachment
+
+
+def attachment_tokens(attachment) -> int:
+    """Estimate the tokens of an inline attachment or a blob reference."""
+    if is_attachment_ref(attachment):
+        return attachment["tokens"]
+    return len(attachment) // 4
+
+
+def resolve_attachment(attachment) -> str:
+    """Return the wrapped content of an attachment, loading blob references."""
+    if not is_attachment_ref(attachment):
+        return attachment
+    try:
+        return wrap_file_content(attachment["path"], get_blob(attachment["blob"]))
+    except OSError as e:
+        print(
+            f"Error loading attachment blob {attachment['blob']}: {e}", file=sys.stderr
+        )
+        return ""
+
+
+def _validator(name: str):
+    """Return a validator for a file's temporary copy, or None if not Python."""
+    if not name.endswith(".py"):
+        return None
+    return lambda tmp_path: validate_python(load_file(tmp_path), name)
+
+
+def write_attachment_stream(name: str, pieces, encoding: str = "utf-8") -> None:
+    """
+    Write the pieces of an attachment's data atomically to a file.
+
+    Pieces are written as they arrive (base64 data is decoded on the fly), so
+    memory stays flat whatever the file size. Python files are validated before
+    they replace the original; on any error the original is left unchanged.
+    """
+    if encoding == "base64":
+        with atomic_write(name, "wb", validate=_validator(name)) as f:
+            for data in decode_base64_stream(pieces):
+                f.write(data)
+    else:
+        with atomic_write(name, "w", encoding, validate=_validator(name)) as f:
+            for piece in pieces:
+                f.write(piece)
+
+
+def report_validation(results: list["ValidationResult"]) -> None:
+    """Print the diagnostics of validated files to stderr."""
+    # imported here: validation loads the formatters, most runs never need it
+    from .edits.validate import format_diagnostics
+
+    for result in results:
+        if result.ok:
+            print(f"Validated {result.path}: no issues", file=sys.stderr)
+    diagnostics = format_diagnostics(results)
+    if diagnostics:
+        print(diagnostics, file=sys.stderr)
+
+
+def replace_file_content(args, attachment: dict) -> Optional["ValidationResult"]:
+    """
+    replace the content of a file with the provided attachment data.
+
+    An attachment with an "edit" (a unified diff or SEARCH/REPLACE blocks) is
+    applied to the current file instead. The file is replaced atomically and
+    left unchanged if the edit does not apply or the result breaks its syntax.
+
+    :return: With `args.validate_edits`, the diagnostics of a replaced Python file.
+    """
     encoding = attachment.get("encoding", "utf-8")
     language = attachment.get("language", "text")
     name = attachment.get("name", args.file_path[0] if args.file_path else "")
-    data = attachment.get("data", "")
-    print(f"Replacing content of {language} file: {name}", file=sys.stderr)
-    with open(name, "w", encoding=encoding) as f:
-        f.write(data.decode(encoding))
+    try:
+        if "edit" in attachment:
+            print(f"Editing {language} file: {name}", file=sys.stderr)
+            with open(name, "r", encoding=encoding) as f:
+                data = apply_edit(f.read(), attachment["edit"], name)
+        else:
+            print(f"Replacing content of {language} file: {name}", file=sys.stderr)
+            data = attachment.get("data", "")
+        write_attachment_stream(name, [data], encoding)
+    except (OSError, ValueError) as e:
+        print(f"Error replacing content of {name}: {e}", file=sys.stderr)
+        return None
+    if not (args.validate_edits and name.endswith(".py")):
+        return None
+    # imported here: validation loads the formatters, most runs never need it
+    from .edits.validate import validate_source
+
+    result = validate_source(data, name)
+    report_validation([result])
+    return result
+
+
+class _DataPieces:
+    """The "data" pieces of one attachment, read from a stream of scanner events."""
+
+    def __init__(self, first: Optional[str], events):
+        self.first = first
+        self.events = events
+        self.ended = first is None
+
+    def __iter__(self):
+        if self.first:
+            yield self.first
+        if self.ended:
+            return
+        for event, value in self.events:
+            if event == "end":
+                self.ended = True
+                return
+            yield value
+        raise ValueError("Response ended inside attachment data")
+
+    def drain(self) -> None:
+        """Skip the rest of the data after a failed write."""
+        if not self.ended:
+            for event, _ in self.events:
+                if event == "end":
+                    break
+            self.ended = True
+
+
+def replace_files_from_stream(args, chunks) -> list[str]:
+    """
+    Stream the attachments of a structured response into their files.
+
+    :param chunks: The response text as it is generated (see `stream_api`).
+    :return: The names of the files replaced.
+
+    Each attachment is written to a temporary file as its tokens arrive and
+    swapped in atomically once complete and valid; attachments that fail are
+    reported and leave their files unchanged. With `args.validate_edits` the
+    replaced Python files are then validated together.
+    """
+    scanner = AttachmentStream()
+    events = (event for chunk in chunks for event in scanner.feed(chunk))
+    default_name = args.file_path[0] if args.file_path else ""
+    fields: dict = {}
+    replaced = []
+    for event, value in events:
+        if event not in ("data", "end"):
+            fields[event] = value
+            continue
+        name = fields.get("name") or default_name
+        pieces = _DataPieces(value, events)
+        print(
+            f"Replacing content of {fields.get('language', 'text')} file: {name}",
+            file=sys.stderr,
+        )
+        try:
+            write_attachment_stream(name, pieces, fields.get("encoding", "utf-8"))
+            replaced.append(name)
+        except (OSError, ValueError) as e:
+            print(f"Error replacing content of {name}: {e}", file=sys.stderr)
+            pieces.drain()
+        fields = {}
+    if args.validate_edits:
+        # imported here: validation loads the formatters, most runs never need it
+        from .edits.validate import validate_sources
+
+        sources = {}
+        for name in replaced:
+            if name.endswith(".py"):
+                sources[name] = load_file(name)
+        report_validation(list(validate_sources(sources).values()))
+    return replaced
@@ -29,7 +29,7 @@ def main(args: AgentixConfig) -> None:
                 print("No sessions found", file=sys.stderr)
             return
         case "serve":
-            start_server(args.port)
+            start_server(args.port, args.tools)
             return
         case "run_agentix":
             agentix(args)
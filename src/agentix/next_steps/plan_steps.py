@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Optional
 
+from agentix.tools.registry import ToolRegistry, tool_registry
+
 PlanAction = Enum("PlanActions", ("tool", "internal"))
 
 AssertionType = Enum(
@@ -56,6 +58,7 @@ class PlanStep:
         self.inputs = inputs
         self.expected_outputs = expected_outputs
         self.assertions = assertions
+        self.outputs: Any = None
         self._completed = False
 
     def check_completion(self):
@@ -71,7 +74,13 @@ class PlanStep:
             self.check_completion()
         return self._completed
 
-    def do_action(self):
+    def do_action(self, registry: Optional[ToolRegistry] = None):
+        """
+        Perform the step.
+
+        :param registry: Tool dispatch table; defaults to the built-in tools.
+        :return: The tool's result, also kept in `outputs`, for tool actions.
+        """
         match self.action:
             case PlanAction.tool:
                 if (
@@ -82,8 +91,10 @@ class PlanStep:
                     raise ValueError(
                         "Missing tool, inputs, or expected outputs for a tool action."
                     )
-                self.tool(self.inputs, self.expected_outputs)
-                return
+                if registry is None:
+                    registry = tool_registry()
+                self.outputs = registry.call(self.tool, self.inputs)
+                return self.outputs
             case PlanAction.internal:
                 # Call the LLM to perform this task
                 return
@@ -2,12 +2,45 @@
 Docstring for agentix.next_steps.respond_directly
 """
 
+import json
+import sys
+
 from agentix import AgentixConfig
+from agentix.api_client import stream_api
 from agentix.context.message import Message
+from agentix.context.prompts import uses_diff_edits
+from agentix.context.sessions import assemble_prompts
+from agentix.file_utils import replace_file_content, replace_files_from_stream
 from agentix.prompt_classification_response import NextStep
 
 
 def respond_directly(
     args: AgentixConfig, next_step: NextStep, history: list[Message], max_tokens: int
 ) -> str:
-    pass
+    """
+    Handle the respond directly next step.
+
+    With --replace-file the answer is streamed: each whole file it attaches is
+    written to disk as it is generated and swapped in once complete. Diff
+    edits apply to the current file, so they wait for the whole answer.
+
+    :return: With --replace-file, the names of the attached files, one per line.
+    """
+    if not args.replace_file:
+        return ""
+    payload = assemble_prompts(args, history, max_tokens)
+    chunks = stream_api(args, payload)
+    if not uses_diff_edits(args):
+        return "\n".join(replace_files_from_stream(args, chunks))
+    try:
+        parts = json.loads("".join(chunks))
+    except json.JSONDecodeError as e:
+        print(f"Error parsing the edits response: {e}", file=sys.stderr)
+        return ""
+    names = []
+    for part in parts if isinstance(parts, list) else [parts]:
+        attachment = part.get("attachment") if isinstance(part, dict) else None
+        if isinstance(attachment, dict):
+            replace_file_content(args, attachment)
+            names.append(attachment.get("name", ""))
+    return "\n".join(names)
@@ -1,5 +1,7 @@
 # agentix/server.py
 
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
@@ -115,7 +117,16 @@ async def retrieve_engine(engine_id: str):
     return JSONResponse(content={"error": "Engine not found"}, status_code=404)
 
 
-def start_server(port: int):
+def start_server(port: int, tools: Optional[list[str]] = None):
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    from .tools.tool_index import tool_index
+
+    # index the configured tool sources, and keep them current while serving
+    if tools:
+        tool_index().watch(tools)
+    tool_index().start()
+    try:
+        uvicorn.run(app, host="0.0.0.0", port=port)
+    finally:
+        tool_index().stop()
@@ -1,16 +1,63 @@
-"""agentix.tools package initializer"""
-
-from . import ast_tools, cst_tools, describe_tools
-from .describe_tools import (
-    ToolExtractor,
-    extract_tools_from_code,
-    extract_tools_from_file,
-    to_openai_tools,
+"""agentix.tools package initializer
+
+Submodules and their functions are imported on first use (PEP 562), so
+importing the package does not load LibCST.
+"""
+
+import importlib
+import os
+
+_SUBMODULES = (
+    "ast_tools",
+    "cst_tools",
+    "describe_tools",
+    "registry",
+    "repo_map",
+    "tool_index",
+    "project_parser",
+    "symbol_index",
+    "codemod",
+    "composite_visitor",
 )
 
+_ATTRIBUTES = {
+    "ToolExtractor": ".describe_tools",
+    "extract_tools_from_code": ".describe_tools",
+    "extract_tools_from_file": ".describe_tools",
+    "extract_tools_from_directory": ".describe_tools",
+    "extract_tools_from_package": ".describe_tools",
+    "to_openai_tools": ".describe_tools",
+    "build_repo_map": ".repo_map",
+    "ToolRegistry": ".registry",
+    "tool_registry": ".registry",
+    "UnknownToolError": ".registry",
+    "ToolIndex": ".tool_index",
+    "parse_project": ".project_parser",
+    "iter_parsed": ".project_parser",
+    "SymbolIndex": ".symbol_index",
+    "run_codemod": ".codemod",
+    "CompositeVisitor": ".composite_visitor",
+    "visit_all": ".composite_visitor",
+}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _ATTRIBUTES:
+        value = getattr(importlib.import_module(_ATTRIBUTES[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 
 def extract_cst_tools():
-    return extract_tools_from_file(cst_tools.__file__)
+    from .describe_tools import extract_tools_from_file
+
+    return extract_tools_from_file(
+        os.path.join(os.path.dirname(__file__), "cst_tools.py")
+    )
 
 
 __all__ = [
@@ -21,5 +68,25 @@ __all__ = [
     "describe_tools",
     "extract_tools_from_file",
     "extract_tools_from_code",
+    "extract_tools_from_directory",
+    "extract_tools_from_package",
     "extract_cst_tools",
+    "repo_map",
+    "build_repo_map",
+    "registry",
+    "ToolRegistry",
+    "tool_registry",
+    "UnknownToolError",
+    "tool_index",
+    "ToolIndex",
+    "project_parser",
+    "parse_project",
+    "iter_parsed",
+    "symbol_index",
+    "SymbolIndex",
+    "codemod",
+    "run_codemod",
+    "composite_visitor",
+    "CompositeVisitor",
+    "visit_all",
 ]
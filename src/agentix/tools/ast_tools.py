@@ -1,7 +1,17 @@
 """agentix.tools.ast_tools.py"""
 
 import ast
+import math
 from glob import glob
+from json.encoder import encode_basestring_ascii as _encode_string
+from operator import attrgetter
+from typing import Collection, Iterator, Optional, TextIO
+
+from ..constants import NODE_JSON_CHUNK_SIZE
+from .project_parser import parse_project
+
+_POSITIONS = ("lineno", "col_offset", "end_lineno", "end_col_offset")
+_MISSING = object()
 
 
 def module_files(root_path: str, module_prefix: str) -> list:
@@ -21,30 +31,237 @@ def ast_tree(file_path) -> ast.Module:
     return ast.parse(source, filename=file_path, mode="exec")
 
 
-def ast_module(module_files_list: list) -> dict[str, ast.Module]:
-    """Parse multiple Python files into ASTs."""
-    asts = {}
-    for file_path in module_files_list:
-        asts[file_path] = ast_tree(file_path)
-    return asts
-
-
-def node_to_dict(node):
-    """node_to_dict converts an AST node into a dictionary representation."""
-    if isinstance(node, ast.AST):
-        return {
-            "_type": node.__class__.__name__,
-            **{k: node_to_dict(v) for k, v in ast.iter_fields(node)},
-            **{
-                k: getattr(node, k)
-                for k in ("lineno", "col_offset", "end_lineno", "end_col_offset")
-                if hasattr(node, k)
-            },
-        }
-    elif isinstance(node, list):
-        return [node_to_dict(n) for n in node]
+def ast_module(module_files_list: list, strict: bool = True) -> dict[str, ast.Module]:
+    """
+    Parse multiple Python files into ASTs, on a process pool.
+
+    :param strict: Raise on the first file that cannot be read or parsed;
+        otherwise such files are reported and left out.
+    """
+    return parse_project(module_files_list, parser="ast", strict=strict)
+
+
+def node_to_dict(
+    node,
+    fields: Optional[Collection[str]] = None,
+    max_depth: Optional[int] = None,
+    positions: bool = True,
+):
+    """
+    node_to_dict converts an AST node into a dictionary representation.
+
+    Built iteratively, so deeply nested trees do not hit the recursion limit.
+
+    :param fields: Node fields to keep (all when None); "_type" is always kept.
+    :param max_depth: Nodes nested deeper than this keep only their type and
+        position.
+    :param positions: Include lineno, col_offset, end_lineno and end_col_offset.
+    """
+    root = [None]
+    # (value, container, key in the container, depth of the enclosing node)
+    stack = [(node, root, 0, -1)]
+    while stack:
+        value, parent, key, depth = stack.pop()
+        if isinstance(value, ast.AST):
+            out = {"_type": value.__class__.__name__}
+            if max_depth is None or depth < max_depth:
+                for name, child in ast.iter_fields(value):
+                    if fields is None or name in fields:
+                        out[name] = None  # keeps the fields in _fields order
+                        stack.append((child, out, name, depth + 1))
+            if positions:
+                for name in _POSITIONS:
+                    if hasattr(value, name):
+                        out[name] = getattr(value, name)
+        elif isinstance(value, list):
+            out = [None] * len(value)
+            stack.extend((v, out, i, depth) for i, v in enumerate(value))
+        else:
+            out = value  # constants, strings, etc.
+        parent[key] = out
+    return root[0]
+
+
+def _scalar_json(value) -> str:
+    """Encode a field value that is not a node; non-JSON constants as repr."""
+    if isinstance(value, str):
+        return _encode_string(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
+        return repr(value)
+    # bytes, complex, Ellipsis and non-finite floats
+    return _encode_string(repr(value))
+
+
+def _node_template(
+    cls: type, fields: Optional[Collection[str]], positions: bool, compact: bool
+) -> tuple:
+    """
+    Return how a node type is written: its opening, (field, prefix) pairs,
+    (position, prefix) pairs, closing, and the closing with all positions set.
+    """
+    names = [f for f in cls._fields if fields is None or f in fields]
+    attributes = list(cls._attributes) if positions else []
+    if compact:
+        opening, closing = f'["{cls.__name__}"', "]"
+        prefixes = {name: "," for name in names + attributes}
     else:
-        return node  # constants, strings, etc.
+        opening, closing = f'{{"_type":"{cls.__name__}"', "}"
+        prefixes = {name: f',"{name}":' for name in names + attributes}
+    # positions are nearly always all ints: write them with one format
+    fast = None
+    if attributes:
+        fast = (
+            attrgetter(*attributes) if len(attributes) > 1 else None,
+            "".join(f"{prefixes[a]}%d" for a in attributes) + closing,
+        )
+    return (
+        opening,
+        [(f, prefixes[f]) for f in names],
+        [(a, prefixes[a]) for a in attributes],
+        closing,
+        fast,
+    )
+
+
+def iter_node_json(
+    node,
+    fields: Optional[Collection[str]] = None,
+    max_depth: Optional[int] = None,
+    positions: bool = True,
+    compact: bool = False,
+    chunk_size: int = NODE_JSON_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Stream an AST node as JSON text, in chunks of about chunk_size fragments.
+
+    The concatenated chunks are the JSON of node_to_dict(node, ...) without
+    whitespace; constants JSON cannot represent (bytes, complex, ...) become
+    strings of their repr. Memory is bounded by the depth of the tree (and the
+    width of its lists), not its size.
+
+    :param fields: Node fields to keep (all when None).
+    :param max_depth: Nodes nested deeper than this keep only their type and
+        position.
+    :param positions: Include the four position attributes.
+    :param compact: Encode nodes as arrays, [type, *field values, *positions],
+        with the kept fields in the node type's `_fields` order.
+    """
+    templates = {}
+    buffer = []
+    out = buffer.append
+
+    def close(value, template) -> None:
+        fast = template[4]
+        if fast and fast[0]:
+            try:
+                values = fast[0](value)
+            except AttributeError:
+                values = None
+            if values and None not in values:
+                out(fast[1] % values)
+                return
+        for name, prefix in template[2]:
+            position = getattr(value, name, _MISSING)
+            if position is not _MISSING:
+                out(prefix)
+                out(_scalar_json(position))
+        out(template[3])
+
+    def start(value, depth: int) -> Optional[list]:
+        """Open a node or list; return its frame unless it is already closed."""
+        if isinstance(value, list):
+            if not value:
+                out("[]")
+                return None
+            out("[")
+            return [value, None, 0, depth]
+        cls = value.__class__
+        template = templates.get(cls)
+        if template is None:
+            template = templates[cls] = _node_template(cls, fields, positions, compact)
+        out(template[0])
+        if not template[1] or (max_depth is not None and depth > max_depth):
+            close(value, template)
+            return None
+        return [value, template, 0, depth]
+
+    # frames are [node or list, node template or None, next member, depth]
+    stack = []
+    if isinstance(node, (ast.AST, list)):
+        frame = start(node, 0)
+        if frame:
+            stack.append(frame)
+    else:
+        out(_scalar_json(node))
+    while stack:
+        frame = stack[-1]
+        value, template, index, depth = frame
+        if template is None:
+            for index in range(index, len(value)):
+                child = value[index]
+                if index:
+                    out(",")
+                if isinstance(child, (ast.AST, list)):
+                    child_frame = start(child, depth)
+                    if child_frame:
+                        frame[2] = index + 1
+                        stack.append(child_frame)
+                        break
+                else:
+                    out(_scalar_json(child))
+            else:
+                out("]")
+                stack.pop()
+        else:
+            members = template[1]
+            for index in range(index, len(members)):
+                name, prefix = members[index]
+                child = getattr(value, name, _MISSING)
+                if child is _MISSING:
+                    continue
+                out(prefix)
+                if child.__class__ is str:
+                    out(_encode_string(child))
+                    continue
+                if not isinstance(child, (ast.AST, list)):
+                    out(_scalar_json(child))
+                    continue
+                # list items are at the depth of the node's other children
+                child_frame = start(child, depth + 1)
+                if child_frame:
+                    frame[2] = index + 1
+                    stack.append(child_frame)
+                    break
+            else:
+                close(value, template)
+                stack.pop()
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_node_json_lines(module: ast.Module, **options) -> Iterator[str]:
+    """
+    Stream a module as JSON Lines, one top-level statement per line.
+
+    Takes the options of iter_node_json; only one statement is held at a time.
+    """
+    for statement in module.body:
+        yield "".join(iter_node_json(statement, **options)) + "\n"
+
+
+def write_node_json(node, file: TextIO, **options) -> None:
+    """Write an AST node as JSON to a text file; takes iter_node_json's options."""
+    for chunk in iter_node_json(node, **options):
+        file.write(chunk)
 
 
 def class_implements(ast_node: ast.ClassDef, method_names: list[str]) -> bool:
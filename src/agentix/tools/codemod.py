@@ -0,0 +1,234 @@
+"""
+agentix.tools.codemod
+
+Apply LibCST transformers across many files.
+
+Each file is checked against the transformers' text pre-filters first: a
+transformer with a `pattern` attribute (a regex or a substring) only runs on
+files whose source matches it, and files no transformer can match are skipped
+without being parsed. The rest are parsed and transformed on a process pool,
+each with its own copy of the transformers, and changed files are replaced
+atomically. In dry-run mode nothing is written and a unified diff is returned
+for each file that would change.
+"""
+
+import copy
+import difflib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Sequence
+
+import libcst as cst
+
+from ..edits.atomic import atomic_write
+
+# Files below this count are transformed in-process: a pool costs more to start
+_MIN_POOL_FILES = 4
+
+
+@dataclass
+class CodemodResult:
+    """The outcome of a codemod on one file."""
+
+    path: str
+    status: str  # "changed", "unchanged", "skipped" or "failed"
+    seconds: float = 0.0
+    diff: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CodemodReport:
+    """Per-file results of a codemod run, in the order of the paths."""
+
+    results: list[CodemodResult] = field(default_factory=list)
+    seconds: float = 0.0
+    dry_run: bool = False
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of files per status."""
+        counts = dict.fromkeys(("changed", "unchanged", "skipped", "failed"), 0)
+        for result in self.results:
+            counts[result.status] += 1
+        return counts
+
+    def summary(self, per_file: bool = False) -> str:
+        """
+        Summarize the run: counts, and optionally one timed line per file.
+
+        Skipped files are not listed per file.
+        """
+        lines = []
+        if per_file:
+            for result in self.results:
+                if result.status == "skipped":
+                    continue
+                ms = result.seconds * 1000
+                line = f"{result.status:9} {ms:8.1f} ms  {result.path}"
+                if result.error:
+                    line += f"  ({result.error})"
+                lines.append(line)
+        counts = ", ".join(f"{n} {status}" for status, n in self.counts().items())
+        dry_run = ", dry run: nothing written" if self.dry_run else ""
+        lines.append(
+            f"{len(self.results)} files ({counts}) in {self.seconds:.2f} s{dry_run}"
+        )
+        return "\n".join(lines)
+
+
+def may_match(transformer: cst.CSTTransformer, source: str) -> bool:
+    """
+    Check a transformer's text pre-filter against a source.
+
+    Transformers without a `pattern` attribute always match.
+    """
+    pattern = getattr(transformer, "pattern", None)
+    if pattern is None:
+        return True
+    if isinstance(pattern, str):
+        return pattern in source
+    return pattern.search(source) is not None
+
+
+def transform_source(
+    source: str, transformers: Sequence[cst.CSTTransformer]
+) -> Optional[str]:
+    """
+    Apply the transformers whose pre-filter matches, in order.
+
+    :return: The new source, or None if no transformer's pre-filter matched.
+    :raises cst.ParserSyntaxError: If the source does not parse, and whatever
+        the transformers raise.
+    """
+    matching = [t for t in transformers if may_match(t, source)]
+    if not matching:
+        return None
+    module = cst.parse_module(source)
+    for transformer in matching:
+        module = module.visit(transformer)
+    return module.code
+
+
+def _describe(error: BaseException) -> str:
+    """Return the type and first line of an error."""
+    lines = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {lines[0]}" if lines else repr(error)
+
+
+def _transform_file(
+    path: str, source: str, transformers: Sequence[cst.CSTTransformer], dry_run: bool
+) -> CodemodResult:
+    """Worker: transform one file and write it back unless dry_run."""
+    start = time.perf_counter()
+    try:
+        # each file gets transformers in their initial state
+        new_source = transform_source(source, copy.deepcopy(list(transformers)))
+    except Exception as e:  # pylint: disable=broad-except
+        # a failing file, or transformer, must not stop the others
+        return CodemodResult(
+            path, "failed", time.perf_counter() - start, error=_describe(e)
+        )
+    if new_source is None:
+        return CodemodResult(path, "skipped", time.perf_counter() - start)
+    if new_source == source:
+        return CodemodResult(path, "unchanged", time.perf_counter() - start)
+    diff = None
+    if dry_run:
+        diff = "".join(
+            difflib.unified_diff(
+                source.splitlines(keepends=True),
+                new_source.splitlines(keepends=True),
+                f"a/{path}",
+                f"b/{path}",
+            )
+        )
+    else:
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                if f.read() != source:
+                    raise OSError("file changed during the codemod")
+            with atomic_write(path, "wb") as f:
+                f.write(new_source.encode("utf-8"))
+        except OSError as e:
+            return CodemodResult(
+                path, "failed", time.perf_counter() - start, error=str(e)
+            )
+    return CodemodResult(path, "changed", time.perf_counter() - start, diff=diff)
+
+
+def iter_codemod(
+    transformers: Sequence[cst.CSTTransformer],
+    paths: list[str],
+    dry_run: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[CodemodResult]:
+    """
+    Yield the result of each file as soon as it is done.
+
+    Files are read and pre-filtered here; only files some transformer may
+    match are parsed, on a process pool. See run_codemod for the parameters.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    todo = {}
+    for path in dict.fromkeys(paths):
+        start = time.perf_counter()
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading {path} for the codemod: {e}", file=sys.stderr)
+            yield CodemodResult(path, "failed", error=str(e))
+            continue
+        if not any(may_match(t, source) for t in transformers):
+            yield CodemodResult(path, "skipped", time.perf_counter() - start)
+            continue
+        todo[path] = source
+    if len(todo) < _MIN_POOL_FILES or workers == 1:
+        for path, source in todo.items():
+            yield _transform_file(path, source, transformers, dry_run)
+        return
+    # parsing and transforming are CPU-bound: spread the files over processes
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_transform_file, path, source, transformers, dry_run): path
+            for path, source in todo.items()
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                # e.g. unpicklable transformers or a worker that died
+                yield CodemodResult(futures[future], "failed", error=_describe(e))
+
+
+def run_codemod(
+    transformers: cst.CSTTransformer | Sequence[cst.CSTTransformer],
+    paths: list[str],
+    dry_run: bool = False,
+    max_workers: Optional[int] = None,
+) -> CodemodReport:
+    """
+    Apply transformers to files and report what changed.
+
+    :param transformers: One transformer or several, applied in order. They
+        must be picklable to run on the pool; each file gets fresh copies.
+    :param paths: The files to transform (UTF-8 Python sources).
+    :param dry_run: Write nothing; put a unified diff on each changed result.
+    :param max_workers: Worker processes (default: one per CPU); 1 runs
+        in-process.
+    """
+    if isinstance(transformers, cst.CSTTransformer):
+        transformers = [transformers]
+    start = time.perf_counter()
+    results = {
+        result.path: result
+        for result in iter_codemod(transformers, paths, dry_run, max_workers)
+    }
+    return CodemodReport(
+        [results[path] for path in dict.fromkeys(paths)],
+        time.perf_counter() - start,
+        dry_run,
+    )
@@ -0,0 +1,193 @@
+"""
+agentix.tools.composite_visitor
+
+Run several LibCST visitors in a single traversal.
+
+`CompositeVisitor` walks the tree once and dispatches each node to the
+visitors that handle its type, so combined analyses (tool extraction, imports,
+class checks) cost one walk instead of one each. The visit and leave methods
+of each node class are looked up once per composite and cached. A visitor
+whose visit method returns False skips that subtree on its own; the others
+still see it.
+"""
+
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Iterator, Optional, Sequence, Union
+
+import libcst as cst
+from libcst.helpers import get_full_name_for_node
+from libcst.metadata import MetadataWrapper
+
+from .cst_tools import class_implements
+
+_Methods = tuple[tuple[int, Callable], ...]
+
+
+def _overridden(visitor: cst.CSTVisitor, name: str) -> Optional[Callable]:
+    """
+    Return a visitor's method, unless it is CSTVisitor's no-op default.
+
+    CSTVisitor defines visit_<Node> and leave_<Node> for every node class, so
+    dispatching to the defaults would call every visitor on every node.
+    """
+    method = getattr(type(visitor), name, None)
+    if method is None or method is getattr(cst.CSTVisitor, name, None):
+        return None
+    return getattr(visitor, name)
+
+
+class CompositeVisitor(cst.CSTVisitor):
+    """
+    Dispatch one traversal to many visitors, in registration order.
+
+    Leave methods are called in reverse registration order, so visitors nest
+    like context managers. Visitors that override on_visit or on_leave receive
+    every node through them. Visiting through a MetadataWrapper resolves each
+    visitor's METADATA_DEPENDENCIES from the shared wrapper.
+    """
+
+    def __init__(self, visitors: Sequence[cst.CSTVisitor]):
+        super().__init__()
+        self.visitors = list(visitors)
+        self._nodes: dict[type, tuple[_Methods, _Methods]] = {}
+        self._attributes: dict[tuple[type, str], tuple[_Methods, _Methods]] = {}
+        # the depth of the node each visitor skipped the children of, or None
+        # (depths, not nodes: transformed trees may share node instances)
+        self._skipping: list[Optional[int]] = [None] * len(self.visitors)
+        self._active = len(self.visitors)
+        self._depth = 0
+
+    def _methods(self, visit: str, leave: str) -> tuple[_Methods, _Methods]:
+        """Find the visitors' methods with these names, leaves reversed."""
+        visits, leaves = [], []
+        for i, visitor in enumerate(self.visitors):
+            if (method := _overridden(visitor, visit)) is not None:
+                visits.append((i, method))
+            if (method := _overridden(visitor, leave)) is not None:
+                leaves.append((i, method))
+        return tuple(visits), tuple(reversed(leaves))
+
+    def _node_methods(self, node_type: type) -> tuple[_Methods, _Methods]:
+        """Build the dispatch table of a node class."""
+        name = node_type.__name__
+        visits, leaves = [], []
+        for i, visitor in enumerate(self.visitors):
+            # a generic on_visit/on_leave replaces the per-type dispatch
+            if type(visitor).on_visit is not cst.CSTVisitor.on_visit:
+                visits.append((i, visitor.on_visit))
+            elif (method := _overridden(visitor, f"visit_{name}")) is not None:
+                visits.append((i, method))
+            if type(visitor).on_leave is not cst.CSTVisitor.on_leave:
+                leaves.append((i, visitor.on_leave))
+            elif (method := _overridden(visitor, f"leave_{name}")) is not None:
+                leaves.append((i, method))
+        methods = tuple(visits), tuple(reversed(leaves))
+        self._nodes[node_type] = methods
+        return methods
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        methods = self._nodes.get(type(node)) or self._node_methods(type(node))
+        self._depth += 1
+        skipping = self._skipping
+        for i, method in methods[0]:
+            if skipping[i] is None and method(node) is False:
+                skipping[i] = self._depth
+                self._active -= 1
+        # children are only skipped once no visitor wants them
+        return self._active > 0
+
+    def on_leave(self, original_node: cst.CSTNode) -> None:
+        node_type = type(original_node)
+        methods = self._nodes.get(node_type) or self._node_methods(node_type)
+        depth, skipping = self._depth, self._skipping
+        for i, method in methods[1]:
+            if skipping[i] is None or skipping[i] == depth:
+                method(original_node)
+        if self._active < len(skipping):
+            for i, skipped in enumerate(skipping):
+                if skipped == depth:
+                    skipping[i] = None
+                    self._active += 1
+        self._depth -= 1
+
+    def on_visit_attribute(self, node: cst.CSTNode, attribute: str) -> None:
+        self._dispatch_attribute(node, attribute, 0)
+
+    def on_leave_attribute(self, original_node: cst.CSTNode, attribute: str) -> None:
+        self._dispatch_attribute(original_node, attribute, 1)
+
+    def _dispatch_attribute(self, node: cst.CSTNode, attribute: str, which: int):
+        """Call visit_<Node>_<attribute> (0) or leave_<Node>_<attribute> (1)."""
+        key = (type(node), attribute)
+        methods = self._attributes.get(key)
+        if methods is None:
+            name = f"{type(node).__name__}_{attribute}"
+            methods = self._attributes[key] = self._methods(
+                f"visit_{name}", f"leave_{name}"
+            )
+        for i, method in methods[which]:
+            if self._skipping[i] is None:
+                method(node)
+
+    @contextmanager
+    def resolve(self, wrapper: MetadataWrapper) -> Iterator[None]:
+        # each visitor gets its own dependencies; the wrapper caches providers
+        with ExitStack() as stack:
+            for visitor in self.visitors:
+                stack.enter_context(visitor.resolve(wrapper))
+            yield
+
+
+def visit_all(
+    tree: Union[cst.CSTNode, MetadataWrapper], visitors: Sequence[cst.CSTVisitor]
+) -> list[cst.CSTVisitor]:
+    """
+    Run visitors over a tree in one traversal.
+
+    :param tree: A node, or a MetadataWrapper for visitors that need metadata.
+    :param visitors: The visitors, each left holding its results.
+    :return: The visitors, in order.
+    """
+    tree.visit(CompositeVisitor(visitors))
+    return list(visitors)
+
+
+class ImportCollector(cst.CSTVisitor):
+    """
+    Collect the modules a module imports, in source order.
+
+    `import a.b` records "a.b"; `from .c import d` records ".c"; imports
+    inside functions and classes are included.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.imports: list[str] = []
+
+    def visit_Import(self, node: cst.Import) -> bool:
+        for alias in node.names:
+            self.imports.append(get_full_name_for_node(alias.name))
+        return False
+
+    def visit_ImportFrom(self, node: cst.ImportFrom) -> bool:
+        dots = "." * len(node.relative)
+        self.imports.append(dots + (get_full_name_for_node(node.module) or ""))
+        return False
+
+
+class ImplementationCollector(cst.CSTVisitor):
+    """
+    Collect the classes, at any depth, whose own body defines all given methods.
+
+    This is the traversal counterpart of cst_tools.module_classes_implementing,
+    which only checks top-level classes.
+    """
+
+    def __init__(self, method_names: Sequence[str]):
+        super().__init__()
+        self.method_names = list(method_names)
+        self.classes: list[cst.ClassDef] = []
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> None:
+        if class_implements(node, self.method_names):
+            self.classes.append(node)
@@ -2,11 +2,34 @@
 
 from __future__ import annotations
 
+import re
+from bisect import bisect_right
 from glob import glob
-from typing import Dict, List, Optional
+from typing import Collection, Dict, List, Optional
 
 import libcst as cst
-from libcst.metadata import CodeRange, MetadataWrapper, PositionProvider
+from libcst.metadata import (
+    ByteSpanPositionProvider,
+    CodeRange,
+    MetadataWrapper,
+    PositionProvider,
+)
+
+from .project_parser import parse_project
+
+# Columns of cst_module_table rows
+CST_TABLE_COLUMNS = (
+    "type",
+    "parent",
+    "lineno",
+    "col_offset",
+    "end_lineno",
+    "end_col_offset",
+    "start",
+    "end",
+)
+# Line breaks, as LibCST's PositionProvider counts them
+_NEWLINE_RE = re.compile(rb"\r\n?|\n")
 
 # --------------------------------------------------------------------------------------
 # Filesystem helpers (kept compatible with your original behavior)
@@ -41,9 +64,16 @@ def cst_tree(file_path: str) -> cst.Module:
     return cst.parse_module(source)
 
 
-def cst_modules(module_files_list: List[str]) -> Dict[str, cst.Module]:
-    """Parse multiple Python files into LibCST Modules."""
-    return {file_path: cst_tree(file_path) for file_path in module_files_list}
+def cst_modules(
+    module_files_list: List[str], strict: bool = True
+) -> Dict[str, cst.Module]:
+    """
+    Parse multiple Python files into LibCST Modules, on a process pool.
+
+    :param strict: Raise on the first file that cannot be read or parsed;
+        otherwise such files are reported and left out.
+    """
+    return parse_project(module_files_list, parser="cst", strict=strict)
 
 
 # --------------------------------------------------------------------------------------
@@ -122,6 +152,86 @@ def cst_node_to_dict(
     return data
 
 
+def cst_module_table(
+    module: cst.Module,
+    include_source: bool = False,
+    types: Optional[Collection[str]] = None,
+) -> Dict[str, List]:
+    """
+    Export every node of a module as one flat table, in a single pass.
+
+    Byte spans are resolved once for the whole module (ByteSpanPositionProvider)
+    and line/column positions are derived from them, so unlike calling
+    `cst_node_to_dict` per node, nothing is resolved or regenerated per node.
+
+    Returns:
+        {
+          "columns": ["type", "parent", "lineno", "col_offset", "end_lineno",
+                      "end_col_offset", "start", "end"(, "source")],
+          "rows": [["Module", -1, 1, 0, 3, 0, 0, 42], ...]
+        }
+    Rows are in pre-order; `parent` is the row index of the nearest exported
+    ancestor (-1 for none). Positions follow `node_positions` (1-based lines,
+    0-based character columns, whitespace owned by the node excluded); `start`
+    and `end` are offsets into the UTF-8 encoded `module.code`.
+
+    :param include_source: Add each node's source, sliced by its offsets.
+    :param types: Node type names to export (all when None).
+    """
+    # spans are keyed by node identity: resolve on the module itself, and only
+    # copy it (as MetadataWrapper does by default) if it shares node instances
+    table = _module_table(module, include_source, types)
+    if table is None:
+        table = _module_table(MetadataWrapper(module).module, include_source, types)
+    return table
+
+
+def _module_table(
+    module: cst.Module,
+    include_source: bool,
+    types: Optional[Collection[str]],
+) -> Optional[Dict[str, List]]:
+    """Build cst_module_table, or return None if a node instance is shared."""
+    # LibCST measures spans in UTF-8 bytes, whatever the module's encoding
+    data = module.code.encode("utf-8")
+    spans = MetadataWrapper(module, unsafe_skip_copy=True).resolve(
+        ByteSpanPositionProvider
+    )
+    # offsets where lines start, splitting lines as PositionProvider does
+    line_starts = [0, *(m.end() for m in _NEWLINE_RE.finditer(data))]
+    ascii_only = data.isascii()
+
+    def position(offset: int) -> tuple[int, int]:
+        line = bisect_right(line_starts, offset)
+        start = line_starts[line - 1]
+        if ascii_only:
+            return line, offset - start
+        # columns count characters, not bytes
+        return line, len(data[start:offset].decode("utf-8"))
+
+    columns = list(CST_TABLE_COLUMNS) + (["source"] if include_source else [])
+    rows: List[list] = []
+    seen: set[int] = set()
+    stack = [(module, -1)]
+    while stack:
+        node, parent = stack.pop()
+        # a node reused by a transformer has only the span of its last use
+        if id(node) in seen:
+            return None
+        seen.add(id(node))
+        span = spans.get(node)
+        if span is not None and (types is None or node.__class__.__name__ in types):
+            start, end = span.start, span.start + span.length
+            row = [node.__class__.__name__, parent, *position(start), *position(end)]
+            row += [start, end]
+            if include_source:
+                row.append(data[start:end].decode("utf-8"))
+            rows.append(row)
+            parent = len(rows) - 1
+        stack.extend((child, parent) for child in reversed(node.children))
+    return {"columns": columns, "rows": rows}
+
+
 # --------------------------------------------------------------------------------------
 # Structural queries (mirroring your AST utilities)
 # --------------------------------------------------------------------------------------
@@ -232,6 +342,8 @@ class AddDecorator(cst.CSTTransformer):
         self.class_name = class_name
         self.decorator_text = decorator_text.lstrip("@")
         self.decorator_expr = cst.parse_expression(self.decorator_text)
+        # text pre-filter for codemods: only files defining the class can change
+        self.pattern = re.compile(rf"\bclass\s+{re.escape(class_name)}\b")
 
     def leave_ClassDef(
         self, original_node: cst.ClassDef, updated_node: cst.ClassDef
@@ -239,10 +351,11 @@ class AddDecorator(cst.CSTTransformer):
         """Add a decorator to the specified class if it doesn't already exist."""
         if original_node.name.value != self.class_name:
             return updated_node
-        # Avoid duplicates by comparing code
-        existing = [d.decorator.code for d in updated_node.decorators]
-        new_code = self.decorator_expr.code
-        if new_code in existing:
+        # Avoid duplicates by comparing trees (expressions have no .code)
+        if any(
+            d.decorator.deep_equals(self.decorator_expr)
+            for d in updated_node.decorators
+        ):
             return updated_node
         return updated_node.with_changes(
             decorators=[
@@ -1,12 +1,33 @@
 """
 Docstring for agentix.tools.describe_tools
+
+Attributes are imported on first use (PEP 562), so the schema cache can be
+used without loading LibCST.
 """
 
+import importlib
 import json
 
-from .tool_extractor import ToolExtractor
-from .tool_spec import ToolSpec
-from .tools import extract_tools_from_code, extract_tools_from_file, to_openai_tools
+_ATTRIBUTES = {
+    "ToolExtractor": ".tool_extractor",
+    "ToolSpec": ".tool_spec",
+    "extract_tools_from_code": ".tools",
+    "extract_tools_from_file": ".tools",
+    "to_openai_tools": ".tools",
+    "ToolSchemaCache": ".cache",
+    "cached_openai_tools": ".cache",
+    "cached_tool_specs": ".cache",
+    "extract_tools_from_directory": ".discovery",
+    "extract_tools_from_package": ".discovery",
+    "iter_module_tools": ".discovery",
+    "ToolArgumentError": ".schema",
+    "annotation_schema": ".schema",
+    "parameters_json_schema": ".schema",
+    "validate_arguments": ".schema",
+    "is_public_tool": ".select",
+    "render_tools": ".select",
+    "select_tools": ".select",
+}
 
 __all__ = [
     "ToolExtractor",
@@ -14,12 +35,28 @@ __all__ = [
     "extract_tools_from_file",
     "extract_tools_from_code",
     "ToolSpec",
+    "ToolSchemaCache",
+    "cached_openai_tools",
+    "cached_tool_specs",
+    "is_public_tool",
+    "render_tools",
+    "select_tools",
 ]
 
 
+def __getattr__(name: str):
+    if name in _ATTRIBUTES:
+        value = getattr(importlib.import_module(_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     import sys
 
+    from .tools import extract_tools_from_file, to_openai_tools
+
     file = sys.argv[1] if len(sys.argv) > 1 else "cst_tools.py"
     tools = extract_tools_from_file(file)
     print(json.dumps(tools, indent=2, ensure_ascii=False))
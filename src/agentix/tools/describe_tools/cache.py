@@ -0,0 +1,137 @@
+"""
+agentix.tools.describe_tools.cache
+
+Persistent cache of extracted tool schemas.
+
+Tool specs and their OpenAI rendering are keyed by the sha256 of the tool
+module's source, the agentix version and TOOL_CACHE_VERSION. Entries are kept
+in memory for the process and as JSON files under TOOL_CACHE_DIR. A hit in
+either tier needs neither LibCST nor the extractor, which are imported only on
+a miss.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from dataclasses import asdict
+from importlib import metadata
+from typing import Optional
+
+from ...constants import TOOL_CACHE_DIR
+from .tool_spec import ToolSpec
+
+# Bump when the extracted specs or their rendering change
+TOOL_CACHE_VERSION = 3
+
+_TOOL_SCHEMA_CACHE: Optional["ToolSchemaCache"] = None
+
+
+def agentix_version() -> str:
+    """Return the installed agentix version, or "unknown" when not installed."""
+    try:
+        return metadata.version("agentix")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class ToolSchemaCache:
+    """
+    Two-tier cache of tool specs per tool module.
+
+    :param directory: Directory of the disk tier (None keeps the cache in memory).
+    """
+
+    def __init__(self, directory: Optional[str] = TOOL_CACHE_DIR):
+        self.directory = directory
+        self.entries: dict[str, dict] = {}
+        self._version = f"{agentix_version()}:{TOOL_CACHE_VERSION}"
+
+    def key(self, source: bytes) -> str:
+        """Return the cache key of a tool module's source."""
+        digest = hashlib.sha256(source)
+        digest.update(self._version.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _load(self, key: str) -> Optional[dict]:
+        if not self.directory:
+            return None
+        try:
+            with open(
+                os.path.join(self.directory, f"{key}.json"), "r", encoding="utf-8"
+            ) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _store(self, key: str, entry: dict) -> None:
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, os.path.join(self.directory, f"{key}.json"))
+        except OSError as e:
+            print(f"Error saving tool schema cache: {e}", file=sys.stderr)
+
+    def lookup(self, source: bytes) -> tuple[str, Optional[dict]]:
+        """Return the key of a source and its entry, or None on a miss."""
+        key = self.key(source)
+        entry = self.entries.get(key) or self._load(key)
+        if entry is not None:
+            self.entries[key] = entry
+        return key, entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """Add an entry to both tiers."""
+        self.entries[key] = entry
+        self._store(key, entry)
+
+    def get(self, path: str, debug: bool = False) -> dict:
+        """
+        Return {"specs": [<ToolSpec dict>], "openai": [<tool>]} for a tool module.
+
+        The module is parsed only if neither tier has its current source.
+        """
+        with open(path, "rb") as f:
+            source = f.read()
+        key, entry = self.lookup(source)
+        if entry is None:
+            entry = build_entry(source, debug)
+            self.put(key, entry)
+        return entry
+
+
+def build_entry(source: bytes, debug: bool = False) -> dict:
+    """Extract the cache entry of a tool module's source."""
+    # imported here so a cache hit never loads the extractor
+    from .tools import extract_tools_from_code, to_openai_tools
+
+    specs = extract_tools_from_code(
+        source.decode("utf-8"), debug=debug, return_dicts=False
+    )
+    return {
+        "specs": [asdict(spec) for spec in specs],
+        "openai": to_openai_tools(specs, json_schema=True),
+    }
+
+
+def tool_schema_cache() -> ToolSchemaCache:
+    """Return the process-wide tool schema cache."""
+    global _TOOL_SCHEMA_CACHE  # pylint: disable=global-statement
+    if _TOOL_SCHEMA_CACHE is None:
+        _TOOL_SCHEMA_CACHE = ToolSchemaCache()
+    return _TOOL_SCHEMA_CACHE
+
+
+def cached_tool_specs(path: str, debug: bool = False) -> list[ToolSpec]:
+    """Return the tool specs of a module, from the cache when it is unchanged."""
+    return [ToolSpec(**spec) for spec in tool_schema_cache().get(path, debug)["specs"]]
+
+
+def cached_openai_tools(path: str, debug: bool = False) -> list[dict]:
+    """Return the OpenAI tools of a module, from the cache when it is unchanged."""
+    return tool_schema_cache().get(path, debug)["openai"]
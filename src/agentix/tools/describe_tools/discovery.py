@@ -0,0 +1,164 @@
+"""
+agentix.tools.describe_tools.discovery
+
+Extract tools from every module of a directory or package.
+
+Modules are looked up in the tool schema cache first; only changed modules are
+parsed, on a process pool, and their specs are yielded as each one completes.
+Merged specs are qualified with their dotted module name (`pkg.mod.func`), so
+functions of the same name in different modules do not collide.
+"""
+
+import importlib.util
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from typing import Iterator, Optional
+
+from .cache import ToolSchemaCache, build_entry, tool_schema_cache
+from .tool_spec import ToolSpec
+
+
+def module_name(path: str, root: str, package: str = "") -> str:
+    """
+    Return the dotted name of a module file below root.
+
+    :param package: Dotted name of the package whose directory is root, if any.
+    """
+    parts = os.path.splitext(os.path.relpath(path, root))[0].split(os.sep)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(p for p in [package, *parts] if p)
+
+
+def qualify(specs: list[ToolSpec], module: str) -> list[ToolSpec]:
+    """Prefix tool specs with their module name."""
+    return [
+        replace(spec, module=module, qualified_name=f"{module}.{spec.qualified_name}")
+        for spec in specs
+    ]
+
+
+def iter_module_tools(
+    modules: dict[str, str],
+    cache: Optional[ToolSchemaCache] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[tuple[str, list[ToolSpec]]]:
+    """
+    Yield (module, qualified specs) for each module as soon as it is extracted.
+
+    Cache hits come first; misses are parsed on a process pool and stored.
+    Modules that cannot be read or parsed are skipped with an error on stderr.
+
+    :param modules: Module names mapped to their source files.
+    """
+    cache = cache or tool_schema_cache()
+    misses = {}
+    for module, path in modules.items():
+        try:
+            with open(path, "rb") as f:
+                source = f.read()
+        except OSError as e:
+            print(f"Error reading {path} for tools: {e}", file=sys.stderr)
+            continue
+        key, entry = cache.lookup(source)
+        if entry is not None:
+            yield module, qualify([ToolSpec(**s) for s in entry["specs"]], module)
+        else:
+            misses[module] = (key, source)
+    if not misses:
+        return
+
+    def done(module: str, entry: dict) -> tuple[str, list[ToolSpec]]:
+        cache.put(misses[module][0], entry)
+        return module, qualify([ToolSpec(**s) for s in entry["specs"]], module)
+
+    def failed(module: str, e: Exception) -> None:
+        print(f"Error extracting tools from {modules[module]}: {e}", file=sys.stderr)
+
+    if len(misses) == 1 or max_workers == 1:
+        for module, (_, source) in misses.items():
+            try:
+                entry = build_entry(source)
+            except (SyntaxError, ValueError) as e:
+                failed(module, e)
+                continue
+            yield done(module, entry)
+        return
+    # parsing is CPU-bound: spread the misses over processes
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(build_entry, source): module
+            for module, (_, source) in misses.items()
+        }
+        for future in as_completed(futures):
+            module = futures[future]
+            try:
+                entry = future.result()
+            except (SyntaxError, ValueError) as e:
+                failed(module, e)
+                continue
+            yield done(module, entry)
+
+
+def directory_modules(root: str, package: str = "") -> dict[str, str]:
+    """Map the dotted names of the Python modules under root to their files."""
+    # imported here: the attachments package imports the context helpers
+    from ...attachments.ingest import walk_directory
+
+    return {
+        module_name(path, root, package): path
+        for path in walk_directory(root)
+        if path.endswith(".py")
+    }
+
+
+def package_modules(package: str) -> dict[str, str]:
+    """Map the modules of an installed package (or a single module) to their files."""
+    spec = importlib.util.find_spec(package)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {package!r}")
+    modules = {}
+    for location in spec.submodule_search_locations or []:
+        modules.update(directory_modules(location, package))
+    if not modules and spec.origin and spec.origin.endswith(".py"):
+        modules[package] = spec.origin
+    return modules
+
+
+def _merge(results: Iterator[tuple[str, list[ToolSpec]]]) -> list[ToolSpec]:
+    """Merge streamed results in module order, so the output is stable."""
+    return [spec for _, specs in sorted(results, key=lambda r: r[0]) for spec in specs]
+
+
+def extract_tools_from_directory(
+    root: str,
+    package: str = "",
+    cache: Optional[ToolSchemaCache] = None,
+    max_workers: Optional[int] = None,
+) -> list[ToolSpec]:
+    """
+    Extract the tools of every Python module under a directory.
+
+    :param root: Directory to walk; `.gitignore` and common exclusions apply.
+    :param package: Dotted name prefixed to the module names.
+    :return: Module-qualified tool specs, ordered by module.
+    """
+    return _merge(
+        iter_module_tools(directory_modules(root, package), cache, max_workers)
+    )
+
+
+def extract_tools_from_package(
+    package: str,
+    cache: Optional[ToolSchemaCache] = None,
+    max_workers: Optional[int] = None,
+) -> list[ToolSpec]:
+    """
+    Extract the tools of every module of a package, without importing its modules.
+
+    :param package: Dotted package name, e.g. "agentix.tools".
+    :return: Module-qualified tool specs, ordered by module.
+    """
+    return _merge(iter_module_tools(package_modules(package), cache, max_workers))
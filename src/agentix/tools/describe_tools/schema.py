@@ -0,0 +1,338 @@
+"""
+agentix.tools.describe_tools.schema
+
+JSON Schema for tool parameters, and argument validators compiled from it.
+
+ToolSpecs record parameter annotations as source text (`"list[str]"`). Here they
+are mapped to JSON Schema for the model, and each schema is compiled once into a
+tree of small checking functions, cached by the schema itself. Validating a call
+then costs a few function calls per argument: common mismatches from models
+(`"3"` for an integer, `"true"` for a boolean, a bare value for a list) are
+coerced, and everything else is reported at once, before the tool runs.
+"""
+
+import ast
+import json
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from .tool_spec import ToolSpec
+
+# Annotation names and the JSON Schema types they map to
+_SCALARS = {
+    "int": "integer",
+    "float": "number",
+    "complex": "number",
+    "str": "string",
+    "bytes": "string",
+    "bool": "boolean",
+    "None": "null",
+    "NoneType": "null",
+}
+_ARRAYS = {"list", "List", "Sequence", "MutableSequence", "Iterable", "Collection"}
+_ARRAYS |= {"set", "Set", "frozenset", "FrozenSet", "tuple", "Tuple", "Iterator"}
+_OBJECTS = {"dict", "Dict", "Mapping", "MutableMapping", "DefaultDict", "OrderedDict"}
+# Receivers of methods are never passed by the model
+_RECEIVERS = ("self", "cls")
+
+_TRUE = {"true", "1", "yes", "on"}
+_FALSE = {"false", "0", "no", "off"}
+
+
+class ToolArgumentError(ValueError):
+    """Raised when a tool call's arguments do not match the tool's parameters."""
+
+    def __init__(self, tool: str, errors: list[str]):
+        super().__init__(f"Invalid arguments for {tool}: {'; '.join(errors)}")
+        self.tool = tool
+        self.errors = errors
+
+
+def _name(node: ast.expr) -> str:
+    """Return the last component of a (dotted) annotation name."""
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant) and node.value is None:
+        return "None"
+    return ""
+
+
+def _node_schema(node: ast.expr) -> dict:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        # a string (forward reference) annotation
+        return annotation_schema(node.value)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _any_of([_node_schema(node.left), _node_schema(node.right)])
+    if isinstance(node, ast.Subscript):
+        name = _name(node.value)
+        args = node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+        if name == "Optional":
+            return _any_of([_node_schema(args[0]), {"type": "null"}])
+        if name == "Union":
+            return _any_of([_node_schema(arg) for arg in args])
+        if name == "Literal":
+            values = [a.value for a in args if isinstance(a, ast.Constant)]
+            return {"enum": values}
+        if name in ("Annotated", "Required", "NotRequired", "Final"):
+            return _node_schema(args[0])
+        if name in _ARRAYS:
+            items = [a for a in args if not isinstance(a, ast.Constant)]
+            # tuple[int, ...] is homogeneous; tuple[int, str] is not described
+            if len(items) == 1:
+                return {"type": "array", "items": _node_schema(items[0])}
+            return {"type": "array"}
+        if name in _OBJECTS:
+            if len(args) == 2:
+                return {"type": "object", "additionalProperties": _node_schema(args[1])}
+            return {"type": "object"}
+        return {}
+    name = _name(node)
+    if name in _SCALARS:
+        return {"type": _SCALARS[name]}
+    if name in _ARRAYS:
+        return {"type": "array"}
+    if name in _OBJECTS:
+        return {"type": "object"}
+    return {}
+
+
+def _any_of(schemas: list[dict]) -> dict:
+    # an unconstrained member makes the whole union unconstrained
+    if any(not s for s in schemas):
+        return {}
+    flat = []
+    for schema in schemas:
+        flat.extend(schema.get("anyOf", [schema]))
+    return flat[0] if len(flat) == 1 else {"anyOf": flat}
+
+
+@lru_cache(maxsize=1024)
+def _annotation_schema(annotation: str) -> str:
+    try:
+        node = ast.parse(annotation.strip(), mode="eval").body
+    except SyntaxError:
+        return "{}"
+    return json.dumps(_node_schema(node))
+
+
+def annotation_schema(annotation: Optional[str]) -> dict:
+    """
+    Map an annotation's source text to JSON Schema.
+
+    Unknown types (classes, TypeVars) map to {}, which accepts any value.
+    """
+    if not annotation:
+        return {}
+    return json.loads(_annotation_schema(annotation))
+
+
+def parameters_json_schema(spec: ToolSpec) -> dict:
+    """
+    Return the JSON Schema of a tool's parameters.
+
+    Unannotated parameters (recorded as "string" by the collectors) accept any
+    value, and the receiver of a method is left out.
+    """
+    properties = {}
+    for name, param in spec.parameters_schema.get("properties", {}).items():
+        if spec.is_method and name in _RECEIVERS and not properties:
+            continue
+        annotation = param.get("type")
+        properties[name] = annotation_schema(
+            None if annotation == "string" else annotation
+        )
+    required = [
+        n for n in spec.parameters_schema.get("required", []) if n in properties
+    ]
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": required,
+        "additionalProperties": False,
+    }
+
+
+# Values that match a JSON Schema type as they are
+_EXACT = {
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+}
+
+
+def _coerce(kind: str, value: Any) -> Any:
+    """Convert a near miss to a JSON Schema type, or raise ValueError."""
+    text = value.strip() if isinstance(value, str) else None
+    match kind:
+        case "integer":
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            if text is not None:
+                return int(text)
+        case "number":
+            if text is not None:
+                return float(text)
+        case "string":
+            if _EXACT["number"](value):
+                return str(value)
+        case "boolean":
+            if text is not None and text.lower() in _TRUE | _FALSE:
+                return text.lower() in _TRUE
+            if _EXACT["integer"](value) and value in (0, 1):
+                return bool(value)
+        case "null":
+            if text in ("", "null", "None"):
+                return None
+        case "array":
+            if text is not None and text.startswith("["):
+                return json.loads(text)
+            if isinstance(value, (tuple, set)):
+                return list(value)
+            if value is not None and not isinstance(value, dict):
+                # a bare value for a list of one
+                return [value]
+        case "object":
+            if text is not None and text.startswith("{"):
+                return json.loads(text)
+    raise ValueError(kind)
+
+
+# Validators take (value, path, errors) and return the coerced value
+
+
+def _check_type(kind: str) -> Callable:
+    exact = _EXACT[kind]
+
+    def check(value, path, errors):
+        if exact(value):
+            return value
+        try:
+            coerced = _coerce(kind, value)
+        except ValueError:
+            errors.append(f"{path}: expected {kind}, got {type(value).__name__}")
+            return value
+        if not exact(coerced):
+            errors.append(f"{path}: expected {kind}, got {type(value).__name__}")
+        return coerced
+
+    return check
+
+
+def _compile(schema: dict) -> Callable:
+    """Compile a schema node into a validator."""
+    if "anyOf" in schema:
+        options = [_compile(option) for option in schema["anyOf"]]
+        exact = [_EXACT.get(option.get("type")) for option in schema["anyOf"]]
+
+        def any_of(value, path, errors):
+            # a member the value already matches wins over coercion to another
+            for option, matches in zip(options, exact):
+                if matches and matches(value):
+                    return option(value, path, errors)
+            for option in options:
+                option_errors = []
+                coerced = option(value, path, option_errors)
+                if not option_errors:
+                    return coerced
+            kinds = " or ".join(s.get("type", "value") for s in schema["anyOf"])
+            errors.append(f"{path}: expected {kinds}, got {type(value).__name__}")
+            return value
+
+        return any_of
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def enum(value, path, errors):
+            if value not in allowed:
+                errors.append(f"{path}: expected one of {allowed!r}, got {value!r}")
+            return value
+
+        return enum
+    if "type" not in schema:
+        return lambda value, path, errors: value
+    check = _check_type(schema["type"])
+    if "items" in schema:
+        item = _compile(schema["items"])
+
+        def array(value, path, errors):
+            value = check(value, path, errors)
+            if isinstance(value, list):
+                return [item(v, f"{path}[{i}]", errors) for i, v in enumerate(value)]
+            return value
+
+        return array
+    if "additionalProperties" in schema and schema["type"] == "object":
+        member = _compile(schema["additionalProperties"])
+
+        def mapping(value, path, errors):
+            value = check(value, path, errors)
+            if isinstance(value, dict):
+                return {k: member(v, f"{path}.{k}", errors) for k, v in value.items()}
+            return value
+
+        return mapping
+    return check
+
+
+@lru_cache(maxsize=1024)
+def _compile_parameters(schema: str) -> Callable[[dict], tuple[dict, list[str]]]:
+    parsed = json.loads(schema)
+    validators = {n: _compile(s) for n, s in parsed["properties"].items()}
+    required = parsed["required"]
+
+    def validate(arguments: dict) -> tuple[dict, list[str]]:
+        errors = [f"{name}: missing" for name in required if name not in arguments]
+        coerced = {}
+        for name, value in arguments.items():
+            validator = validators.get(name)
+            if validator is None:
+                errors.append(f"{name}: unexpected argument")
+            else:
+                coerced[name] = validator(value, name, errors)
+        return coerced, errors
+
+    return validate
+
+
+def compile_validator(spec: ToolSpec) -> Callable[[dict], tuple[dict, list[str]]]:
+    """
+    Return the compiled argument validator of a tool.
+
+    Validators are cached by parameter schema, so each is compiled once.
+    The validator returns the coerced arguments and a list of errors.
+    """
+    return _compile_parameters(json.dumps(parameters_json_schema(spec), sort_keys=True))
+
+
+def validate_arguments(
+    spec: ToolSpec,
+    arguments: Optional[dict | str],
+    validator: Optional[Callable[[dict], tuple[dict, list[str]]]] = None,
+) -> dict:
+    """
+    Check and coerce the arguments of a tool call.
+
+    :param arguments: A dict, or the JSON object string of a model's tool call.
+    :param validator: The tool's compiled validator, if already at hand.
+    :return: The coerced arguments.
+    :raises ToolArgumentError: Listing every problem with the arguments.
+    """
+    if isinstance(arguments, str):
+        try:
+            arguments = json.loads(arguments) if arguments.strip() else None
+        except json.JSONDecodeError as e:
+            raise ToolArgumentError(spec.qualified_name, [f"invalid JSON: {e}"]) from e
+    if arguments is None:
+        arguments = {}
+    if not isinstance(arguments, dict):
+        raise ToolArgumentError(spec.qualified_name, ["expected a JSON object"])
+    coerced, errors = (validator or compile_validator(spec))(arguments)
+    if errors:
+        raise ToolArgumentError(spec.qualified_name, errors)
+    return coerced
@@ -0,0 +1,77 @@
+"""
+agentix.tools.describe_tools.select
+
+Choose which tools to describe in a prompt.
+
+Only public tools are offered: private helpers (leading underscore) and LibCST
+visitor hooks (`visit_*`/`leave_*`) are never callable by the model. The rest
+are ranked with BM25 against the user prompt, and the top-k that fit a token
+quota are kept in their definition order and rendered as compact JSON, so the
+same selection always produces the same bytes.
+"""
+
+import json
+from typing import Optional
+
+from ...constants import TOOLS_BUDGET_TOKENS, TOOLS_TOP_K
+from .tool_spec import ToolSpec
+
+_HOOK_PREFIXES = ("visit_", "leave_")
+
+
+def is_public_tool(spec: ToolSpec) -> bool:
+    """Check if a tool is meant to be called: not private and not a visitor hook."""
+    if spec.name.startswith("_") or (spec.class_name or "").startswith("_"):
+        return False
+    return not (spec.is_method and spec.name.startswith(_HOOK_PREFIXES))
+
+
+def _tool_text(spec: ToolSpec) -> str:
+    params = " ".join(spec.parameters_schema.get("properties", {}))
+    return f"{spec.qualified_name} {spec.docstring or ''} {params}"
+
+
+def render_tools(tools: list[dict]) -> str:
+    """Render tools as compact JSON."""
+    return json.dumps(tools, separators=(",", ":"), ensure_ascii=False)
+
+
+def select_tools(
+    specs: list[ToolSpec],
+    tools: list[dict],
+    query: Optional[str],
+    top_k: int = TOOLS_TOP_K,
+    budget: int = TOOLS_BUDGET_TOKENS,
+) -> list[dict]:
+    """
+    Select the public tools most relevant to the query.
+
+    :param specs: Tool specs, parallel to `tools`.
+    :param tools: The OpenAI rendering of each spec.
+    :param query: The user prompt; without matches, the first public tools are kept.
+    :param top_k: Most tools to keep.
+    :param budget: Token quota for the rendered tools.
+    :return: The chosen tools, in their original order.
+    """
+    public = [i for i, spec in enumerate(specs) if is_public_tool(spec)]
+    # imported here: the context package imports the prompt helpers
+    from ...context.relevance import BM25Index
+
+    index = BM25Index()
+    for i in public:
+        index.add(str(i), _tool_text(specs[i]))
+    ranked = [int(i) for i, score in index.search(query or "", len(public)) if score]
+    # unmatched tools follow in definition order
+    matched = set(ranked)
+    order = ranked + [i for i in public if i not in matched]
+
+    chosen = []
+    # Assuming 1 token per 4 characters, as in trimming
+    for i in order:
+        if len(chosen) == top_k:
+            break
+        tokens = len(render_tools([tools[i]])) // 4
+        if tokens <= budget:
+            chosen.append(i)
+            budget -= tokens
+    return [tools[i] for i in sorted(chosen)]
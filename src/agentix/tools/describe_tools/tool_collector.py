@@ -70,14 +70,17 @@ class _ToolCollector(cst.CSTVisitor):
     def _extract_params_schema(self, node: cst.FunctionDef) -> Dict:
         """Extract parameter schema from function definition."""
         params = {}
-        for param in node.params.params:
+        required = []
+        for param in (*node.params.params, *node.params.kwonly_params):
             param_name = param.name.value
             annotation = param.annotation.annotation if param.annotation else None
             param_type = (
                 self.module.code_for_node(annotation) if annotation else "string"
             )
             params[param_name] = {"type": param_type}
-        return {"properties": params}
+            if param.default is None:
+                required.append(param_name)
+        return {"properties": params, "required": required}
 
     def _extract_return_schema(self, node: cst.FunctionDef) -> Optional[Dict]:
         """Extract return type schema from function definition."""
@@ -2,30 +2,45 @@
 
 from __future__ import annotations
 
+import ast
 from typing import Dict, List
 
-import libcst as cst
-
-from .tool_collector import _ToolCollector
+from ...constants import TOOL_EXTRACTOR_BACKENDS
+from .ast_collector import _AstToolCollector
 
 
 class ToolExtractor:
     """
     Docstring for ToolExtractor
+
+    :param debug: Print every function visited.
+    :param backend: "ast" (fast, stdlib) or "libcst"; both give the same specs.
     """
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, backend: str = TOOL_EXTRACTOR_BACKENDS[0]):
+        if backend not in TOOL_EXTRACTOR_BACKENDS:
+            raise ValueError(f"Unknown tool extractor backend: {backend}")
         self.debug = debug
+        self.backend = backend
         self.tools = []
 
     def from_code(self, source: str) -> List[Dict]:
         """
-        Parse Python source with LibCST and extract a list of tool specs (dicts) for
+        Parse Python source and extract a list of tool specs (dicts) for
         top-level functions and class methods (non-nested).
         """
-        module = cst.parse_module(source)
-        collector = _ToolCollector(module, debug=self.debug)
-        module.visit(collector)
+        if self.backend == "ast":
+            collector = _AstToolCollector(source, debug=self.debug)
+            collector.visit(ast.parse(source))
+        else:
+            # imported here: only the libcst backend needs LibCST
+            import libcst as cst
+
+            from .tool_collector import _ToolCollector
+
+            module = cst.parse_module(source)
+            collector = _ToolCollector(module, debug=self.debug)
+            module.visit(collector)
         self.tools = collector.tools
         return self.tools
 
@@ -20,3 +20,5 @@ class ToolSpec:
     qualified_name: str
     is_method: bool = False
     class_name: Optional[str] = None
+    # dotted module name, set when tools are merged across modules
+    module: Optional[str] = None
@@ -5,19 +5,25 @@ from __future__ import annotations
 from dataclasses import asdict
 from typing import Dict, List
 
+from ...constants import TOOL_EXTRACTOR_BACKENDS
+from .schema import parameters_json_schema
 from .tool_extractor import ToolExtractor
 from .tool_spec import ToolSpec
 
 
 def extract_tools_from_code(
-    source: str, debug: bool = False, return_dicts: bool = True
+    source: str,
+    debug: bool = False,
+    return_dicts: bool = True,
+    backend: str = TOOL_EXTRACTOR_BACKENDS[0],
 ):
     """
-    Parse Python source with LibCST and extract a list of tool specs (dicts or ToolSpec objects) for
+    Parse Python source and extract a list of tool specs (dicts or ToolSpec objects) for
     top-level functions and class methods (non-nested).
+
+    The "ast" backend is the fast default; "libcst" gives the same specs.
     """
-    collector = ToolExtractor()
-    collector.debug = debug
+    collector = ToolExtractor(debug=debug, backend=backend)
     collector.from_code(source)
     if return_dicts:
         return [asdict(t) for t in collector.tools]
@@ -25,7 +31,12 @@ def extract_tools_from_code(
         return collector.tools
 
 
-def extract_tools_from_file(path: str, debug: bool = False, return_dicts: bool = True):
+def extract_tools_from_file(
+    path: str,
+    debug: bool = False,
+    return_dicts: bool = True,
+    backend: str = TOOL_EXTRACTOR_BACKENDS[0],
+):
     """
     Docstring for extract_tools_from_file
 
@@ -33,21 +44,27 @@ def extract_tools_from_file(path: str, debug: bool = False, return_dicts: bool =
     :type path: str
     :param return_dicts: If True, return list of dicts; if False, return list of ToolSpec objects
     :type return_dicts: bool
+    :param backend: "ast" or "libcst"
+    :type backend: str
     :return: List of tool specs (dicts or ToolSpec objects)
     :rtype: List[Dict] or List[ToolSpec]
     """
     with open(path, "r", encoding="utf8") as f:
         source = f.read()
-    return extract_tools_from_code(source, debug, return_dicts=return_dicts)
+    return extract_tools_from_code(
+        source, debug, return_dicts=return_dicts, backend=backend
+    )
 
 
 # Optional: format for OpenAI "tools" (function calling) style
-def to_openai_tools(tools: List[ToolSpec]) -> List[Dict]:
+def to_openai_tools(tools: List[ToolSpec], json_schema: bool = False) -> List[Dict]:
     """
     Docstring for to_openai_tools
 
     :param tools: Description
     :type tools: List[Dict]
+    :param json_schema: Describe parameters as JSON Schema rather than annotations
+    :type json_schema: bool
     :return: Description
     :rtype: List[Dict]
     """
@@ -61,7 +78,11 @@ def to_openai_tools(tools: List[ToolSpec]) -> List[Dict]:
                         ".", "__"
                     ),  # flatten for API constraints
                     "description": t.description or (t.docstring or "")[:300],
-                    "parameters": t.parameters_schema,
+                    "parameters": (
+                        parameters_json_schema(t)
+                        if json_schema
+                        else t.parameters_schema
+                    ),
                 },
             }
         )
@@ -0,0 +1,236 @@
+"""
+agentix.tools.registry
+
+Map the tool names a model calls back to Python callables.
+
+Tools are registered from their ToolSpecs under the flattened names that
+`to_openai_tools` gives the model (`Class__method`, `pkg__mod__func`). Nothing
+is imported at registration: a tool's module is imported the first time it is
+called (from its source file if it is not importable, as for tool directories),
+and the resolved callable is cached, so every later dispatch is a single dict
+lookup. Arguments are checked against the tool's compiled validator before
+the call, so a bad call fails fast with an error the model can act on.
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+from typing import Any, Callable, Iterable, Optional
+
+from .describe_tools.cache import cached_tool_specs
+from .describe_tools.schema import (
+    ToolArgumentError,
+    compile_validator,
+    validate_arguments,
+)
+from .describe_tools.select import is_public_tool
+from .describe_tools.tool_spec import ToolSpec
+
+# Built-in tool sets and their modules, in the order their names take precedence
+BUILTIN_TOOLS = {"cst": "agentix.tools.cst_tools", "ast": "agentix.tools.ast_tools"}
+
+# Registries of tool source lists, with the tool index version they were built at
+_TOOL_REGISTRIES: dict[tuple[str, ...], tuple[int, "ToolRegistry"]] = {}
+
+
+class UnknownToolError(ValueError):
+    """Raised when a tool call names a tool that is not registered."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Unknown tool: {name}")
+        self.name = name
+
+
+def _import_module(module: str, origin: Optional[str] = None):
+    """Import a module, or load it from its source file if that is elsewhere."""
+    if origin is not None and module not in sys.modules:
+        try:
+            spec = importlib.util.find_spec(module)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None or not spec.origin or not os.path.samefile(spec.origin, origin):
+            spec = importlib.util.spec_from_file_location(module, origin)
+            if spec is None or spec.loader is None:
+                raise ModuleNotFoundError(f"Cannot load {module!r} from {origin}")
+            loaded = importlib.util.module_from_spec(spec)
+            sys.modules[module] = loaded
+            try:
+                spec.loader.exec_module(loaded)
+            except BaseException:
+                del sys.modules[module]
+                raise
+            return loaded
+    return importlib.import_module(module)
+
+
+def flat_name(qualified_name: str) -> str:
+    """Return the tool name the model sees, as rendered by `to_openai_tools`."""
+    return qualified_name.replace(".", "__")
+
+
+class ToolRegistry:
+    """
+    Lazy dispatch table from flattened tool names to callables.
+
+    :param specs: Tool specs to register; see `register`.
+    :param module: Module of specs that do not record one.
+    """
+
+    def __init__(self, specs: Iterable[ToolSpec] = (), module: Optional[str] = None):
+        # flattened name -> (module, attribute path below the module)
+        self.targets: dict[str, tuple[str, tuple[str, ...]]] = {}
+        # module -> source file, for modules that may not be importable
+        self.origins: dict[str, str] = {}
+        self.specs: dict[str, ToolSpec] = {}
+        self.callables: dict[str, Callable] = {}
+        self.validators: dict[str, Callable] = {}
+        self.instances: dict[str, object] = {}
+        for spec in specs:
+            self.register(spec, module)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.targets
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def register(
+        self, spec: ToolSpec, module: Optional[str] = None, origin: Optional[str] = None
+    ) -> bool:
+        """
+        Register a public tool without importing its module.
+
+        :param spec: The tool; module-qualified specs carry their own module.
+        :param module: Module of the tool if the spec does not record one.
+        :param origin: Source file of the module, used if it is not importable.
+        :return: False if the tool is private or its name is already taken.
+        """
+        module = spec.module or module
+        name = flat_name(spec.qualified_name)
+        if not module or not is_public_tool(spec) or name in self.targets:
+            return False
+        if origin is not None:
+            self.origins.setdefault(module, origin)
+        path = spec.qualified_name
+        if spec.module:
+            path = path.removeprefix(f"{spec.module}.")
+        self.targets[name] = (module, tuple(path.split(".")))
+        self.specs[name] = spec
+        return True
+
+    def register_module(self, module: str) -> int:
+        """
+        Register the public tools of a module, read from its source, not imported.
+
+        :return: Number of tools registered.
+        """
+        spec = importlib.util.find_spec(module)
+        if spec is None or not spec.origin:
+            raise ModuleNotFoundError(f"No module named {module!r}")
+        return sum(self.register(s, module) for s in cached_tool_specs(spec.origin))
+
+    def bind(self, class_name: str, instance: object) -> None:
+        """
+        Dispatch the methods of a class to an instance.
+
+        :param class_name: Qualified name of the class within its module.
+        """
+        self.instances[class_name] = instance
+        parts = tuple(class_name.split("."))
+        for name, (_, path) in self.targets.items():
+            if path[: len(parts)] == parts:
+                self.callables.pop(name, None)
+
+    def resolve(self, name: str) -> Callable:
+        """
+        Return the callable of a tool, importing its module on first use.
+
+        Methods resolve on the instance bound to their class, if any.
+        """
+        fn = self.callables.get(name)
+        if fn is not None:
+            return fn
+        if name not in self.targets:
+            raise UnknownToolError(name)
+        module, path = self.targets[name]
+        owner = _import_module(module, self.origins.get(module))
+        for i, attribute in enumerate(path[:-1]):
+            qualname = ".".join(path[: i + 1])
+            if qualname in self.instances:
+                owner = self.instances[qualname]
+            else:
+                owner = getattr(owner, attribute)
+        fn = getattr(owner, path[-1])
+        self.callables[name] = fn
+        return fn
+
+    def validator(self, name: str) -> Callable:
+        """Return the compiled argument validator of a tool."""
+        validator = self.validators.get(name)
+        if validator is None:
+            if name not in self.specs:
+                raise UnknownToolError(name)
+            validator = self.validators[name] = compile_validator(self.specs[name])
+        return validator
+
+    def call(self, name: str, arguments: Optional[dict | str] = None) -> Any:
+        """
+        Call a tool with keyword arguments, validated and coerced first.
+
+        :param arguments: A dict, or the JSON object string of a model's tool call.
+        :raises UnknownToolError: If no tool has this name.
+        :raises ToolArgumentError: Before the call, if the arguments do not fit.
+        """
+        fn = self.resolve(name)
+        return fn(
+            **validate_arguments(self.specs[name], arguments, self.validator(name))
+        )
+
+    def tool_result(self, name: str, arguments: Optional[dict | str] = None) -> str:
+        """
+        Call a tool and return the content of the tool message for the model.
+
+        Invalid arguments (ToolArgumentError) and unknown tools come back as
+        {"error": ...} in the same turn, so the model can correct its call.
+        Errors raised by the tool itself are not the model's to fix: they
+        propagate to the caller.
+        """
+        try:
+            fn = self.resolve(name)
+            kwargs = validate_arguments(
+                self.specs[name], arguments, self.validator(name)
+            )
+        except (ToolArgumentError, UnknownToolError) as e:
+            return json.dumps({"error": str(e)})
+        result = fn(**kwargs)
+        return result if isinstance(result, str) else json.dumps(result, default=str)
+
+
+def tool_registry(names: Optional[list[str]] = None) -> ToolRegistry:
+    """
+    Return the registry of the tools of sources, as the tools prompt lists them.
+
+    The registry is built from the same tool index specs the prompt describes,
+    so every advertised name dispatches to the tool it was described from; it
+    is rebuilt when the index changes.
+
+    :param names: Tool sources, as given to `--tools` (default: the built-ins).
+    """
+    # imported here: the tool index imports this module
+    from .tool_index import tool_index
+
+    key = tuple(dict.fromkeys(names if names is not None else BUILTIN_TOOLS))
+    index = tool_index()
+    # indexing a source for the first time bumps the version: index them first
+    files = {name: index.spec_files(name) for name in key}
+    cached = _TOOL_REGISTRIES.get(key)
+    if cached is not None and cached[0] == index.version:
+        return cached[1]
+    registry = ToolRegistry()
+    for name, spec_files in files.items():
+        for path, spec in spec_files:
+            registry.register(spec, BUILTIN_TOOLS.get(name), origin=path)
+    _TOOL_REGISTRIES[key] = (index.version, registry)
+    return registry
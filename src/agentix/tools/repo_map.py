@@ -0,0 +1,198 @@
+"""
+agentix.tools.repo_map
+
+Repository map: a compact outline of every module in a project.
+
+Each module is reduced to its classes, functions, signatures and one-line
+docstring summaries using `ToolExtractor`. Outlines are cached by the sha256 of
+the module source and the outline format version, cache misses are parsed on a
+process pool, and when the map exceeds its token budget the modules most
+relevant to the prompt are kept. The map is cheap context to send in place of
+whole-file attachments.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from ..attachments.ingest import pack_by_relevance, walk_directory
+from ..constants import (
+    REPO_MAP_BUDGET_TOKENS,
+    REPO_MAP_CACHE_FILE,
+    REPO_MAP_CACHE_MAX_OUTLINES,
+)
+from .describe_tools import ToolExtractor
+from .describe_tools.cache import agentix_version
+
+# Bump when the outline format or its extraction changes
+REPO_MAP_VERSION = 2
+
+
+def _signature(spec) -> str:
+    params = []
+    for name, schema in spec.parameters_schema.get("properties", {}).items():
+        # the collector reports unannotated parameters as "string"
+        annotation = schema.get("type")
+        params.append(
+            name if annotation in (None, "string") else f"{name}: {annotation}"
+        )
+    returns = f" -> {spec.returns['type']}" if spec.returns else ""
+    summary = f"  # {spec.description}" if spec.description else ""
+    return f"def {spec.name}({', '.join(params)}){returns}{summary}"
+
+
+def outline_source(source: str) -> str:
+    """
+    Outline Python source as indented signatures grouped by class.
+
+    Sources that do not parse have an empty outline.
+    """
+    try:
+        specs = ToolExtractor().from_code(source)
+    except (SyntaxError, ValueError):
+        return ""
+    lines = []
+    current_class = None
+    for spec in specs:
+        if spec.is_method:
+            if spec.class_name != current_class:
+                current_class = spec.class_name
+                lines.append(f"class {current_class}:")
+            lines.append(f"    {_signature(spec)}")
+        else:
+            current_class = None
+            lines.append(_signature(spec))
+    return "\n".join(lines)
+
+
+class RepoMapCache:
+    """
+    Module outlines keyed by the sha256 of their source and the outline version.
+
+    Outlines are kept from least to most recently used, and saving evicts the
+    least recently used beyond `max_outlines`, so outlines of superseded sources
+    do not accumulate while those of other projects survive.
+
+    :param path: JSON file persisting the outlines (None keeps them in memory).
+    :param max_outlines: Most outlines kept when saving.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = REPO_MAP_CACHE_FILE,
+        max_outlines: int = REPO_MAP_CACHE_MAX_OUTLINES,
+    ):
+        self.path = path
+        self.max_outlines = max_outlines
+        self.outlines: dict[str, str] = {}
+        self._version = f"{agentix_version()}:{REPO_MAP_VERSION}"
+        self._dirty = False
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.outlines = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self.outlines = {}
+
+    def outline_files(
+        self, paths: list[str], max_workers: Optional[int] = None
+    ) -> dict[str, str]:
+        """
+        Return the outline of each file, parsing only files whose content changed.
+
+        Unreadable files are skipped with an error on stderr.
+        """
+        digests = {}
+        misses = {}
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    source = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error reading {path} for the repo map: {e}", file=sys.stderr)
+                continue
+            digest = hashlib.sha256(source.encode("utf-8"))
+            digest.update(self._version.encode("utf-8"))
+            digest = digest.hexdigest()
+            digests[path] = digest
+            if digest not in self.outlines:
+                misses[digest] = source
+
+        hits = {d for d in digests.values() if d not in misses}
+        # move the hits to the most recent end, unless they are there already
+        if hits != set(itertools.islice(reversed(self.outlines), len(hits))):
+            for digest in hits:
+                self.outlines[digest] = self.outlines.pop(digest)
+            self._dirty = True
+
+        if misses:
+            sources = list(misses.values())
+            if len(sources) > 1 and max_workers != 1:
+                # parsing is CPU-bound: spread the misses over processes
+                with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                    outlines = list(pool.map(outline_source, sources, chunksize=8))
+            else:
+                outlines = [outline_source(source) for source in sources]
+            self.outlines.update(zip(misses, outlines))
+            self._dirty = True
+        return {path: self.outlines[digest] for path, digest in digests.items()}
+
+    def save(self) -> None:
+        """
+        Persist the outlines if they changed (atomically replacing the file).
+
+        The least recently used outlines beyond `max_outlines` are evicted first.
+        """
+        excess = len(self.outlines) - self.max_outlines
+        if excess > 0:
+            for digest in list(itertools.islice(self.outlines, excess)):
+                del self.outlines[digest]
+            self._dirty = True
+        if not self.path or not self._dirty:
+            return
+        self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.outlines, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving repo map cache: {e}", file=sys.stderr)
+
+
+def build_repo_map(
+    root: str,
+    query: str = "",
+    budget: int = REPO_MAP_BUDGET_TOKENS,
+    cache: Optional[RepoMapCache] = None,
+    max_workers: Optional[int] = None,
+) -> str:
+    """
+    Build the outline of the Python modules under root within a token budget.
+
+    :param root: Project directory; `.gitignore` and common exclusions apply.
+    :param query: The user prompt; decides which modules to keep when over budget.
+    :param budget: Token budget for the whole map.
+    :return: Module outlines headed by their relative paths, in path order.
+    """
+    cache = cache or RepoMapCache()
+    paths = [p for p in walk_directory(root) if p.endswith(".py")]
+    outlines = cache.outline_files(paths, max_workers)
+    cache.save()
+
+    sections = [
+        (os.path.relpath(path, root), outline)
+        for path, outline in outlines.items()
+        if outline
+    ]
+    texts = [f"{name}:\n{outline}" for name, outline in sections]
+    # Assuming 1 token per 4 characters, as in trimming
+    items = [(name, False, len(text) // 4) for (name, _), text in zip(sections, texts)]
+    chosen = pack_by_relevance(items, query, budget, lambda i: texts[i])
+    return "\n\n".join(texts[i] for i in chosen)
@@ -0,0 +1,382 @@
+"""
+agentix.tools.symbol_index
+
+Persistent index of the classes, functions and methods of a codebase.
+
+Each file is reduced to its definitions (name, qualified name, kind, bases,
+decorators and position) by the project parser, on a process pool and through
+its cache, and stored in SQLite with indexes on names, bases, decorators and
+class membership. Files are re-indexed only when their mtime or size changed,
+so structural questions across a repository ("which classes implement
+visit_Call?", "what subclasses Tool?") are answered by indexed queries instead
+of by re-parsing every module.
+
+Bases and decorators are matched by their last dotted name (`ast.NodeVisitor`
+matches "NodeVisitor"); imports are not resolved.
+"""
+
+import ast
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from ..attachments.ingest import walk_directory
+from ..constants import PARSE_CACHE_DIR, SYMBOL_INDEX_FILE
+from .project_parser import iter_parsed
+
+# Bump when the schema or the extracted symbols change (this also invalidates
+# the parse cache entries of file_symbols)
+SYMBOL_INDEX_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    parent_id INTEGER,
+    bases TEXT NOT NULL,
+    decorators TEXT NOT NULL,
+    lineno INTEGER NOT NULL,
+    col_offset INTEGER NOT NULL,
+    end_lineno INTEGER,
+    end_col_offset INTEGER
+);
+CREATE TABLE IF NOT EXISTS bases (
+    symbol_id INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS decorators (
+    symbol_id INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name, kind);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols(path);
+CREATE INDEX IF NOT EXISTS symbols_parent ON symbols(parent_id, name);
+CREATE INDEX IF NOT EXISTS bases_name ON bases(name);
+CREATE INDEX IF NOT EXISTS bases_symbol ON bases(symbol_id);
+CREATE INDEX IF NOT EXISTS decorators_name ON decorators(name);
+CREATE INDEX IF NOT EXISTS decorators_symbol ON decorators(symbol_id);
+"""
+
+_COLUMNS = (
+    "s.path, s.name, s.qualname, s.kind, p.qualname, s.bases, s.decorators, "
+    "s.lineno, s.col_offset, s.end_lineno, s.end_col_offset"
+)
+_SELECT = f"SELECT {_COLUMNS} FROM symbols s LEFT JOIN symbols p ON p.id = s.parent_id"
+
+# Statements whose bodies can hold definitions
+_BLOCKS = (ast.stmt, ast.excepthandler, ast.match_case)
+_DEFS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+_SYMBOL_INDEX: Optional["SymbolIndex"] = None
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """A class, function or method definition."""
+
+    path: str
+    name: str
+    qualname: str
+    kind: str  # "class", "function" or "method"
+    parent: Optional[str]  # qualname of the enclosing class or function
+    bases: tuple[str, ...]
+    decorators: tuple[str, ...]
+    lineno: int
+    col_offset: int
+    end_lineno: Optional[int]
+    end_col_offset: Optional[int]
+
+
+def _ref_name(node: ast.expr) -> str:
+    """Return the last dotted name of a base or decorator (`a.B[T]()` -> "B")."""
+    while isinstance(node, (ast.Call, ast.Subscript)):
+        node = node.func if isinstance(node, ast.Call) else node.value
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def file_symbols(tree: ast.Module) -> list[tuple]:
+    """
+    Reduce a module to its definitions, in source order.
+
+    Rows are (name, qualname, kind, parent row index or -1, bases, decorators,
+    lineno, col_offset, end_lineno, end_col_offset); bases and decorators are
+    lists of (source text, last dotted name).
+    """
+    rows = []
+    # (node, index of the enclosing definition's row, its qualname, is a class)
+    stack = [(node, -1, "", False) for node in reversed(tree.body)]
+    while stack:
+        node, parent, prefix, in_class = stack.pop()
+        if isinstance(node, _DEFS):
+            is_class = isinstance(node, ast.ClassDef)
+            qualname = f"{prefix}{node.name}"
+            rows.append(
+                (
+                    node.name,
+                    qualname,
+                    "class" if is_class else "method" if in_class else "function",
+                    parent,
+                    [
+                        (ast.unparse(b), _ref_name(b))
+                        for b in getattr(node, "bases", [])
+                    ],
+                    [(ast.unparse(d), _ref_name(d)) for d in node.decorator_list],
+                    node.lineno,
+                    node.col_offset,
+                    node.end_lineno,
+                    node.end_col_offset,
+                )
+            )
+            parent, prefix, in_class = len(rows) - 1, f"{qualname}.", is_class
+        children = [c for c in ast.iter_child_nodes(node) if isinstance(c, _BLOCKS)]
+        stack.extend((c, parent, prefix, in_class) for c in reversed(children))
+    return rows
+
+
+def _stat(path: str) -> Optional[tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SymbolIndex:
+    """
+    SQLite-backed symbol index, updated per changed file.
+
+    :param path: Database file (":memory:" keeps the index in memory).
+    :param cache_dir: Parse cache directory for the extracted symbols.
+    """
+
+    def __init__(
+        self,
+        path: str = SYMBOL_INDEX_FILE,
+        cache_dir: Optional[str] = PARSE_CACHE_DIR,
+    ):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.cache_dir = cache_dir
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            # readers in other processes are not blocked by an update
+            self.db.execute("PRAGMA journal_mode = WAL")
+        (version,) = self.db.execute("PRAGMA user_version").fetchone()
+        if version != SYMBOL_INDEX_VERSION:
+            self.db.executescript(
+                "DROP TABLE IF EXISTS decorators; DROP TABLE IF EXISTS bases;"
+                "DROP TABLE IF EXISTS symbols; DROP TABLE IF EXISTS files;"
+            )
+        self.db.executescript(_SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {SYMBOL_INDEX_VERSION}")
+
+    def close(self) -> None:
+        """Close the database."""
+        self.db.close()
+
+    def update_files(
+        self, paths: list[str], max_workers: Optional[int] = None
+    ) -> list[str]:
+        """
+        Re-index the files whose mtime or size changed; drop missing files.
+
+        Files that do not parse are indexed without symbols until they change.
+
+        :return: The paths that were re-indexed or dropped.
+        """
+        known = {path: (mtime, size) for path, mtime, size in self._files(paths)}
+        changed = {}
+        removed = []
+        for path in dict.fromkeys(os.path.abspath(p) for p in paths):
+            key = _stat(path)
+            if key is None:
+                if path in known:
+                    removed.append(path)
+            elif known.get(path) != key:
+                changed[path] = key
+        if not changed and not removed:
+            return []
+        with self.db:
+            self.db.executemany(
+                "DELETE FROM files WHERE path = ?", [(p,) for p in removed]
+            )
+            parsed = iter_parsed(
+                list(changed),
+                derive=file_symbols,
+                cache_dir=self.cache_dir,
+                max_workers=max_workers,
+                derive_version=SYMBOL_INDEX_VERSION,
+            )
+            stored = set()
+            for path, rows in parsed:
+                self._store(path, changed[path], rows)
+                stored.add(path)
+            for path in changed.keys() - stored:
+                self._store(path, changed[path], [])
+        return [*changed, *removed]
+
+    def update_directory(
+        self, root: str, max_workers: Optional[int] = None
+    ) -> list[str]:
+        """
+        Index the Python files under root, dropping files deleted since.
+
+        `.gitignore` and common exclusions apply, as in the repo map.
+        """
+        root = os.path.abspath(root)
+        paths = [p for p in walk_directory(root) if p.endswith(".py")]
+        indexed = self.db.execute(
+            "SELECT path FROM files WHERE path LIKE ? ESCAPE '\\'",
+            (_like_prefix(root),),
+        )
+        gone = {path for (path,) in indexed} - set(paths)
+        return self.update_files([*paths, *gone], max_workers)
+
+    def _files(self, paths: list[str]) -> Iterator[tuple[str, int, int]]:
+        absolute = [os.path.abspath(p) for p in paths]
+        # stay below SQLite's bound parameter limit
+        for start in range(0, len(absolute), 500):
+            chunk = absolute[start : start + 500]
+            yield from self.db.execute(
+                "SELECT path, mtime_ns, size FROM files WHERE path IN "
+                f"({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+
+    def _store(self, path: str, key: tuple[int, int], rows: list[tuple]) -> None:
+        self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.db.execute("INSERT INTO files VALUES (?, ?, ?)", (path, *key))
+        ids = []
+        for name, qualname, kind, parent, bases, decorators, *position in rows:
+            cursor = self.db.execute(
+                "INSERT INTO symbols (path, name, qualname, kind, parent_id, bases,"
+                " decorators, lineno, col_offset, end_lineno, end_col_offset)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    path,
+                    name,
+                    qualname,
+                    kind,
+                    ids[parent] if parent >= 0 else None,
+                    json.dumps([text for text, _ in bases]),
+                    json.dumps([text for text, _ in decorators]),
+                    *position,
+                ),
+            )
+            symbol_id = cursor.lastrowid
+            ids.append(symbol_id)
+            self.db.executemany(
+                "INSERT INTO bases VALUES (?, ?)",
+                [(symbol_id, ref) for _, ref in bases if ref],
+            )
+            self.db.executemany(
+                "INSERT INTO decorators VALUES (?, ?)",
+                [(symbol_id, ref) for _, ref in decorators if ref],
+            )
+
+    def _symbols(self, where: str, params: tuple | list = ()) -> list[Symbol]:
+        rows = self.db.execute(
+            f"{_SELECT} WHERE {where} ORDER BY s.path, s.lineno, s.col_offset",
+            params,
+        )
+        return [
+            Symbol(
+                path,
+                name,
+                qualname,
+                kind,
+                parent,
+                tuple(json.loads(bases)),
+                tuple(json.loads(decorators)),
+                *position,
+            )
+            for path, name, qualname, kind, parent, bases, decorators, *position in rows
+        ]
+
+    def find(
+        self, name: str, kind: Optional[str] = None, path: Optional[str] = None
+    ) -> list[Symbol]:
+        """
+        Return the definitions of a name.
+
+        :param kind: "class", "function" or "method", or None for all.
+        :param path: Restrict to one file.
+        """
+        where, params = "s.name = ?", [name]
+        if kind:
+            where, params = f"{where} AND s.kind = ?", [*params, kind]
+        if path:
+            where, params = f"{where} AND s.path = ?", [*params, os.path.abspath(path)]
+        return self._symbols(where, params)
+
+    def methods(self, class_name: str) -> list[Symbol]:
+        """Return the methods of the classes named class_name."""
+        return self._symbols("p.name = ? AND s.kind = 'method'", (class_name,))
+
+    def classes_implementing(self, method_names: list[str]) -> list[Symbol]:
+        """Return the classes that define every one of method_names themselves."""
+        names = list(dict.fromkeys(method_names))
+        if not names:
+            return self._symbols("s.kind = 'class'")
+        return self._symbols(
+            "s.id IN (SELECT parent_id FROM symbols WHERE kind = 'method' AND name"
+            f" IN ({', '.join('?' * len(names))}) GROUP BY parent_id"
+            " HAVING COUNT(DISTINCT name) = ?)",
+            (*names, len(names)),
+        )
+
+    def subclasses(self, base: str, transitive: bool = False) -> list[Symbol]:
+        """
+        Return the classes deriving from a class name.
+
+        :param transitive: Include subclasses of subclasses, by name.
+        """
+        if not transitive:
+            return self._symbols(
+                "s.id IN (SELECT symbol_id FROM bases WHERE name = ?)", (base,)
+            )
+        return self._symbols(
+            "s.id IN (WITH RECURSIVE derived(id, name) AS ("
+            " SELECT c.id, c.name FROM bases b JOIN symbols c ON c.id = b.symbol_id"
+            " WHERE b.name = ?"
+            " UNION"
+            " SELECT c.id, c.name FROM derived d JOIN bases b ON b.name = d.name"
+            " JOIN symbols c ON c.id = b.symbol_id"
+            ") SELECT id FROM derived)",
+            (base,),
+        )
+
+    def decorated_with(self, decorator: str) -> list[Symbol]:
+        """Return the definitions carrying a decorator (`@app.get(...)` -> "get")."""
+        return self._symbols(
+            "s.id IN (SELECT symbol_id FROM decorators WHERE name = ?)", (decorator,)
+        )
+
+
+def _like_prefix(directory: str) -> str:
+    """Return a LIKE pattern matching the paths below a directory."""
+    escaped = directory.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped.rstrip(os.sep)}{os.sep}%"
+
+
+def symbol_index() -> SymbolIndex:
+    """Return the process-wide symbol index."""
+    global _SYMBOL_INDEX  # pylint: disable=global-statement
+    if _SYMBOL_INDEX is None:
+        _SYMBOL_INDEX = SymbolIndex()
+    return _SYMBOL_INDEX
@@ -0,0 +1,340 @@
+"""
+agentix.tools.tool_index
+
+In-memory index of the tools described in prompts, kept current by watching
+their source files.
+
+A tool source is a built-in tool set ("cst", "ast"), a directory or a package.
+The index maps each source to the specs of its files, and each file to the
+(mtime, size, inode) it was extracted at. A refresh stats every file and
+extracts only those that changed, through the tool schema cache, then swaps in
+a new snapshot with a single assignment: readers never wait for a refresh and
+never see a half-built index.
+
+A background thread triggers refreshes from inotify events on Linux (loaded
+through ctypes), or by polling elsewhere.
+"""
+
+import ctypes
+import ctypes.util
+import importlib.util
+import os
+import select
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..constants import TOOL_INDEX_POLL_SECONDS, TOOL_INDEX_RESCAN_SECONDS
+from .describe_tools.cache import tool_schema_cache
+from .describe_tools.discovery import (
+    directory_modules,
+    iter_module_tools,
+    package_modules,
+)
+from .describe_tools.tool_spec import ToolSpec
+from .describe_tools.tools import to_openai_tools
+from .registry import BUILTIN_TOOLS
+
+# Wait this long after a change event, so editors finish writing
+_DEBOUNCE_SECONDS = 0.05
+
+# inotify(7) events that can change the tools of a directory
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_MASK = (
+    _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+_TOOL_INDEX: Optional["ToolIndex"] = None
+
+
+def source_files(name: str) -> dict[str, Optional[str]]:
+    """
+    Map the files of a tool source to the module qualifying their tools.
+
+    Built-in tools keep their plain names (module None); directories and packages
+    qualify tools with their module. Unknown sources have no files.
+    """
+    if name in BUILTIN_TOOLS:
+        spec = importlib.util.find_spec(BUILTIN_TOOLS[name])
+        return {spec.origin: None} if spec and spec.origin else {}
+    if os.path.isdir(name):
+        modules = directory_modules(name)
+    else:
+        try:
+            modules = package_modules(name)
+        except (ImportError, ValueError):
+            return {}
+    return {path: module for module, path in modules.items()}
+
+
+def _stat_key(path: str) -> Optional[tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+@dataclass(frozen=True)
+class _FileTools:
+    key: tuple[int, int, int]
+    specs: list[ToolSpec]
+    tools: list[dict]
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    # source name -> [(path, module)]
+    sources: dict[str, list[tuple[str, Optional[str]]]] = field(default_factory=dict)
+    # (path, module) -> tools extracted from the file
+    files: dict[tuple[str, Optional[str]], _FileTools] = field(default_factory=dict)
+
+
+class _Inotify:
+    """Minimal inotify(7) binding: watch directories, wait for any event."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched: set[str] = set()
+        # watches are added from the watcher thread and from ToolIndex.watch
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def watch(self, directories: set[str]) -> None:
+        """Add watches for directories not watched yet."""
+        with self._lock:
+            if self._closed:
+                return
+            for directory in directories - self.watched:
+                if self._add_watch(self.fd, os.fsencode(directory), _IN_MASK) >= 0:
+                    self.watched.add(directory)
+            # the kernel drops the watches of deleted directories
+            self.watched = {d for d in self.watched if os.path.isdir(d)}
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for events and drain them; return whether any arrived."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        """Release the inotify instance."""
+        with self._lock:
+            self._closed = True
+            os.close(self.fd)
+
+
+class ToolIndex:
+    """
+    Tools of the watched sources, refreshed incrementally.
+
+    :param poll_interval: Seconds between polls without inotify, and the longest
+        a stop request waits with it.
+    """
+
+    def __init__(self, poll_interval: float = TOOL_INDEX_POLL_SECONDS):
+        self.poll_interval = poll_interval
+        self.version = 0
+        self._snapshot = _Snapshot()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+
+    def tools(self, names: list[str]) -> tuple[list[ToolSpec], list[dict]]:
+        """
+        Return the specs and OpenAI tools of sources, in source then file order.
+
+        Sources seen for the first time are indexed before returning; after that
+        this only reads the current snapshot.
+        """
+        snapshot = self._snapshot
+        if any(name not in snapshot.sources for name in names):
+            self.watch(names)
+            snapshot = self._snapshot
+        specs, tools = [], []
+        for name in dict.fromkeys(names):
+            for entry in snapshot.sources.get(name, []):
+                file_tools = snapshot.files.get(entry)
+                if file_tools:
+                    specs.extend(file_tools.specs)
+                    tools.extend(file_tools.tools)
+        return specs, tools
+
+    def spec_files(self, name: str) -> list[tuple[str, ToolSpec]]:
+        """
+        Return the specs of one source with the files they come from.
+
+        Specs are in the order `tools` lists them; the source is indexed first
+        if needed.
+        """
+        if name not in self._snapshot.sources:
+            self.watch([name])
+        snapshot = self._snapshot
+        return [
+            (entry[0], spec)
+            for entry in snapshot.sources.get(name, [])
+            if entry in snapshot.files
+            for spec in snapshot.files[entry].specs
+        ]
+
+    def watch(self, names: list[str]) -> None:
+        """Add tool sources to the index, and to the running watcher."""
+        with self._lock:
+            self._refresh({**self._snapshot.sources, **dict.fromkeys(names)})
+        inotify = self._inotify
+        if inotify is not None:
+            # without this, new sources are only watched after the next rescan
+            inotify.watch(self.directories())
+
+    def refresh(self) -> bool:
+        """
+        Re-extract the files that changed since the last refresh.
+
+        :return: True if a new snapshot was swapped in.
+        """
+        with self._lock:
+            return self._refresh(dict.fromkeys(self._snapshot.sources))
+
+    def _refresh(self, names: dict) -> bool:
+        old = self._snapshot
+        sources = {}
+        files = {}
+        changed = {}
+        for name in names:
+            sources[name] = list(source_files(name).items())
+            for entry in sources[name]:
+                if entry in files or entry in changed:
+                    continue
+                key = _stat_key(entry[0])
+                previous = old.files.get(entry)
+                if key is None:
+                    continue
+                if previous and previous.key == key:
+                    files[entry] = previous
+                else:
+                    changed[entry] = key
+        for (path, module), key in changed.items():
+            # files that fail to extract have no tools until they change again
+            files[(path, module)] = _FileTools(key, [], [])
+            if module is None:
+                try:
+                    cached = tool_schema_cache().get(path)
+                except (OSError, SyntaxError, ValueError) as e:
+                    print(f"Error extracting tools from {path}: {e}", file=sys.stderr)
+                    continue
+                specs = [ToolSpec(**spec) for spec in cached["specs"]]
+                files[(path, module)] = _FileTools(key, specs, cached["openai"])
+        qualified = {module: path for (path, module) in changed if module is not None}
+        for module, specs in iter_module_tools(qualified):
+            entry = (qualified[module], module)
+            tools = to_openai_tools(specs, json_schema=True)
+            files[entry] = _FileTools(changed[entry], specs, tools)
+
+        if sources == old.sources and files.keys() == old.files.keys() and not changed:
+            return False
+        self._snapshot = _Snapshot(sources, files)
+        self.version += 1
+        return True
+
+    def directories(self) -> set[str]:
+        """Return the directories holding the indexed files and watched directories."""
+        snapshot = self._snapshot
+        directories = {name for name in snapshot.sources if os.path.isdir(name)}
+        directories.update(os.path.dirname(path) for path, _ in snapshot.files)
+        return {os.path.abspath(d) for d in directories}
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"Error refreshing the tool index: {e}", file=sys.stderr)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self._refresh_quietly()
+
+    def _watch(self, inotify: _Inotify) -> None:
+        try:
+            rescan = time.monotonic() + TOOL_INDEX_RESCAN_SECONDS
+            while not self._stop.is_set():
+                changed = inotify.wait(self.poll_interval)
+                if not changed and time.monotonic() < rescan:
+                    continue
+                # new or deleted directories are only found by a rescan
+                if self._stop.wait(_DEBOUNCE_SECONDS):
+                    break
+                inotify.wait(0)
+                self._refresh_quietly()
+                inotify.watch(self.directories())
+                rescan = time.monotonic() + TOOL_INDEX_RESCAN_SECONDS
+        finally:
+            inotify.close()
+
+    def start(self) -> str:
+        """
+        Start watching the indexed sources in a background thread.
+
+        :return: "inotify", or "polling" where inotify is unavailable.
+        """
+        if self._thread is not None:
+            return self._thread.name
+        self._stop.clear()
+        try:
+            inotify = _Inotify()
+            # watch before returning, so no change after start() is missed
+            inotify.watch(self.directories())
+        except (OSError, AttributeError):
+            inotify = None
+        self._inotify = inotify
+        if inotify is not None:
+            self._thread = threading.Thread(
+                target=self._watch, args=(inotify,), name="inotify", daemon=True
+            )
+        else:
+            self._thread = threading.Thread(
+                target=self._poll, name="polling", daemon=True
+            )
+        self._thread.start()
+        return self._thread.name
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._inotify = None
+
+
+def tool_index() -> ToolIndex:
+    """Return the process-wide tool index."""
+    global _TOOL_INDEX  # pylint: disable=global-statement
+    if _TOOL_INDEX is None:
+        _TOOL_INDEX = ToolIndex()
+    return _TOOL_INDEX
@@ -0,0 +1,146 @@
+"""Tests for the AST export helpers in agentix.tools.ast_tools."""
+
+import ast
+import io
+import json
+import unittest
+
+from agentix.tools.ast_tools import (
+    iter_node_json,
+    iter_node_json_lines,
+    node_to_dict,
+    write_node_json,
+)
+
+SOURCE = '''
+import os
+
+
+def load(path: str, mode="rb") -> bytes:
+    """Load a file."""
+    with open(path, mode) as f:
+        return f.read() or b"\\x00"
+
+
+class Store:
+    limit = 1e999
+'''
+
+
+def dumps(value) -> str:
+    """JSON without whitespace, as streamed."""
+    return json.dumps(value, separators=(",", ":"))
+
+
+class TestNodeToDict(unittest.TestCase):
+    """Test node_to_dict."""
+
+    def test_fields_and_positions(self):
+        """Nodes keep their fields in order, followed by their positions."""
+        self.assertEqual(
+            node_to_dict(ast.parse("x").body[0].value),
+            {
+                "_type": "Name",
+                "id": "x",
+                "ctx": {"_type": "Load"},
+                "lineno": 1,
+                "col_offset": 0,
+                "end_lineno": 1,
+                "end_col_offset": 1,
+            },
+        )
+
+    def test_options(self):
+        """Fields, depth and positions can be left out."""
+        tree = ast.parse("f(x)")
+        self.assertEqual(
+            node_to_dict(tree, max_depth=1, positions=False),
+            {
+                "_type": "Module",
+                "body": [{"_type": "Expr", "value": {"_type": "Call"}}],
+                "type_ignores": [],
+            },
+        )
+        self.assertEqual(
+            node_to_dict(tree.body[0], fields={"value", "func", "id"}, positions=False),
+            {
+                "_type": "Expr",
+                "value": {"_type": "Call", "func": {"_type": "Name", "id": "f"}},
+            },
+        )
+
+    def test_deep_trees(self):
+        """Trees deeper than the recursion limit are converted."""
+        tree = ast.parse("a" + "+a" * 3000)
+        result = node_to_dict(tree, positions=False)["body"][0]["value"]
+        for _ in range(3000):
+            result = result["left"]
+        self.assertEqual(result, {"_type": "Name", "id": "a", "ctx": {"_type": "Load"}})
+
+
+class TestIterNodeJson(unittest.TestCase):
+    """Test the streaming JSON export."""
+
+    def setUp(self):
+        self.tree = ast.parse(SOURCE)
+
+    def test_matches_node_to_dict(self):
+        """The stream is the JSON of node_to_dict, with the same options."""
+        for options in (
+            {},
+            {"positions": False},
+            {"max_depth": 2},
+            {"fields": {"body", "name", "args", "arg"}},
+        ):
+            tree = ast.parse("def f(a, b=1):\n    return a + b\n")
+            self.assertEqual(
+                "".join(iter_node_json(tree, **options)),
+                dumps(node_to_dict(tree, **options)),
+            )
+
+    def test_non_json_constants(self):
+        """Bytes and non-finite floats are written as their repr."""
+        exported = json.loads("".join(iter_node_json(self.tree)))
+        text = json.dumps(exported)
+        self.assertIn("\"b'\\\\x00'\"", text)
+        self.assertEqual(exported["body"][2]["body"][0]["value"]["value"], "inf")
+
+    def test_compact_arrays(self):
+        """Compact nodes are arrays of their type and field values."""
+        self.assertEqual(
+            json.loads("".join(iter_node_json(ast.parse("x = 1"), compact=True))),
+            [
+                "Module",
+                [
+                    [
+                        "Assign",
+                        [["Name", "x", ["Store"], 1, 0, 1, 1]],
+                        ["Constant", 1, None, 1, 4, 1, 5],
+                        None,
+                        1,
+                        0,
+                        1,
+                        5,
+                    ]
+                ],
+                [],
+            ],
+        )
+
+    def test_bounded_chunks_and_lines(self):
+        """Output streams in chunks, or as one JSON line per statement."""
+        tree = ast.parse("a" + "+a" * 3000)
+        chunks = list(iter_node_json(tree, positions=False, chunk_size=64))
+        self.assertGreater(len(chunks), 100)
+        self.assertLessEqual(max(len(c) for c in chunks), 64 * 20)
+        json.loads("".join(chunks))
+        lines = list(iter_node_json_lines(self.tree, positions=False))
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])["_type"], "Import")
+        buffer = io.StringIO()
+        write_node_json(self.tree, buffer, compact=True)
+        self.assertEqual(json.loads(buffer.getvalue())[0], "Module")
+
+
+if __name__ == "__main__":
+    unittest.main()
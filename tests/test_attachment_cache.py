@@ -0,0 +1,82 @@
+"""Tests for the attachment cache."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from agentix.attachments import blob_store
+from agentix.attachments.cache import AttachmentCache
+
+
+def read(path):
+    """Read a file's text."""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestAttachmentCache(unittest.TestCase):
+    """Test AttachmentCache class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch.object(blob_store, "BLOBS_DIR", self.tmp.name + "/blobs")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.file = os.path.join(self.tmp.name, "module.py")
+        with open(self.file, "w", encoding="utf-8") as f:
+            f.write("x = 1\n")
+        self.cache_file = os.path.join(self.tmp.name, "cache.json")
+
+    def test_unchanged_file_is_not_reloaded(self):
+        """A second lookup of an unchanged file only stats it."""
+        cache = AttachmentCache(self.cache_file)
+        load = MagicMock(side_effect=read)
+        first = cache.get(self.file, load)
+        second = cache.get(self.file, load)
+        self.assertIs(first, second)
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(cache.content(second), "x = 1\n")
+
+    def test_changed_file_is_reloaded(self):
+        """A size or mtime change invalidates the entry."""
+        cache = AttachmentCache(self.cache_file)
+        cache.get(self.file, read)
+        with open(self.file, "w", encoding="utf-8") as f:
+            f.write("x = 22\n")
+        entry = cache.get(self.file, read)
+        self.assertEqual(cache.content(entry), "x = 22\n")
+
+    def test_persisted_entries_survive_restart(self):
+        """A new process-level cache reuses saved entries without reading."""
+        cache = AttachmentCache(self.cache_file)
+        cache.get(self.file, read)
+        cache.save()
+        load = MagicMock(side_effect=read)
+        restarted = AttachmentCache(self.cache_file)
+        entry = restarted.get(self.file, load)
+        load.assert_not_called()
+        self.assertEqual(restarted.content(entry), "x = 1\n")
+
+    def test_new_tag_replaces_entry(self):
+        """Each variant keeps one entry, reloaded when its tag changes."""
+        cache = AttachmentCache(self.cache_file)
+        load = MagicMock(side_effect=read)
+        for tag in ("query-1", "query-2", "query-2", "query-3"):
+            cache.get(self.file, load, variant="slice", tag=tag)
+        self.assertEqual(load.call_count, 3)
+        self.assertEqual(len(cache.entries), 1)
+        self.assertEqual(next(iter(cache.entries.values()))["tag"], "query-3")
+
+    def test_unstattable_file_is_not_cached(self):
+        """Paths that cannot be stat'ed are loaded but not stored."""
+        cache = AttachmentCache(None)
+        entry = cache.get("no/such/file.py", lambda path: "inline")
+        self.assertIsNone(entry["blob"])
+        self.assertEqual(cache.content(entry), "inline")
+        self.assertEqual(cache.entries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for the bounded attachment reader."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentix.attachments import reader
+
+
+class TestIsBinary(unittest.TestCase):
+    """Test is_binary function."""
+
+    def test_text_is_not_binary(self):
+        """Plain and UTF-8 text are text, even when cut mid-character."""
+        self.assertFalse(reader.is_binary(b"def f():\n\treturn 1\n"))
+        self.assertFalse(reader.is_binary("naïve".encode("utf-8")[:-1]))
+
+    def test_binary_detected(self):
+        """NUL bytes and invalid UTF-8 are binary."""
+        self.assertTrue(reader.is_binary(b"PK\x03\x04\x00\x00"))
+        self.assertTrue(reader.is_binary(b"\xff\xfe\xfa abc"))
+
+
+class TestReadAttachment(unittest.TestCase):
+    """Test read_attachment function."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, data: bytes) -> str:
+        path = os.path.join(self.tmp.name, "file")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_small_file_read_whole(self):
+        """Files within both caps are returned unchanged."""
+        path = self._write(b"line 1\nline 2\n")
+        self.assertEqual(reader.read_attachment(path), "line 1\nline 2\n")
+
+    def test_binary_placeholder(self):
+        """Binary files are replaced by a placeholder."""
+        path = self._write(b"\x00\x01\x02" * 100)
+        self.assertEqual(
+            reader.read_attachment(path), "[binary content omitted: 300 bytes]"
+        )
+
+    def test_token_cap_stops_reading(self):
+        """Reading stops at the token budget."""
+        path = self._write(b"x" * 10000)
+        text = reader.read_attachment(path, max_bytes=100000, max_tokens=10)
+        self.assertTrue(text.startswith("x" * 40 + "\n[... truncated"))
+
+    def test_oversized_file_sampled_head_and_tail(self):
+        """Files over the byte cap keep whole lines from the head and tail."""
+        lines = b"".join(b"line %04d\n" % i for i in range(1000))
+        path = self._write(lines)
+        with patch.object(reader, "MMAP_THRESHOLD", 64):
+            text = reader.read_attachment(path, max_bytes=200, max_tokens=1000)
+        self.assertTrue(text.startswith("line 0000\n"))
+        self.assertTrue(text.endswith("line 0999\n"))
+        self.assertIn("bytes omitted", text)
+        self.assertLess(len(text), 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""Tests for the attachment blob store."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentix.attachments import blob_store
+
+
+class TestBlobStore(unittest.TestCase):
+    """Test put_blob and get_blob functions."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = patch.object(blob_store, "BLOBS_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        blob_store.get_blob.cache_clear()
+
+    def test_put_get_round_trip(self):
+        """Stored content is returned by digest."""
+        digest = blob_store.put_blob("print('hello')\n")
+        self.assertTrue(blob_store.has_blob(digest))
+        self.assertEqual(blob_store.get_blob(digest), "print('hello')\n")
+
+    def test_identical_content_stored_once(self):
+        """The same content maps to the same blob file."""
+        first = blob_store.put_blob("same")
+        second = blob_store.put_blob("same")
+        self.assertEqual(first, second)
+        files = [f for _, _, names in os.walk(self.tmp.name) for f in names]
+        self.assertEqual(len(files), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Tests for the batch codemod runner."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import libcst as cst
+
+from agentix.tools.codemod import run_codemod
+from agentix.tools.cst_tools import AddDecorator
+
+MODEL = "class Model:\r\n    pass\r\n"
+DECORATED = "@dataclass\nclass Model:\n    pass\n"
+
+
+class RenameX(cst.CSTTransformer):
+    """Rename x to y; no pre-filter, so it runs on every file."""
+
+    def leave_Name(self, original_node, updated_node):
+        if updated_node.value == "x":
+            return updated_node.with_changes(value="y")
+        return updated_node
+
+
+class Explode(cst.CSTTransformer):
+    """Raise on modules defining `boom`."""
+
+    def visit_FunctionDef(self, node):
+        if node.name.value == "boom":
+            raise KeyError(node.name.value)
+
+
+class TestRunCodemod(unittest.TestCase):
+    """Test run_codemod on a temporary tree."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.paths = [self.write(f"model{i}.py", MODEL) for i in range(4)]
+        self.other = self.write("other.py", "x = 1\n")
+
+    def write(self, name: str, source: str) -> str:
+        """Write a source file and return its path."""
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(source)
+        return path
+
+    def read(self, path: str) -> str:
+        """Read a source file, newlines untranslated."""
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return f.read()
+
+    def test_pool_writes_changes(self):
+        """Files are transformed on the pool and written back, newlines kept."""
+        decorated = self.write("decorated.py", DECORATED)
+        paths = [*self.paths, self.other, decorated]
+        report = run_codemod(AddDecorator("Model", "@dataclass"), paths, max_workers=2)
+        self.assertEqual([r.path for r in report.results], paths)
+        self.assertEqual(
+            report.counts(), {"changed": 4, "unchanged": 1, "skipped": 1, "failed": 0}
+        )
+        for path in self.paths:
+            self.assertEqual(
+                self.read(path), "@dataclass\r\nclass Model:\r\n    pass\r\n"
+            )
+        self.assertEqual(self.read(decorated), DECORATED)
+        self.assertIn("4 changed", report.summary())
+
+    def test_prefilter_skips_without_parsing(self):
+        """Files no transformer may match are never parsed."""
+        with patch("agentix.tools.codemod.cst.parse_module") as parse:
+            report = run_codemod([AddDecorator("Model", "dc")], [self.other])
+        parse.assert_not_called()
+        self.assertEqual(report.results[0].status, "skipped")
+
+    def test_dry_run_and_chained_transformers(self):
+        """Dry runs write nothing and diff all transformers' changes."""
+        path = self.write("both.py", "x = 1\n\n\nclass Model:\n    pass\n")
+        report = run_codemod(
+            [AddDecorator("Model", "dataclass"), RenameX()],
+            [path, self.other],
+            dry_run=True,
+            max_workers=1,
+        )
+        self.assertEqual(self.read(path), "x = 1\n\n\nclass Model:\n    pass\n")
+        diff = report.results[0].diff
+        self.assertIn("-x = 1\n+y = 1\n", diff)
+        self.assertIn("+@dataclass\n", diff)
+        self.assertEqual(report.results[1].status, "changed")
+        self.assertIn("2 changed", report.summary())
+        self.assertIn("dry run", report.summary())
+
+    def test_failures_are_reported(self):
+        """Unparsable and unreadable files fail without stopping the run."""
+        broken = self.write("broken.py", "class Model(:\n")
+        missing = os.path.join(self.tmp.name, "missing.py")
+        with patch("sys.stderr"):
+            report = run_codemod(
+                [AddDecorator("Model", "dataclass")],
+                [broken, missing, self.paths[0]],
+                max_workers=1,
+            )
+        self.assertEqual(
+            [r.status for r in report.results], ["failed", "failed", "changed"]
+        )
+        self.assertTrue(report.results[0].error)
+        lines = report.summary(per_file=True).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("failed"))
+        self.assertIn(" ms ", lines[2])
+
+    def test_transformer_errors_fail_only_their_file(self):
+        """A transformer raising on one file leaves the rest of the run intact."""
+        boom = self.write("boom.py", "def boom():\n    x = 1\n")
+        paths = [*self.paths[:3], boom, self.paths[3], self.other]
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                report = run_codemod(
+                    [RenameX(), Explode()], paths, dry_run=True, max_workers=workers
+                )
+                self.assertEqual(
+                    [r.status for r in report.results],
+                    ["unchanged"] * 3 + ["failed", "unchanged", "changed"],
+                )
+                self.assertEqual(report.results[3].error, "KeyError: 'boom'")
+        self.assertEqual(self.read(boom), "def boom():\n    x = 1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Tests for running several CST visitors in one traversal."""
+
+import unittest
+
+import libcst as cst
+from libcst.metadata import MetadataWrapper, PositionProvider
+
+from agentix.tools.composite_visitor import (
+    CompositeVisitor,
+    ImplementationCollector,
+    ImportCollector,
+    visit_all,
+)
+from agentix.tools.describe_tools.tool_collector import _ToolCollector
+
+SOURCE = '''
+import os.path as osp
+from . import sibling
+from ..pkg.mod import name
+
+
+def tool(path: str, depth: int = 1) -> list:
+    """List a directory."""
+    import json
+    return []
+
+
+class Visitor:
+    def visit(self, node):
+        pass
+
+    def leave(self, node):
+        def visit():
+            pass
+
+    class Inner:
+        def visit(self): ...
+        def leave(self): ...
+'''
+
+
+class Recorder(cst.CSTVisitor):
+    """Record the names of visited and left functions and classes."""
+
+    def __init__(self, skip: str = ""):
+        super().__init__()
+        self.skip = skip
+        self.events: list[str] = []
+
+    def visit_FunctionDef(self, node):
+        self.events.append(f"visit {node.name.value}")
+        return node.name.value != self.skip
+
+    def leave_FunctionDef(self, original_node):
+        self.events.append(f"leave {original_node.name.value}")
+
+    def visit_ClassDef_bases(self, node):
+        self.events.append(f"bases {node.name.value}")
+
+
+class Lines(cst.CSTVisitor):
+    """Record the line of each function, from PositionProvider."""
+
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self):
+        super().__init__()
+        self.lines: list[int] = []
+
+    def visit_FunctionDef(self, node):
+        self.lines.append(self.get_metadata(PositionProvider, node).start.line)
+
+
+class TestCompositeVisitor(unittest.TestCase):
+    """Test CompositeVisitor against separate traversals."""
+
+    def setUp(self):
+        self.module = cst.parse_module(SOURCE)
+
+    def separately(self, visitors):
+        """Run each visitor in its own traversal."""
+        for visitor in visitors:
+            self.module.visit(visitor)
+        return visitors
+
+    def test_matches_separate_walks(self):
+        """One walk gives every visitor what its own walk would."""
+        make = lambda: [  # noqa: E731
+            _ToolCollector(self.module),
+            ImportCollector(),
+            ImplementationCollector(["visit", "leave"]),
+            Recorder(skip="leave"),
+        ]
+        alone, combined = self.separately(make()), visit_all(self.module, make())
+        self.assertEqual(
+            [t.qualified_name for t in combined[0].tools],
+            [t.qualified_name for t in alone[0].tools],
+        )
+        self.assertEqual(combined[1].imports, ["os.path", ".", "..pkg.mod", "json"])
+        self.assertEqual(combined[1].imports, alone[1].imports)
+        self.assertEqual(
+            [c.name.value for c in combined[2].classes], ["Visitor", "Inner"]
+        )
+        self.assertEqual(combined[3].events, alone[3].events)
+
+    def test_skipped_subtrees_are_per_visitor(self):
+        """A visitor that skips a subtree does not hide it from the others."""
+        skipping, seeing = visit_all(self.module, [Recorder(skip="leave"), Recorder()])
+        start = skipping.events.index("visit leave")
+        self.assertEqual(skipping.events[start + 1], "leave leave")
+        start = seeing.events.index("visit leave")
+        self.assertEqual(
+            seeing.events[start + 1 : start + 4],
+            ["visit visit", "leave visit", "leave leave"],
+        )
+        self.assertIn("bases Inner", seeing.events)
+
+    def test_metadata_through_wrapper(self):
+        """Visitors resolve their metadata from a shared wrapper."""
+        lines, recorder = visit_all(MetadataWrapper(self.module), [Lines(), Recorder()])
+        self.assertEqual(lines.lines, [7, 14, 17, 18, 22, 23])
+        self.assertEqual(len(recorder.events), 12 + 2)
+
+    def test_dispatch_tables_are_cached(self):
+        """Method lookups happen once per node class."""
+        composite = CompositeVisitor([ImportCollector()])
+        self.module.visit(composite)
+        # pylint: disable=protected-access
+        tables = dict(composite._nodes)
+        self.module.visit(composite)
+        self.assertEqual(composite._nodes, tables)
+        self.assertEqual(len(tables[cst.ImportFrom][0]), 1)
+        self.assertEqual(tables[cst.Name], ((), ()))
+
+
+if __name__ == "__main__":
+    unittest.main()
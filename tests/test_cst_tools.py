@@ -0,0 +1,87 @@
+"""Tests for the module export helpers in agentix.tools.cst_tools."""
+
+import unittest
+
+import libcst as cst
+from libcst.metadata import MetadataWrapper, PositionProvider
+
+from agentix.tools.cst_tools import CST_TABLE_COLUMNS, cst_module_table
+
+SOURCE = '''# -*- coding: utf-8 -*-
+"""Greetings."""
+
+
+def greet(name: str = "wörld") -> str:  # 🌍
+    return f"héllo {name}"\r
+\r
+class Greeter:
+    @staticmethod
+    def wave(): ...
+'''
+
+
+def preorder(module: cst.Module) -> list[cst.CSTNode]:
+    """Return the nodes of a module in pre-order."""
+    nodes, stack = [], [module]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(reversed(node.children))
+    return nodes
+
+
+class TestCstModuleTable(unittest.TestCase):
+    """Test cst_module_table."""
+
+    def setUp(self):
+        self.module = cst.parse_module(SOURCE)
+
+    def test_positions_match_position_provider(self):
+        """Every node's row agrees with PositionProvider, non-ASCII lines included."""
+        table = cst_module_table(self.module)
+        self.assertEqual(table["columns"], list(CST_TABLE_COLUMNS))
+        positions = MetadataWrapper(self.module, unsafe_skip_copy=True).resolve(
+            PositionProvider
+        )
+        nodes = preorder(self.module)
+        self.assertEqual(len(table["rows"]), len(nodes))
+        for node, row in zip(nodes, table["rows"]):
+            rng = positions[node]
+            self.assertEqual(row[0], node.__class__.__name__)
+            self.assertEqual(
+                row[2:6],
+                [rng.start.line, rng.start.column, rng.end.line, rng.end.column],
+            )
+
+    def test_parents_and_sources(self):
+        """Parents index rows; sources are sliced by byte offsets."""
+        rows = cst_module_table(self.module, include_source=True)["rows"]
+        self.assertEqual(rows[0][:2], ["Module", -1])
+        for row in rows[1:]:
+            self.assertLess(row[1], rows.index(row))
+        strings = [row for row in rows if row[0] == "FormattedStringText"]
+        self.assertEqual(strings[0][-1], "héllo ")
+        greet = next(row for row in rows if row[0] == "FunctionDef")
+        self.assertTrue(greet[-1].startswith("def greet("))
+        self.assertTrue(greet[-1].endswith('return f"héllo {name}"'))
+
+    def test_shared_nodes(self):
+        """Modules reusing a node instance on several lines get every row right."""
+        name = cst.Name("x")
+        module = cst.Module(
+            body=[cst.SimpleStatementLine([cst.Expr(name)]) for _ in range(2)]
+        )
+        rows = cst_module_table(module, types={"Name"})["rows"]
+        self.assertEqual([row[2] for row in rows], [1, 2])
+
+    def test_type_filter(self):
+        """Filtered rows point at their nearest exported ancestor."""
+        rows = cst_module_table(self.module, types={"ClassDef", "FunctionDef"})["rows"]
+        self.assertEqual(
+            [(row[0], row[1], row[2]) for row in rows],
+            [("FunctionDef", -1, 5), ("ClassDef", -1, 8), ("FunctionDef", 1, 10)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Tests for the embedding memory module."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from agentix.context import embeddings
+from agentix.context.message import Message
+
+# pylint: disable=unused-argument
+
+
+def fake_embeddings(
+    url, json=None, timeout=None
+):  # pylint: disable=redefined-outer-name
+    """Embed texts as letter counts over a tiny alphabet."""
+    response = MagicMock()
+    response.json.return_value = {
+        "embeddings": [
+            [text.count(c) + 0.0 for c in "abcdefgh"] for text in json["input"]
+        ]
+    }
+    return response
+
+
+class TestVectorStore(unittest.TestCase):
+    """Test VectorStore class."""
+
+    def test_append_grow_and_reload(self):
+        """Vectors survive growth past capacity and reopening."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = embeddings.VectorStore(tmp)
+            vectors = np.eye(4, dtype=np.float32)[np.arange(100) % 4]
+            store.append(
+                [f"k{i}" for i in range(100)],
+                [f"h{i % 4}" for i in range(100)],
+                vectors,
+            )
+            reopened = embeddings.VectorStore(tmp)
+            self.assertEqual(len(reopened), 100)
+            np.testing.assert_array_equal(reopened.vectors, vectors)
+            self.assertEqual(reopened.search(np.eye(4)[2], top_k=1)[0][1], 1.0)
+
+
+class TestEmbeddingMemory(unittest.TestCase):
+    """Test EmbeddingMemory class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.memory = embeddings.EmbeddingMemory("test-model", root=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @staticmethod
+    def _message(content, filename):
+        message = Message(role="user", content=content)
+        message.filename = filename
+        return message
+
+    @patch("requests.post", side_effect=fake_embeddings)
+    def test_embeddings_reused_by_content_hash(self, mock_post):
+        """Identical content is embedded once across sessions."""
+        sent = self.memory.add_messages(
+            "s1", [self._message("aaa", "1.json"), self._message("bbb", "2.json")]
+        )
+        self.assertEqual(sent, 2)
+        sent = self.memory.add_messages("s2", [self._message("aaa", "1.json")])
+        self.assertEqual(sent, 0)
+        self.assertEqual(len(self.memory.store(embeddings.GLOBAL_STORE)), 3)
+
+    @patch("requests.post", side_effect=fake_embeddings)
+    def test_search_excludes_session(self, mock_post):
+        """Global search can skip the current session."""
+        self.memory.add_messages("s1", [self._message("aaaa", "1.json")])
+        self.memory.add_messages("s2", [self._message("aaab", "1.json")])
+        results = self.memory.search("aaaa", top_k=1, exclude_session="s1")
+        self.assertEqual(results[0][:2], ("s2", "1.json"))
+
+    @patch("requests.post", side_effect=fake_embeddings)
+    def test_recall_loads_messages(self, mock_post):
+        """Recalled messages are read back from their session files."""
+        with tempfile.TemporaryDirectory() as sessions_dir:
+            os.makedirs(os.path.join(sessions_dir, "s2"))
+            with open(os.path.join(sessions_dir, "s2", "1.json"), "w") as f:
+                json.dump({"role": "assistant", "content": "ccc"}, f)
+            self.memory.add_messages("s2", [self._message("ccc", "1.json")])
+            with patch("agentix.context.embeddings.SESSIONS_DIR", sessions_dir + "/"):
+                recalled = self.memory.recall("ccc", exclude_session="s1")
+        self.assertEqual([m.content for m in recalled], ["ccc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
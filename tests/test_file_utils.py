@@ -109,5 +109,45 @@ class TestGetAttachments(unittest.TestCase):
         self.assertEqual(result, ["content1", "content3"])
 
 
+class TestAttachmentRefs(unittest.TestCase):
+    """Test blob-referenced attachments."""
+
+    @patch("agentix.file_utils.get_blob", return_value="x = 1")
+    @patch("agentix.file_utils.put_blob", return_value="abc123")
+    @patch("builtins.open", new_callable=mock_open, read_data="x = 1")
+    def test_store_and_resolve_attachment(self, mock_file, mock_put, mock_get):
+        """A stored attachment holds only metadata and resolves to wrapped content."""
+        ref = file_utils.store_attachment("mod.py")
+
+        self.assertEqual(ref["blob"], "abc123")
+        self.assertEqual(ref["path"], "mod.py")
+        self.assertEqual(ref["size"], 5)
+        self.assertNotIn("x = 1", ref.values())
+        self.assertEqual(
+            file_utils.resolve_attachment(ref), file_utils.get_file("mod.py")
+        )
+        self.assertEqual(file_utils.attachment_tokens(ref), ref["tokens"])
+
+    def test_transform_python_modes(self):
+        """Attachment modes minify or outline Python source; full leaves it alone."""
+        source = (
+            'def f(x: int) -> int:\n    """Double x."""\n    return x * 2  # twice\n'
+        )
+        self.assertEqual(file_utils.transform_python(source, "full"), source)
+        self.assertEqual(
+            file_utils.transform_python(source, "minify"),
+            "def f(x: int) -> int:\n#L3\n    return x * 2\n",
+        )
+        self.assertEqual(
+            file_utils.transform_python(source, "outline"),
+            "def f(x: int) -> int  # Double x.",
+        )
+
+    def test_resolve_inline_attachment(self):
+        """Inline string attachments are returned unchanged."""
+        self.assertEqual(file_utils.resolve_attachment("inline"), "inline")
+        self.assertEqual(file_utils.attachment_tokens("x" * 40), 10)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for directory and glob attachment ingestion."""
+
+import os
+import tempfile
+import unittest
+
+from agentix.attachments import ingest
+
+
+class TestExpandAttachmentPaths(unittest.TestCase):
+    """Test expand_attachment_paths function."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        os.mkdir(os.path.join(self.root, ".git"))
+        files = {
+            ".gitignore": "*.log\n/generated/\n!keep.log\n",
+            "pkg/module.py": "x = 1\n",
+            "pkg/debug.log": "noise\n",
+            "pkg/keep.log": "kept\n",
+            "pkg/__pycache__/module.cpython-313.pyc": "",
+            "generated/out.py": "y = 2\n",
+            ".venv/lib/site.py": "",
+            "sub/generated/ok.py": "z = 3\n",
+        }
+        for name, content in files.items():
+            path = os.path.join(self.root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+    def _relative(self, expanded):
+        return sorted(os.path.relpath(p, self.root) for p, _ in expanded)
+
+    def test_directory_honors_ignore_rules(self):
+        """Ignored, excluded, and anchored paths are skipped; negations are kept."""
+        expanded = ingest.expand_attachment_paths([self.root])
+        self.assertEqual(
+            self._relative(expanded),
+            [".gitignore", "pkg/keep.log", "pkg/module.py", "sub/generated/ok.py"],
+        )
+        self.assertFalse(any(explicit for _, explicit in expanded))
+
+    def test_glob_honors_ignore_rules(self):
+        """Glob matches are filtered by the repository's ignore rules."""
+        expanded = ingest.expand_attachment_paths(
+            [os.path.join(self.root, "**", "*.py")]
+        )
+        self.assertEqual(
+            self._relative(expanded), ["pkg/module.py", "sub/generated/ok.py"]
+        )
+
+    def test_explicit_files_kept_and_deduplicated(self):
+        """Named files are explicit, kept even if missing, and listed once."""
+        module = os.path.join(self.root, "pkg", "module.py")
+        expanded = ingest.expand_attachment_paths(
+            [module, os.path.join(self.root, "pkg"), "missing.py"]
+        )
+        self.assertEqual(expanded[0], (module, True))
+        self.assertEqual(expanded[-1], ("missing.py", True))
+        self.assertEqual([p for p, _ in expanded].count(module), 1)
+
+    def test_mode_suffix_applies_to_expanded_files(self):
+        """A ::mode suffix is stripped and carried by every expanded file."""
+        self.assertEqual(
+            ingest.parse_attachment_spec("a.py::minify"), ("a.py", "minify")
+        )
+        self.assertEqual(ingest.parse_attachment_spec("a::b.py"), ("a::b.py", None))
+        expanded = ingest.expand_attachment_specs(
+            [os.path.join(self.root, "pkg") + "::outline"]
+        )
+        self.assertTrue(expanded)
+        self.assertTrue(all(mode == "outline" for _, _, mode in expanded))
+
+
+class TestPackByRelevance(unittest.TestCase):
+    """Test load_parallel and pack_by_relevance functions."""
+
+    def test_load_parallel_preserves_order_and_errors(self):
+        """Results come back in path order; failures are returned, not raised."""
+
+        def load(path):
+            if path == "bad":
+                raise OSError("unreadable")
+            return path.upper()
+
+        results = ingest.load_parallel(["a", "bad", "c"], load, max_workers=3)
+        self.assertEqual(results[0], "A")
+        self.assertIsInstance(results[1], OSError)
+        self.assertEqual(results[2], "C")
+
+    def test_relevant_files_packed_first(self):
+        """Over budget, explicit files then the most relevant files are kept."""
+        items = [
+            ("notes.txt", True, 10, "unrelated"),
+            ("a.py", False, 10, "lunch menu"),
+            ("sessions.py", False, 10, "trim context by tokens"),
+            ("b.py", False, 10, "more lunch"),
+        ]
+        chosen = ingest.pack_by_relevance(
+            [item[:3] for item in items],
+            "trim the context",
+            20,
+            lambda i: items[i][3],
+        )
+        self.assertEqual(chosen, [0, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Tests for minification of Python attachments."""
+
+import ast
+import unittest
+
+from agentix.attachments import minify
+
+SOURCE = '''"""Module docstring."""
+
+import os  # operating system
+
+
+class Store:
+    """A store."""
+
+    def put(self, key, value):
+        """Store a value."""
+
+        # remember it
+        def inner():
+            return key
+
+        return inner
+
+
+def only_doc():
+    """Nothing else."""
+
+
+TEMPLATE = """
+keep\x20\x20\x20
+
+  this
+"""
+'''
+
+
+class TestMinifySource(unittest.TestCase):
+    """Test minify_source and original_lines functions."""
+
+    def test_strips_comments_docstrings_and_blank_lines(self):
+        """Minified source drops comments, docstrings and blanks and stays valid."""
+        minified = minify.minify_source(SOURCE)
+        ast.parse(minified)
+        self.assertNotIn("docstring", minified)
+        self.assertNotIn("operating system", minified)
+        self.assertNotIn("remember", minified)
+        self.assertIn("import os\n", minified)
+        self.assertIn("def only_doc():\n    ...", minified)
+
+    def test_multiline_strings_kept_verbatim(self):
+        """Blank lines and whitespace inside string literals are preserved."""
+        minified = minify.minify_source(SOURCE)
+        self.assertIn('TEMPLATE = """\nkeep   \n\n  this\n"""', minified)
+
+    def test_bodies_elided_past_depth(self):
+        """Functions nested at max_depth or deeper have their bodies elided."""
+        minified = minify.minify_source(SOURCE, max_depth=2)
+        self.assertIn("def inner():\n            ...", minified)
+        self.assertIn("return inner", minified)
+        outline = minify.minify_source(SOURCE, max_depth=1)
+        self.assertNotIn("inner", outline)
+        ast.parse(outline)
+
+    def test_line_numbers_recoverable(self):
+        """Every minified code line maps back to its original line.
+
+        Elided bodies map to the first line they replace.
+        """
+        minified = minify.minify_source(SOURCE, max_depth=None)
+        lines = SOURCE.splitlines()
+        for text, number in zip(minified.splitlines(), minify.original_lines(minified)):
+            if number is None:
+                self.assertRegex(text, r"^#L\d+$")
+            elif text.strip() != "...":
+                self.assertTrue(lines[number - 1].startswith(text), (text, number))
+
+    def test_decorated_bodies_elided(self):
+        """Eliding a body that starts with a decorated def drops the decorator too."""
+        source = (
+            "def retry(times):\n"
+            "    def deco(fn):\n"
+            "        @functools.wraps(fn)\n"
+            "        def wrapper(*args):\n"
+            "            return fn(*args)\n"
+            "        return wrapper\n"
+            "    return deco\n"
+        )
+        outline = minify.minify_source(source, max_depth=1)
+        self.assertNotIn("functools", outline)
+        ast.parse(outline)
+
+    def test_docstring_sharing_a_line_kept(self):
+        """Docstrings followed by code on the same line are not dropped."""
+        for source in ('"""doc"""; x = 1\n', 'def f():\n    """doc"""; x = 1\n'):
+            minified = minify.minify_source(source)
+            self.assertIn("x = 1", minified)
+            ast.parse(minified)
+
+    def test_invalid_source_unchanged(self):
+        """Sources that do not parse are returned as-is."""
+        self.assertEqual(minify.minify_source("def f(:\n"), "def f(:\n")
+
+    def test_multiline_fstrings_kept_verbatim(self):
+        """Blank lines and trailing spaces inside an f-string are not touched."""
+        source = 'x = f"""a\n\n  b   \n{1}"""\ny = f"""{f\'\'\'\n\n\'\'\'}"""\n'
+        self.assertEqual(minify.minify_source(source), source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""Tests for the diff-based edit engine."""
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from agentix import file_utils
+from agentix.edits import patch
+
+SOURCE = """import os
+
+
+def greet(name):
+    print("Hello " + name)
+
+
+def farewell(name):
+    print("Bye " + name)
+"""
+
+
+class TestParseEdit(unittest.TestCase):
+    """Test parse_unified_diff, parse_search_replace and parse_edit."""
+
+    def test_search_replace_blocks(self):
+        """Blocks become hunks of old and new lines."""
+        hunks = patch.parse_search_replace(
+            "intro\n<<<<<<< SEARCH\na\nb\n=======\nc\n>>>>>>> REPLACE\n"
+        )
+        self.assertEqual(hunks, [patch.Hunk(["a", "b"], ["c"])])
+
+    def test_unified_diff_hunks(self):
+        """Context lines go to both sides; headers are skipped."""
+        hunks = patch.parse_unified_diff(
+            "--- a/x.py\n+++ b/x.py\n@@ -3,2 +3,2 @@\n ctx\n-old\n+new\n"
+        )
+        self.assertEqual(hunks, [patch.Hunk(["ctx", "old"], ["ctx", "new"], 2)])
+
+    def test_header_like_lines_inside_hunks(self):
+        """Removed "-- x" and added "++ x" lines are content, not file headers."""
+        hunks = patch.parse_unified_diff(
+            "--- a/q.sql\n+++ b/q.sql\n@@ -1,2 +1,2 @@\n--- comment\n+++ comment\n"
+            " select 1;\n--- a/r.sql\n+++ b/r.sql\n@@ -4 +4 @@\n-x\n+y\n"
+        )
+        self.assertEqual(
+            hunks,
+            [
+                patch.Hunk(["-- comment", "select 1;"], ["++ comment", "select 1;"], 0),
+                patch.Hunk(["x"], ["y"], 3),
+            ],
+        )
+
+    def test_unparsable_edit_rejected(self):
+        """Text with no hunks and unterminated blocks raise PatchError."""
+        with self.assertRaises(patch.PatchError):
+            patch.parse_edit("just prose")
+        with self.assertRaises(patch.PatchError):
+            patch.parse_edit("<<<<<<< SEARCH\na\n=======\n")
+
+
+class TestApplyEdit(unittest.TestCase):
+    """Test find_block and apply_edit."""
+
+    def test_exact_search_replace(self):
+        """A block found verbatim is replaced."""
+        edit = (
+            "<<<<<<< SEARCH\n"
+            '    print("Hello " + name)\n'
+            "=======\n"
+            '    print(f"Hello {name}")\n'
+            ">>>>>>> REPLACE\n"
+        )
+        result = patch.apply_edit(SOURCE, edit, "greet.py")
+        self.assertIn('print(f"Hello {name}")', result)
+        self.assertIn('print("Bye " + name)', result)
+        self.assertTrue(result.endswith("\n"))
+
+    def test_stale_line_numbers_and_indentation_tolerated(self):
+        """Diff hunks are located by content despite wrong offsets and indentation."""
+        edit = (
+            "@@ -40,2 +40,2 @@\n def farewell(name):\n"
+            "-  print('Bye ' + name)\n+    return None\n"
+        )
+        result = patch.apply_edit(SOURCE, edit, "greet.py")
+        self.assertIn("def farewell(name):\n    return None\n", result)
+
+    def test_pure_insertion_after_its_line(self):
+        """A "-N,0" hunk inserts after line N, not before it."""
+        result = patch.apply_edit("l1\nl2\nl3\n", "@@ -2,0 +3 @@\n+NEW\n", "x.txt")
+        self.assertEqual(result, "l1\nl2\nNEW\nl3\n")
+        result = patch.apply_edit("l1\n", "@@ -0,0 +1 @@\n+NEW\n", "x.txt")
+        self.assertEqual(result, "NEW\nl1\n")
+
+    def test_fuzzy_match(self):
+        """Small transcription errors in the old lines still match."""
+        lines = SOURCE.splitlines()
+        index = patch.find_block(lines, ["def greet(nam):", 'print("Hello" + name)'])
+        self.assertEqual(index, 3)
+        with self.assertRaises(patch.PatchError):
+            patch.find_block(lines, ["class Unrelated(Base):", "pass"])
+
+    def test_syntax_errors_rejected(self):
+        """Python edits that do not parse are rejected."""
+        edit = "<<<<<<< SEARCH\nimport os\n=======\nimport os(\n>>>>>>> REPLACE\n"
+        with self.assertRaises(patch.PatchError):
+            patch.apply_edit(SOURCE, edit, "greet.py")
+        self.assertEqual(patch.apply_edit(SOURCE, edit, "notes.txt")[:10], "import os(")
+
+    def test_replace_file_content_applies_edit(self):
+        """Edit attachments patch the file; failing edits leave it unchanged."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "greet.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SOURCE)
+            args = SimpleNamespace(file_path=[path], validate_edits=False)
+            file_utils.replace_file_content(
+                args,
+                {
+                    "name": path,
+                    "edit": (
+                        "<<<<<<< SEARCH\nimport os\n"
+                        "=======\nimport sys\n>>>>>>> REPLACE"
+                    ),
+                },
+            )
+            file_utils.replace_file_content(
+                args, {"name": path, "edit": "@@ -1 +1 @@\n-missing line\n+x\n"}
+            )
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), SOURCE.replace("import os", "import sys"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""Tests for parallel, cached project parsing."""
+
+import ast
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentix.tools import project_parser
+from agentix.tools.ast_tools import ast_module
+from agentix.tools.project_parser import iter_parsed, parse_project
+
+
+def module_code(module) -> str:
+    """Derive the source of a LibCST module."""
+    return module.code
+
+
+class TestProjectParser(unittest.TestCase):
+    """Test parse_project and iter_parsed."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.paths = [
+            self.write(f"m{i}.py", f"def f{i}(x):\n    return x\n") for i in range(5)
+        ]
+
+    def write(self, name: str, source: str) -> str:
+        """Write a module and return its path."""
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        return path
+
+    def cached(self) -> list[str]:
+        """Return the cache files."""
+        return os.listdir(self.cache_dir) if os.path.isdir(self.cache_dir) else []
+
+    def test_pool_results_in_path_order(self):
+        """Derived results come back from the pool and are cached per file."""
+        results = parse_project(
+            self.paths, derive=ast.dump, cache_dir=self.cache_dir, max_workers=2
+        )
+        self.assertEqual(list(results), self.paths)
+        with open(self.paths[3], encoding="utf-8") as f:
+            self.assertEqual(results[self.paths[3]], ast.dump(ast.parse(f.read())))
+        self.assertEqual(len(self.cached()), 5)
+        self.write("m3.py", "def changed():\n    pass\n")
+        with patch.object(
+            project_parser, "parse_source", wraps=project_parser.parse_source
+        ) as parse:
+            again = parse_project(
+                self.paths, derive=ast.dump, cache_dir=self.cache_dir, max_workers=1
+            )
+        self.assertEqual(parse.call_count, 1)
+        self.assertIn("changed", again[self.paths[3]])
+        self.assertEqual(again[self.paths[0]], results[self.paths[0]])
+
+    def test_cst_derived_results_cached(self):
+        """Results derived from LibCST trees are served from the cache."""
+        first = parse_project(
+            self.paths[:2], parser="cst", derive=module_code, cache_dir=self.cache_dir
+        )
+        with patch.object(project_parser, "parse_source") as parse:
+            second = parse_project(
+                self.paths[:2],
+                parser="cst",
+                derive=module_code,
+                cache_dir=self.cache_dir,
+            )
+        parse.assert_not_called()
+        self.assertEqual(second, first)
+        trees = parse_project(self.paths[:2], parser="cst", cache_dir=self.cache_dir)
+        self.assertEqual(trees[self.paths[0]].code, first[self.paths[0]])
+        self.assertEqual(len(self.cached()), 2)
+
+    def test_derive_version_invalidates_cache(self):
+        """Bumping a derive version re-derives instead of reusing old results."""
+        parse_project(self.paths[:1], derive=ast.dump, cache_dir=self.cache_dir)
+        with patch.object(
+            project_parser, "parse_source", wraps=project_parser.parse_source
+        ) as parse:
+            parse_project(
+                self.paths[:1],
+                derive=ast.dump,
+                cache_dir=self.cache_dir,
+                derive_version=2,
+            )
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(len(self.cached()), 2)
+
+    def test_bare_ast_trees_not_cached(self):
+        """Bare ast trees are parsed each time rather than unpickled."""
+        trees = parse_project(self.paths, cache_dir=self.cache_dir, max_workers=1)
+        self.assertIsInstance(trees[self.paths[0]], ast.Module)
+        self.assertEqual(self.cached(), [])
+
+    def test_broken_files_skipped(self):
+        """Unreadable or unparsable files are reported and left out."""
+        broken = self.write("broken.py", "def f(:\n")
+        missing = os.path.join(self.tmp.name, "missing.py")
+        with patch("sys.stderr"):
+            for parser in ("ast", "cst"):
+                results = dict(
+                    iter_parsed(
+                        [self.paths[0], broken, missing],
+                        parser=parser,
+                        cache_dir=None,
+                    )
+                )
+                self.assertEqual(list(results), [self.paths[0]])
+            self.assertEqual(list(ast_module([broken], strict=False)), [])
+        with self.assertRaises(SyntaxError):
+            ast_module([self.paths[0], broken])
+        with self.assertRaises(ValueError):
+            parse_project(self.paths, parser="yacc")
+
+    def test_too_deep_files_skipped(self):
+        """Sources nested past the recursion limit fail alone, in any mode."""
+        # RecursionError, and MemoryError from the parser's own stack
+        deep = self.write("deep.py", "x = 1" + "+1" * 300000 + "\n")
+        unary = self.write("unary.py", "x = " + "-" * 100000 + "1\n")
+        paths = [*self.paths, deep, unary]
+        with patch("sys.stderr"):
+            for workers in (1, 2):
+                results = parse_project(paths, cache_dir=None, max_workers=workers)
+                self.assertEqual(list(results), self.paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
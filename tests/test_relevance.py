@@ -0,0 +1,89 @@
+"""Tests for the BM25 relevance module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentix.context import relevance
+
+
+class TestTokenize(unittest.TestCase):
+    """Test tokenize function."""
+
+    def test_splits_identifiers(self):
+        """snake_case and camelCase identifiers yield their parts."""
+        terms = relevance.tokenize("call trim_context on ToolSpec")
+        for term in ("trim", "context", "toolspec", "tool", "spec"):
+            self.assertIn(term, terms)
+
+    def test_drops_stopwords(self):
+        """Common stopwords are not indexed."""
+        self.assertEqual(relevance.tokenize("the cat and the hat"), ["cat", "hat"])
+
+
+class TestBM25Index(unittest.TestCase):
+    """Test BM25Index class."""
+
+    def setUp(self):
+        self.index = relevance.BM25Index()
+        self.index.add("a", "parse the python module with libcst")
+        self.index.add("b", "session history is trimmed by tokens")
+        self.index.add("c", "libcst visitors collect tools from a module")
+
+    def test_search_ranks_matching_documents(self):
+        """Documents sharing query terms are returned best first."""
+        results = self.index.search("libcst module", top_k=5)
+        self.assertEqual({doc for doc, _ in results}, {"a", "c"})
+        self.assertNotIn("b", [doc for doc, _ in results])
+
+    def test_search_restricted_to_doc_ids(self):
+        """Candidate restriction excludes other documents."""
+        results = self.index.search("libcst", doc_ids=["c"])
+        self.assertEqual([doc for doc, _ in results], ["c"])
+
+    def test_add_is_idempotent(self):
+        """Re-adding a document id does not change the corpus."""
+        self.index.add("a", "something else entirely")
+        self.assertEqual(len(self.index), 3)
+
+    def test_score_text_matches_indexed_score(self):
+        """Unindexed text scores like an indexed document with the same terms."""
+        indexed = dict(self.index.search("session tokens"))["b"]
+        scored = self.index.score_text(
+            "session tokens", "session history is trimmed by tokens"
+        )
+        self.assertAlmostEqual(indexed, scored)
+
+    def test_persisted_log_round_trip(self):
+        """An index rebuilt from its log ranks like the original."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, ".index", "bm25.jsonl")
+            index = relevance.BM25Index(path=path)
+            index.add("a", "parse the python module with libcst")
+            index.add("b", "session history is trimmed by tokens")
+            loaded = relevance.BM25Index.load(path)
+            self.assertEqual(loaded.search("libcst"), index.search("libcst"))
+
+
+class TestRecallRelevant(unittest.TestCase):
+    """Test recall_relevant function."""
+
+    @patch("agentix.context.relevance.session_index")
+    def test_recall_respects_budget_and_order(self, mock_index):
+        """Relevant messages are recalled in chronological order within budget."""
+        mock_index.return_value = relevance.BM25Index()
+        candidates = [
+            {"role": "user", "content": "how do I parse libcst modules"},
+            {"role": "assistant", "content": "unrelated chatter about lunch"},
+            {"role": "user", "content": "libcst visitors and modules again"},
+            {"role": "user", "content": "libcst " + "x" * 400},
+        ]
+        result = relevance.recall_relevant(
+            "s", candidates, "libcst modules", 20, 5, lambda m: len(m["content"]) // 4
+        )
+        self.assertEqual(result, [candidates[0], candidates[2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
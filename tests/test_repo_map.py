@@ -0,0 +1,124 @@
+"""Tests for the repository map."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentix.tools import repo_map
+
+SOURCE = '''
+def load(path: str, strict=False) -> dict:
+    """Load a config file.
+
+    More details.
+    """
+
+
+class Store:
+    def put(self, key: str, value):
+        """Store a value."""
+
+    def get(self, key):
+        pass
+'''
+
+
+class TestOutlineSource(unittest.TestCase):
+    """Test outline_source function."""
+
+    def test_outline_lists_signatures_and_summaries(self):
+        """Functions and methods become one-line signatures grouped by class."""
+        self.assertEqual(
+            repo_map.outline_source(SOURCE),
+            "def load(path: str, strict) -> dict  # Load a config file.\n"
+            "class Store:\n"
+            "    def put(self, key: str, value)  # Store a value.\n"
+            "    def get(self, key)",
+        )
+
+    def test_unparsable_source_has_empty_outline(self):
+        """Syntax errors yield an empty outline instead of raising."""
+        self.assertEqual(repo_map.outline_source("def f(:\n"), "")
+
+
+class TestBuildRepoMap(unittest.TestCase):
+    """Test RepoMapCache and build_repo_map."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "project")
+        os.makedirs(os.path.join(self.root, "pkg"))
+        self._write("pkg/config.py", SOURCE)
+        self._write("pkg/render.py", "def render_page(template):\n    pass\n")
+        self._write("README.md", "def not_python():\n    pass\n")
+        self.cache = repo_map.RepoMapCache(os.path.join(self.tmp.name, "map.json"))
+
+    def _write(self, name: str, content: str) -> None:
+        with open(os.path.join(self.root, name), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_map_outlines_python_modules(self):
+        """Only Python modules are outlined, headed by their relative paths."""
+        result = repo_map.build_repo_map(self.root, cache=self.cache, max_workers=1)
+        self.assertIn(os.path.join("pkg", "config.py") + ":\ndef load(", result)
+        self.assertIn("def render_page(template)", result)
+        self.assertNotIn("not_python", result)
+
+    def test_unchanged_modules_are_not_reparsed(self):
+        """A second build is served from the cache, across cache instances."""
+        repo_map.build_repo_map(self.root, cache=self.cache, max_workers=1)
+        reloaded = repo_map.RepoMapCache(self.cache.path)
+        with patch.object(repo_map, "outline_source") as outline:
+            repo_map.build_repo_map(self.root, cache=reloaded, max_workers=1)
+            outline.assert_not_called()
+            self._write("pkg/render.py", "def render_pdf(document):\n    pass\n")
+            outline.return_value = "def render_pdf(document)"
+            result = repo_map.build_repo_map(self.root, cache=reloaded, max_workers=1)
+            outline.assert_called_once()
+        self.assertIn("render_pdf", result)
+
+    def test_least_recently_used_evicted_and_versioned(self):
+        """Saving evicts the oldest outlines; a new version misses the cache."""
+        path = self.cache.path
+        repo_map.build_repo_map(self.root, cache=self.cache, max_workers=1)
+        self._write("pkg/render.py", "def render_pdf(document):\n    pass\n")
+        small = repo_map.RepoMapCache(path, max_outlines=2)
+        repo_map.build_repo_map(self.root, cache=small, max_workers=1)
+        outlines = repo_map.RepoMapCache(path).outlines
+        self.assertEqual(len(outlines), 2)
+        self.assertIn("render_pdf", "".join(outlines.values()))
+        self.assertNotIn("render_page", "".join(outlines.values()))
+        with patch.object(repo_map, "REPO_MAP_VERSION", -1):
+            bumped = repo_map.RepoMapCache(self.cache.path)
+            with patch.object(repo_map, "outline_source", return_value="") as outline:
+                bumped.outline_files([os.path.join(self.root, "pkg", "render.py")])
+        outline.assert_called_once()
+
+    def test_alternating_roots_keep_their_outlines(self):
+        """Building another project's map does not evict this project's outlines."""
+        other = os.path.join(self.tmp.name, "other")
+        os.makedirs(other)
+        with open(os.path.join(other, "tool.py"), "w", encoding="utf-8") as f:
+            f.write("def other_tool():\n    pass\n")
+        for root in (self.root, other, self.root, other):
+            cache = repo_map.RepoMapCache(self.cache.path)
+            repo_map.build_repo_map(root, cache=cache, max_workers=1)
+        for root in (self.root, other):
+            cache = repo_map.RepoMapCache(self.cache.path)
+            with patch.object(repo_map, "outline_source") as outline:
+                repo_map.build_repo_map(root, cache=cache, max_workers=1)
+            outline.assert_not_called()
+
+    def test_budget_keeps_most_relevant_module(self):
+        """Over budget, the modules matching the query are kept."""
+        result = repo_map.build_repo_map(
+            self.root, "render the page", budget=10, cache=self.cache, max_workers=1
+        )
+        self.assertIn("render_page", result)
+        self.assertNotIn("def load", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests for code-aware slicing of Python attachments."""
+
+import unittest
+
+import libcst as cst
+
+from agentix.attachments import slicing
+
+SOURCE = '''"""Sample module."""
+
+import os
+
+
+def parse_config(path):
+    """Parse the configuration file."""
+    with open(path) as f:
+        return f.read().splitlines()
+
+
+def render_template(name, context):
+    """Render a template with a context."""
+    template = os.path.join("templates", name)
+    return template.format(**context)
+
+
+class Session:
+    """A chat session."""
+
+    timeout = 30
+
+    def save_history(self, messages):
+        """Write the history to disk."""
+        for message in messages:
+            print(message)
+
+    def load_history(self):
+        """Read the history from disk."""
+        return []
+'''
+
+
+class TestModuleSymbols(unittest.TestCase):
+    """Test module_symbols function."""
+
+    def test_lists_functions_classes_and_methods(self):
+        """Top-level functions, classes and their methods are listed."""
+        names = [name for name, _ in slicing.module_symbols(cst.parse_module(SOURCE))]
+        self.assertEqual(
+            names,
+            [
+                "parse_config",
+                "render_template",
+                "Session",
+                "Session.save_history",
+                "Session.load_history",
+            ],
+        )
+
+    def test_class_symbol_excludes_methods(self):
+        """The class symbol carries the class statements but not its methods."""
+        symbols = dict(slicing.module_symbols(cst.parse_module(SOURCE)))
+        self.assertIn("timeout = 30", symbols["Session"])
+        self.assertNotIn("save_history", symbols["Session"])
+
+
+class TestSliceSource(unittest.TestCase):
+    """Test slice_source function."""
+
+    def test_relevant_function_kept_whole(self):
+        """The matching function is kept and the others are reduced to stubs."""
+        sliced = slicing.slice_source(SOURCE, "parse the config file", min_tokens=0)
+        self.assertIn("return f.read().splitlines()", sliced)
+        self.assertIn("def render_template(name, context): ...", sliced)
+        self.assertNotIn("template.format", sliced)
+        self.assertIn("import os", sliced)
+        cst.parse_module(sliced)
+
+    def test_relevant_method_kept_inside_outlined_class(self):
+        """A matching method is kept while its siblings are stubbed."""
+        sliced = slicing.slice_source(SOURCE, "save messages", min_tokens=0)
+        self.assertIn("print(message)", sliced)
+        self.assertIn("def load_history(self): ...", sliced)
+        self.assertIn("timeout = 30", sliced)
+
+    def test_small_source_unchanged(self):
+        """Sources below the token threshold are not sliced."""
+        self.assertEqual(slicing.slice_source(SOURCE, "parse config"), SOURCE)
+
+    def test_no_match_or_invalid_source_unchanged(self):
+        """Unmatched queries and unparsable sources are returned as-is."""
+        self.assertEqual(
+            slicing.slice_source(SOURCE, "quantum entanglement", min_tokens=0),
+            SOURCE,
+        )
+        broken = "def f(:\n    pass\n"
+        self.assertEqual(slicing.slice_source(broken, "f", min_tokens=0), broken)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+"""Tests for streamed, atomic file replacement."""
+
+import base64
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from agentix import api_client, file_utils
+from agentix.edits import AttachmentStream, atomic_write, decode_base64_stream
+from agentix.next_steps.respond_directly import respond_directly
+
+CONTENT = 'def f():\n    return "quote \\" tab\\t é 😀"\n'
+
+
+def response_for(*attachments) -> str:
+    """Build a structured response with the given attachments."""
+    parts = [{"agent": "here you go"}]
+    parts += [{"attachment": attachment} for attachment in attachments]
+    parts.append({"next_steps": ["Option 1: run it"]})
+    return json.dumps(parts)
+
+
+def chunked(text: str, size: int) -> list[str]:
+    """Split text into chunks of the given size."""
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestAttachmentStream(unittest.TestCase):
+    """Test AttachmentStream and decode_base64_stream."""
+
+    def test_data_decoded_across_any_chunking(self):
+        """Fields and data decode identically whatever the chunk boundaries."""
+        response = response_for(
+            {"name": "a.py", "encoding": "utf8", "language": "python", "data": CONTENT}
+        )
+        for size in (1, 2, 3, 7, len(response)):
+            scanner = AttachmentStream()
+            events = [e for c in chunked(response, size) for e in scanner.feed(c)]
+            fields = {k: v for k, v in events if k not in ("data", "end")}
+            data = "".join(v for k, v in events if k == "data")
+            self.assertEqual(fields["name"], "a.py")
+            self.assertEqual(data, CONTENT)
+            self.assertEqual(events[-1], ("end", None))
+
+    def test_base64_pieces(self):
+        """Base64 data split at arbitrary points decodes to the original bytes."""
+        encoded = base64.b64encode(b"\x00\x01binary\xff" * 10).decode()
+        self.assertEqual(
+            b"".join(decode_base64_stream(chunked(encoded, 5))),
+            b"\x00\x01binary\xff" * 10,
+        )
+
+
+class TestAtomicReplace(unittest.TestCase):
+    """Test atomic_write and replace_files_from_stream."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "a.py")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("x = 1\n")
+        os.chmod(self.path, 0o640)
+
+    def _read(self) -> str:
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_atomic_write_keeps_mode_and_cleans_up_on_error(self):
+        """A clean write keeps permissions; a failed one leaves no trace."""
+        with atomic_write(self.path) as f:
+            f.write("y = 2\n")
+        self.assertEqual(self._read(), "y = 2\n")
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+        with self.assertRaises(RuntimeError):
+            with atomic_write(self.path) as f:
+                f.write("partial")
+                raise RuntimeError("generation failed")
+        self.assertEqual(self._read(), "y = 2\n")
+        self.assertEqual(os.listdir(self.tmp.name), ["a.py"])
+
+    def test_new_files_follow_the_current_umask(self):
+        """A new file gets the mode open() would give it under today's umask."""
+        path = os.path.join(self.tmp.name, "new.py")
+        previous = os.umask(0o027)
+        try:
+            with atomic_write(path) as f:
+                f.write("z = 3\n")
+        finally:
+            os.umask(previous)
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+
+    def test_stream_replaces_valid_files_only(self):
+        """Valid attachments replace their files; invalid Python is rejected."""
+        other = os.path.join(self.tmp.name, "b.py")
+        response = response_for(
+            {"name": self.path, "encoding": "utf8", "data": "def f(:\n"},
+            {"name": other, "encoding": "utf8", "data": CONTENT},
+        )
+        args = SimpleNamespace(file_path=[self.path], validate_edits=False)
+        replaced = file_utils.replace_files_from_stream(args, chunked(response, 4))
+        self.assertEqual(replaced, [other])
+        self.assertEqual(self._read(), "x = 1\n")
+        with open(other, encoding="utf-8") as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_truncated_stream_leaves_file_unchanged(self):
+        """A response cut off inside the data does not replace the file."""
+        response = response_for({"name": self.path, "data": CONTENT})
+        args = SimpleNamespace(file_path=[self.path], validate_edits=False)
+        cut = response[: response.index("return")]
+        self.assertEqual(file_utils.replace_files_from_stream(args, [cut]), [])
+        self.assertEqual(self._read(), "x = 1\n")
+
+    def test_replace_file_content_writes_text(self):
+        """Whole-file attachments are written as text, not decoded as bytes."""
+        args = SimpleNamespace(file_path=[self.path], validate_edits=False)
+        file_utils.replace_file_content(args, {"name": self.path, "data": CONTENT})
+        self.assertEqual(self._read(), CONTENT)
+
+    @patch("agentix.next_steps.respond_directly.assemble_prompts")
+    @patch("agentix.next_steps.respond_directly.stream_api")
+    def test_replace_file_streams_the_answer(self, mock_stream, mock_assemble):
+        """--replace-file streams the answer into the attached files."""
+        response = response_for({"name": self.path, "data": CONTENT})
+        mock_stream.return_value = iter(chunked(response, 5))
+        args = SimpleNamespace(
+            file_path=[self.path],
+            validate_edits=False,
+            replace_file=True,
+            edit_mode="whole",
+        )
+        self.assertEqual(respond_directly(args, None, [], 4096), self.path)
+        mock_stream.assert_called_once_with(args, mock_assemble.return_value)
+        self.assertEqual(self._read(), CONTENT)
+        args.edit_mode = "diff"
+        edit = "<<<<<<< SEARCH\ndef f():\n=======\ndef g():\n>>>>>>> REPLACE\n"
+        response = response_for({"name": self.path, "edit": edit})
+        mock_stream.return_value = iter(chunked(response, 5))
+        self.assertEqual(respond_directly(args, None, [], 4096), self.path)
+        self.assertEqual(self._read(), CONTENT.replace("def f", "def g"))
+
+
+class TestStreamApi(unittest.TestCase):
+    """Test stream_api function."""
+
+    @patch("requests.post")
+    def test_yields_content_deltas(self, mock_post):
+        """Server-sent event deltas are yielded until [DONE]."""
+        response = MagicMock()
+        response.status_code = 200
+        response.iter_lines.return_value = [
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            "",
+            'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+            'data: {"choices": [{"delta": {"content": "lo"}}]}',
+            "data: [DONE]",
+        ]
+        mock_post.return_value.__enter__.return_value = response
+        args = MagicMock()
+        args.debug = False
+
+        chunks = list(api_client.stream_api(args, {"model": "m", "messages": []}))
+
+        self.assertEqual(chunks, ["Hel", "lo"])
+        self.assertTrue(json.loads(mock_post.call_args.kwargs["data"])["stream"])
+
+
+if __name__ == "__main__":
+    unittest.main()
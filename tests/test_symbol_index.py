@@ -0,0 +1,179 @@
+"""Tests for the persistent symbol index."""
+
+import ast
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from agentix.tools.symbol_index import SymbolIndex, file_symbols
+
+VISITORS = """
+import ast
+
+
+class Visitor(ast.NodeVisitor):
+    def visit_Call(self, node):
+        pass
+
+    async def leave_Call(self, node):
+        pass
+
+
+class Deep(Visitor):
+    @staticmethod
+    def visit_Call(node):
+        def inner():
+            pass
+
+
+if True:
+    class Partial(Generic[T]):
+        def visit_Call(self, node):
+            pass
+"""
+
+ROUTES = '''
+@app.get("/")
+def index():
+    """Home."""
+
+
+class Deeper(Deep):
+    pass
+'''
+
+
+class TestSymbolIndex(unittest.TestCase):
+    """Test SymbolIndex updates and queries."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "repo")
+        os.makedirs(self.root)
+        self.visitors = self.write("visitors.py", VISITORS)
+        self.routes = self.write("routes.py", ROUTES)
+        self.index = SymbolIndex(
+            os.path.join(self.tmp.name, "symbols.sqlite3"),
+            cache_dir=os.path.join(self.tmp.name, "cache"),
+        )
+        self.addCleanup(self.index.close)
+        self.index.update_directory(self.root, max_workers=1)
+
+    def write(self, name: str, source: str) -> str:
+        """Write a module with a new mtime and return its path."""
+        path = os.path.join(self.root, name)
+        mtime = os.stat(path).st_mtime_ns + 10**9 if os.path.exists(path) else None
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        if mtime:
+            os.utime(path, ns=(mtime, mtime))
+        return path
+
+    def test_definitions_and_positions(self):
+        """Classes, functions and methods are recorded with their context."""
+        (call,) = self.index.find("visit_Call", path=self.visitors)[:1]
+        self.assertEqual(
+            (call.qualname, call.kind, call.parent, call.lineno, call.col_offset),
+            ("Visitor.visit_Call", "method", "Visitor", 6, 4),
+        )
+        (inner,) = self.index.find("inner")
+        self.assertEqual((inner.kind, inner.parent), ("function", "Deep.visit_Call"))
+        (partial,) = self.index.find("Partial", kind="class")
+        self.assertEqual(partial.bases, ("Generic[T]",))
+        self.assertEqual(
+            [m.qualname for m in self.index.methods("Visitor")],
+            ["Visitor.visit_Call", "Visitor.leave_Call"],
+        )
+
+    def test_structural_queries(self):
+        """Implementations, subclasses and decorators are found across files."""
+        names = lambda symbols: [s.name for s in symbols]  # noqa: E731
+        self.assertEqual(
+            names(self.index.classes_implementing(["visit_Call", "leave_Call"])),
+            ["Visitor"],
+        )
+        self.assertEqual(
+            names(self.index.classes_implementing(["visit_Call"])),
+            ["Visitor", "Deep", "Partial"],
+        )
+        self.assertEqual(names(self.index.subclasses("NodeVisitor")), ["Visitor"])
+        self.assertEqual(
+            names(self.index.subclasses("NodeVisitor", transitive=True)),
+            ["Deeper", "Visitor", "Deep"],
+        )
+        self.assertEqual(
+            names(self.index.decorated_with("staticmethod")), ["visit_Call"]
+        )
+        (route,) = self.index.decorated_with("get")
+        self.assertEqual(route.decorators, ("app.get('/')",))
+
+    def test_incremental_updates(self):
+        """Only changed files are re-parsed; deleted files are dropped."""
+        with patch("agentix.tools.symbol_index.iter_parsed") as parse:
+            self.assertEqual(self.index.update_directory(self.root), [])
+        parse.assert_not_called()
+        self.write("routes.py", "class Deeper(Deep):\n    pass\n")
+        self.assertEqual(self.index.update_directory(self.root), [self.routes])
+        self.assertEqual(self.index.find("index"), [])
+        self.write("broken.py", "def f(:\n")
+        with patch("sys.stderr"):
+            self.index.update_directory(self.root)
+        os.remove(self.visitors)
+        self.assertEqual(self.index.update_directory(self.root), [self.visitors])
+        self.assertEqual(self.index.find("Visitor"), [])
+        self.assertEqual(
+            [s.name for s in self.index.subclasses("Deep", transitive=True)],
+            ["Deeper"],
+        )
+
+    def test_queries_are_fast(self):
+        """Queries over thousands of classes take milliseconds."""
+        rows = []
+        for i in range(2000):
+            rows.append(
+                (f"C{i}", f"C{i}", "class", -1, [("Base", "Base")], [], i, 0, i, 1)
+            )
+            parent = len(rows) - 1
+            for method in ("run", "stop", f"m{i}"):
+                rows.append(
+                    (method, f"C{i}.{method}", "method", parent, [], [], i, 4, i, 5)
+                )
+        # pylint: disable=protected-access
+        with self.index.db:
+            self.index._store("/synthetic.py", (0, 0), rows)
+        start = time.perf_counter()
+        self.assertEqual(len(self.index.classes_implementing(["run", "m7"])), 1)
+        self.assertEqual(len(self.index.subclasses("Base")), 2000)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+
+class TestFileSymbols(unittest.TestCase):
+    """Test file_symbols on deep nesting."""
+
+    def test_deeply_nested_definitions(self):
+        """Nesting deeper than the recursion limit is walked iteratively."""
+        tree = ast.Module(body=[], type_ignores=[])
+        body = tree.body
+        for depth in range(3000):
+            node = ast.FunctionDef(
+                name=f"f{depth}",
+                args=ast.arguments(),
+                body=[],
+                decorator_list=[],
+                lineno=depth + 1,
+                col_offset=0,
+                end_lineno=depth + 1,
+                end_col_offset=0,
+            )
+            body.append(node)
+            body = node.body
+        rows = file_symbols(tree)
+        self.assertEqual(len(rows), 3000)
+        self.assertEqual(rows[-1][3], 2998)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Tests for multi-module tool extraction."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentix.tools.describe_tools import (
+    ToolSchemaCache,
+    extract_tools_from_directory,
+    extract_tools_from_package,
+    iter_module_tools,
+)
+
+HELPER = 'def load(path: str) -> str:\n    """Load a file."""\n'
+
+
+class TestToolDiscovery(unittest.TestCase):
+    """Test extract_tools_from_directory and extract_tools_from_package."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "lib")
+        for rel, source in {
+            "__init__.py": "def version():\n    return 1\n",
+            "io/__init__.py": "",
+            "io/files.py": HELPER,
+            "db/files.py": HELPER + "\n\nclass Store:\n    def load(self): ...\n",
+            "broken.py": "def f(:\n",
+        }.items():
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+        self.cache = ToolSchemaCache(os.path.join(self.tmp.name, "cache"))
+
+    def extract(self, **kwargs):
+        """Extract the test library, silencing the error for broken.py."""
+        with patch("sys.stderr"):
+            return extract_tools_from_directory(
+                self.root, package="lib", cache=self.cache, **kwargs
+            )
+
+    def test_module_qualified_names_in_module_order(self):
+        """Same-named functions in different modules do not collide."""
+        names = [spec.qualified_name for spec in self.extract(max_workers=2)]
+        self.assertEqual(
+            names,
+            ["lib.version", "lib.db.files.load", "lib.db.files.Store.load"]
+            + ["lib.io.files.load"],
+        )
+        self.assertEqual(self.extract()[-1].module, "lib.io.files")
+
+    def test_cache_hits_are_not_parsed(self):
+        """A second extraction is served from the per-file cache."""
+        expected = self.extract(max_workers=1)
+        with patch(
+            "agentix.tools.describe_tools.tools.extract_tools_from_code",
+            side_effect=AssertionError("parsed on a cache hit"),
+        ):
+            fresh = ToolSchemaCache(self.cache.directory)
+            results = dict(
+                iter_module_tools({"lib.io.files": f"{self.root}/io/files.py"}, fresh)
+            )
+        self.assertEqual(results["lib.io.files"], expected[-1:])
+
+    def test_package(self):
+        """Packages are found without importing their modules."""
+        specs = extract_tools_from_package("agentix.edits", cache=ToolSchemaCache(None))
+        self.assertIn(
+            "agentix.edits.patch.apply_edit", {s.qualified_name for s in specs}
+        )
+        with self.assertRaises(ModuleNotFoundError):
+            extract_tools_from_package("agentix_missing_package")
+
+
+if __name__ == "__main__":
+    unittest.main()
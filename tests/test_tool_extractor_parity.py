@@ -0,0 +1,123 @@
+"""Parity tests for the ast and LibCST tool extractor backends."""
+
+import glob
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from agentix.tools.describe_tools import ToolExtractor, extract_tools_from_code
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "agentix")
+
+EDGE_CASES = '''
+import typing
+
+
+def spaced(a: dict[str,int], b: "Forward", c=1, *args: int, d: int, **kw) -> (
+    typing.Optional[ int ]
+):
+    """Odd spacing, a string annotation and parenthesized returns."""
+
+
+async def fetch(url: str, /, timeout: float) -> bytes:
+    r"""Raw docstring with a \\backslash.
+
+    And a second paragraph with unicode: é 😀.
+    """
+    def inner(x: int) -> int:
+        """Nested functions are not tools."""
+        return x
+    return b""
+
+
+def defaults(a, b=1, /, c=2, *, d, e=3):
+    """Positional-only defaults shift which parameters are required."""
+
+
+def one_line(): "Not a docstring for LibCST"
+
+
+def concatenated():
+    "Implicitly " "concatenated"
+
+
+def with_semicolon():
+    "Shares its line"; x = 1
+
+
+def parenthesized():
+    ("Parenthesized docstring")
+
+
+def not_first():
+    x = 1
+    """Not a docstring."""
+
+
+if typing.TYPE_CHECKING:
+    def conditional(é: (int)) -> None: ...
+
+
+class Outer:
+    """A class."""
+
+    def method(self, n: int = 0) -> "Outer":
+        """Method docstring."""
+        class Local:
+            def hidden(self): ...
+        return self
+
+    class Inner:
+        @staticmethod
+        def deep(x: list[
+            int
+        ]) -> None:
+            """Multi-line annotation."""
+'''
+
+
+class TestToolExtractorParity(unittest.TestCase):
+    """The ast backend yields exactly the specs of the LibCST backend."""
+
+    def assert_parity(self, source: str) -> None:
+        """Compare both backends on a source string."""
+        self.assertEqual(
+            extract_tools_from_code(source, backend="ast"),
+            extract_tools_from_code(source, backend="libcst"),
+        )
+
+    def test_edge_cases(self):
+        """Annotations, docstrings and nesting match, including odd forms."""
+        self.assert_parity(EDGE_CASES)
+        self.assert_parity(EDGE_CASES.replace("\n", "\r\n"))
+        names = [t["qualified_name"] for t in extract_tools_from_code(EDGE_CASES)]
+        self.assertIn("Outer.Inner.deep", names)
+        self.assertNotIn("inner", names)
+
+    def test_agentix_sources(self):
+        """Every module of this package extracts identically."""
+        paths = glob.glob(os.path.join(SRC_DIR, "**", "*.py"), recursive=True)
+        self.assertTrue(paths)
+        for path in paths:
+            with open(path, "r", encoding="utf8") as f:
+                source = f.read()
+            with self.subTest(path=os.path.relpath(path, SRC_DIR)):
+                self.assert_parity(source)
+
+    def test_ast_backend_without_libcst(self):
+        """The default backend never imports LibCST."""
+        with patch.dict(sys.modules, {"libcst": None}):
+            tools = ToolExtractor().from_code(EDGE_CASES)
+        self.assertEqual(
+            tools[0].parameters_schema["properties"]["b"]["type"], '"Forward"'
+        )
+
+    def test_unknown_backend(self):
+        """Unknown backends are rejected."""
+        with self.assertRaises(ValueError):
+            ToolExtractor(backend="regex")
+
+
+if __name__ == "__main__":
+    unittest.main()
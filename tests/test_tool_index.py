@@ -0,0 +1,106 @@
+"""Tests for the watched, incrementally refreshed tool index."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from agentix.tools import tool_index
+from agentix.tools.describe_tools import cache, discovery
+
+
+class TestToolIndex(unittest.TestCase):
+    """Test ToolIndex refreshes and watching."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "lib")
+        os.makedirs(self.root)
+        self.write("a.py", "def alpha(x: int) -> int:\n    return x\n")
+        self.write("b.py", "def beta() -> None:\n    pass\n")
+        # keep the index's schema cache out of the user's cache directory
+        schema_cache = cache.ToolSchemaCache(os.path.join(self.tmp.name, "cache"))
+        patcher = patch.object(cache, "_TOOL_SCHEMA_CACHE", schema_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index = tool_index.ToolIndex(poll_interval=0.05)
+        self.addCleanup(self.index.stop)
+
+    def write(self, name: str, source: str) -> None:
+        """Write a module, bumping its mtime so the change is always seen."""
+        path = os.path.join(self.root, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def names(self) -> list[str]:
+        """Return the qualified names of the indexed tools."""
+        specs, _ = self.index.tools([self.root])
+        return [spec.qualified_name for spec in specs]
+
+    def wait_for(self, version: int) -> None:
+        """Wait for the background thread to swap in a new snapshot."""
+        deadline = time.monotonic() + 5
+        while self.index.version <= version and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreater(self.index.version, version)
+
+    def test_only_changed_files_are_extracted(self):
+        """A refresh re-extracts changed files and reuses the rest."""
+        self.assertEqual(self.names(), ["a.alpha", "b.beta"])
+        specs, tools = self.index.tools([self.root])
+        self.assertFalse(self.index.refresh())
+        self.write("b.py", f"def gamma() -> None:\n    pass  # {time.time()}\n")
+        with patch.object(
+            discovery, "build_entry", wraps=discovery.build_entry
+        ) as build:
+            self.assertTrue(self.index.refresh())
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(self.names(), ["a.alpha", "b.gamma"])
+        # readers holding the previous snapshot are unaffected
+        self.assertEqual([s.qualified_name for s in specs], ["a.alpha", "b.beta"])
+        self.assertEqual(tools[0]["function"]["name"], "a__alpha")
+
+    def test_deleted_and_unknown_sources(self):
+        """Deleted files drop out; unknown sources have no tools."""
+        self.names()
+        os.remove(os.path.join(self.root, "b.py"))
+        self.index.refresh()
+        self.assertEqual(self.names(), ["a.alpha"])
+        self.assertEqual(self.index.tools(["no_such_tool_source"]), ([], []))
+
+    def test_watcher_picks_up_changes(self):
+        """The background thread (inotify, or polling) swaps in new tools."""
+        self.names()
+        mode = self.index.start()
+        self.assertIn(mode, ("inotify", "polling"))
+        version = self.index.version
+        self.write("c.py", "def delta() -> None:\n    pass\n")
+        self.wait_for(version)
+        self.assertIn("c.delta", self.names())
+
+    def test_sources_added_after_start_are_watched(self):
+        """Sources first indexed while the watcher runs are watched at once."""
+        self.index.start()
+        self.names()
+        version = self.index.version
+        self.write("c.py", "def delta() -> None:\n    pass\n")
+        self.wait_for(version)
+        self.assertIn("c.delta", self.names())
+
+    def test_polling_fallback(self):
+        """Without inotify the index is polled."""
+        self.names()
+        with patch.object(tool_index, "_Inotify", side_effect=OSError("no inotify")):
+            self.assertEqual(self.index.start(), "polling")
+        version = self.index.version
+        self.write("a.py", "def alpha2() -> None:\n    pass\n")
+        self.wait_for(version)
+        self.assertEqual(self.names(), ["a.alpha2", "b.beta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Tests for the lazy tool registry."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentix.next_steps.plan_steps import PlanAction, PlanStep
+from agentix.tools.describe_tools import (
+    ToolSchemaCache,
+    cache,
+    extract_tools_from_directory,
+)
+from agentix.tools.registry import ToolRegistry, tool_registry
+
+TOOLS = '''
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+def _helper():
+    return None
+
+
+class Counter:
+    count = 0
+
+    def increment(self, by: int = 1) -> int:
+        self.count += by
+        return self.count
+
+    @staticmethod
+    def zero() -> int:
+        return 0
+'''
+
+
+class TestToolRegistry(unittest.TestCase):
+    """Test ToolRegistry dispatch."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # tool_registry() reads through the process-wide schema cache
+        schema_cache = ToolSchemaCache(os.path.join(self.tmp.name, "cache"))
+        patcher = patch.object(cache, "_TOOL_SCHEMA_CACHE", schema_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        package = os.path.join(self.tmp.name, "regpkg")
+        os.makedirs(package)
+        for name, source in {"__init__.py": "", "math_tools.py": TOOLS}.items():
+            with open(os.path.join(package, name), "w", encoding="utf-8") as f:
+                f.write(source)
+        sys.path.insert(0, self.tmp.name)
+        self.addCleanup(sys.path.remove, self.tmp.name)
+        self.addCleanup(
+            lambda: [sys.modules.pop(m, None) for m in ("regpkg", "regpkg.math_tools")]
+        )
+        self.specs = extract_tools_from_directory(
+            package, package="regpkg", cache=ToolSchemaCache(None)
+        )
+
+    def test_lazy_import_and_cached_dispatch(self):
+        """Modules load on the first call; callables are then cached."""
+        registry = ToolRegistry(self.specs)
+        self.assertIn("regpkg__math_tools__add", registry)
+        self.assertNotIn("regpkg__math_tools___helper", registry)
+        self.assertNotIn("regpkg.math_tools", sys.modules)
+        self.assertEqual(
+            registry.call("regpkg__math_tools__add", '{"a": 2, "b": 3}'), 5
+        )
+        self.assertIn("regpkg.math_tools", sys.modules)
+        self.assertIs(
+            registry.resolve("regpkg__math_tools__add"),
+            registry.callables["regpkg__math_tools__add"],
+        )
+
+    def test_methods_and_bound_instances(self):
+        """Static methods resolve on the class, others on a bound instance."""
+        registry = ToolRegistry(self.specs)
+        self.assertEqual(registry.call("regpkg__math_tools__Counter__zero"), 0)
+        counter = sys.modules["regpkg.math_tools"].Counter()
+        registry.bind("Counter", counter)
+        registry.call("regpkg__math_tools__Counter__increment", {"by": 2})
+        self.assertEqual(counter.count, 2)
+
+    def test_unknown_tool(self):
+        """Unknown names are rejected."""
+        with self.assertRaises(ValueError):
+            ToolRegistry().resolve("missing")
+
+    def test_plan_step_dispatch(self):
+        """Tool steps call their tool through the registry."""
+        step = PlanStep(
+            "step-1",
+            PlanAction.tool,
+            "regpkg__math_tools__add",
+            {"a": 1, "b": 1},
+            {},
+            [],
+        )
+        self.assertEqual(step.do_action(ToolRegistry(self.specs)), 2)
+        self.assertEqual(step.outputs, 2)
+
+    def test_builtin_registry_unqualified_names(self):
+        """The built-in tools are registered under the names the model sees."""
+        self.assertIn("cst_tree", tool_registry())
+
+    def test_registry_matches_tool_sources(self):
+        """Dispatch follows the sources the prompt described the tools from."""
+        ast_registry = tool_registry(["ast"])
+        self.assertEqual(
+            ast_registry.resolve("class_implements").__module__,
+            "agentix.tools.ast_tools",
+        )
+        self.assertIs(tool_registry(["ast"]), ast_registry)
+        directory = os.path.join(self.tmp.name, "loose")
+        os.makedirs(directory)
+        with open(
+            os.path.join(directory, "loose_tools.py"), "w", encoding="utf-8"
+        ) as f:
+            f.write(TOOLS)
+        self.addCleanup(sys.modules.pop, "loose_tools", None)
+        registry = tool_registry([directory])
+        self.assertEqual(registry.call("loose_tools__add", {"a": 1, "b": 2}), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
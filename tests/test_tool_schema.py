@@ -0,0 +1,163 @@
+"""Tests for tool parameter JSON Schema and argument validation."""
+
+import inspect
+import json
+import timeit
+import unittest
+
+from agentix.tools.describe_tools import (
+    ToolArgumentError,
+    annotation_schema,
+    extract_tools_from_code,
+    parameters_json_schema,
+    to_openai_tools,
+    validate_arguments,
+)
+from agentix.tools.registry import ToolRegistry
+
+SOURCE = '''
+from typing import Literal, Optional
+
+
+class Files:
+    def grep(
+        self,
+        pattern: str,
+        paths: list[str],
+        max_count: Optional[int] = None,
+        mode: Literal["fast", "exact"] = "fast",
+        ignore_case: bool = False,
+        options=None,
+    ) -> dict[str, list[int]]:
+        """Search files."""
+        return {}
+'''
+
+
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+def scale(value: float, *, factor: float, offset: float = 0.0) -> float:
+    """Scale a number; rejects a zero factor."""
+    if not factor:
+        raise ValueError("factor must not be zero")
+    return value * factor + offset
+
+
+class TestAnnotationSchema(unittest.TestCase):
+    """Test annotation_schema and parameters_json_schema."""
+
+    def test_annotation_mapping(self):
+        """Annotation text maps to JSON Schema; unknown types accept anything."""
+        self.assertEqual(
+            annotation_schema("List[str]"),
+            {"type": "array", "items": {"type": "string"}},
+        )
+        self.assertEqual(
+            annotation_schema("int | None"),
+            {"anyOf": [{"type": "integer"}, {"type": "null"}]},
+        )
+        self.assertEqual(
+            annotation_schema("Dict[str, float]"),
+            {"type": "object", "additionalProperties": {"type": "number"}},
+        )
+        self.assertEqual(annotation_schema('"cst.Module"'), {})
+        self.assertEqual(annotation_schema("Optional[Any]"), {})
+
+    def test_parameters_json_schema(self):
+        """The receiver is dropped and parameters without defaults are required."""
+        spec = extract_tools_from_code(SOURCE, return_dicts=False)[0]
+        schema = parameters_json_schema(spec)
+        self.assertNotIn("self", schema["properties"])
+        self.assertEqual(schema["required"], ["pattern", "paths"])
+        self.assertEqual(schema["properties"]["mode"], {"enum": ["fast", "exact"]})
+        self.assertEqual(schema["properties"]["options"], {})
+        rendered = to_openai_tools([spec], json_schema=True)[0]["function"]
+        self.assertEqual(rendered["parameters"], schema)
+
+
+class TestValidateArguments(unittest.TestCase):
+    """Test validate_arguments and registry dispatch."""
+
+    def setUp(self):
+        self.spec = extract_tools_from_code(SOURCE, return_dicts=False)[0]
+
+    def test_common_mismatches_coerced(self):
+        """Numeric strings, boolean strings and bare values are coerced."""
+        arguments = validate_arguments(
+            self.spec,
+            json.dumps(
+                {
+                    "pattern": 42,
+                    "paths": "a.py",
+                    "max_count": "3",
+                    "ignore_case": "true",
+                }
+            ),
+        )
+        self.assertEqual(
+            arguments,
+            {"pattern": "42", "paths": ["a.py"], "max_count": 3, "ignore_case": True},
+        )
+        self.assertIsNone(
+            validate_arguments(
+                self.spec, {"pattern": "x", "paths": [], "max_count": None}
+            )["max_count"]
+        )
+
+    def test_all_errors_reported(self):
+        """Every problem is listed in one error."""
+        with self.assertRaises(ToolArgumentError) as raised:
+            validate_arguments(
+                self.spec, {"paths": [{}], "mode": "slow", "max_count": "many", "x": 1}
+            )
+        self.assertEqual(
+            raised.exception.errors,
+            [
+                "pattern: missing",
+                "paths[0]: expected string, got dict",
+                "mode: expected one of ['fast', 'exact'], got 'slow'",
+                "max_count: expected integer or null, got str",
+                "x: unexpected argument",
+            ],
+        )
+        with self.assertRaises(ToolArgumentError):
+            validate_arguments(self.spec, "{not json")
+
+    def test_registry_returns_errors_to_the_model(self):
+        """Invalid calls fail before the tool runs, fast, as a tool message."""
+        spec = extract_tools_from_code(inspect.getsource(add), return_dicts=False)[0]
+        registry = ToolRegistry([spec], module=__name__)
+        self.assertEqual(registry.tool_result("add", '{"a": "2", "b": 3}'), "5")
+        error = json.loads(registry.tool_result("add", '{"a": "two"}'))["error"]
+        self.assertIn("a: expected integer, got str", error)
+        self.assertIn("b: missing", error)
+        error = json.loads(registry.tool_result("sub", "{}"))["error"]
+        self.assertEqual(error, "Unknown tool: sub")
+        validator = registry.validator("add")
+        seconds = min(timeit.repeat(lambda: validator({"a": "x"}), number=1000))
+        self.assertLess(seconds / 1000, 1e-4)
+
+    def test_keyword_only_parameters(self):
+        """Keyword-only parameters are in the schema and can be passed."""
+        spec = extract_tools_from_code(inspect.getsource(scale), return_dicts=False)[0]
+        schema = parameters_json_schema(spec)
+        self.assertEqual(list(schema["properties"]), ["value", "factor", "offset"])
+        self.assertEqual(schema["required"], ["value", "factor"])
+        registry = ToolRegistry([spec], module=__name__)
+        self.assertEqual(
+            registry.tool_result("scale", '{"value": 2, "factor": 3}'), "6.0"
+        )
+
+    def test_tool_errors_are_not_argument_errors(self):
+        """A ValueError raised by the tool itself propagates to the caller."""
+        spec = extract_tools_from_code(inspect.getsource(scale), return_dicts=False)[0]
+        registry = ToolRegistry([spec], module=__name__)
+        with self.assertRaisesRegex(ValueError, "factor must not be zero"):
+            registry.tool_result("scale", '{"value": 2, "factor": 0}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for the tool schema cache."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from agentix.tools.describe_tools import ToolSpec, cache
+
+TOOLS = '''
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+'''
+
+
+class TestToolSchemaCache(unittest.TestCase):
+    """Test ToolSchemaCache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "my_tools.py")
+        self._write(TOOLS)
+        self.directory = os.path.join(self.tmp.name, "cache")
+
+    def _write(self, source: str) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(source)
+
+    def test_specs_and_openai_tools(self):
+        """Entries hold the ToolSpec fields and the rendered OpenAI tools."""
+        entry = cache.ToolSchemaCache(self.directory).get(self.path)
+        spec = ToolSpec(**entry["specs"][0])
+        self.assertEqual(spec.qualified_name, "add")
+        self.assertEqual(entry["openai"][0]["function"]["name"], "add")
+        self.assertEqual(
+            entry["openai"][0]["function"]["description"], "Add two numbers."
+        )
+
+    def test_disk_hit_skips_extraction_and_libcst(self):
+        """A fresh process (empty memory tier) is served from disk without LibCST."""
+        expected = cache.ToolSchemaCache(self.directory).get(self.path)
+        with (
+            patch.dict(sys.modules, {"libcst": None}),
+            patch(
+                "agentix.tools.describe_tools.tools.extract_tools_from_code",
+                side_effect=AssertionError("parsed on a cache hit"),
+            ),
+        ):
+            self.assertEqual(
+                cache.ToolSchemaCache(self.directory).get(self.path), expected
+            )
+
+    def test_changed_source_or_version_misses(self):
+        """Editing the module or upgrading agentix invalidates the entry."""
+        tool_cache = cache.ToolSchemaCache(None)
+        self.assertEqual(len(tool_cache.get(self.path)["specs"]), 1)
+        self._write(TOOLS + "\n\ndef sub(a, b):\n    return a - b\n")
+        self.assertEqual(len(tool_cache.get(self.path)["specs"]), 2)
+        with patch.object(cache, "agentix_version", return_value="9.9.9"):
+            self.assertNotEqual(
+                cache.ToolSchemaCache(None).key(b"x"), tool_cache.key(b"x")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for relevance-filtered tool selection."""
+
+import json
+import unittest
+
+from agentix.tools.describe_tools import (
+    ToolSpec,
+    is_public_tool,
+    render_tools,
+    select_tools,
+)
+
+
+def spec(name: str, doc: str = "", class_name: str | None = None) -> ToolSpec:
+    """Build a ToolSpec for a function or method."""
+    return ToolSpec(
+        name=name,
+        description=doc,
+        docstring=doc,
+        parameters_schema={"type": "object", "properties": {}},
+        returns=None,
+        qualified_name=f"{class_name}.{name}" if class_name else name,
+        is_method=class_name is not None,
+        class_name=class_name,
+    )
+
+
+SPECS = [
+    spec("rename_function", "Rename a function definition."),
+    spec("_extract_params_schema", "Extract the parameter schema."),
+    spec("leave_ClassDef", "Add a decorator to classes.", "AddDecorator"),
+    spec("add_decorator", "Add a decorator to a function."),
+    spec("remove_import", "Remove an import statement."),
+]
+TOOLS = [
+    {"type": "function", "function": {"name": s.qualified_name, "doc": s.docstring}}
+    for s in SPECS
+]
+
+
+class TestToolSelection(unittest.TestCase):
+    """Test is_public_tool and select_tools."""
+
+    def test_private_helpers_and_visitor_hooks_excluded(self):
+        """Underscore names and LibCST visitor hooks are not tools."""
+        self.assertEqual(
+            [s.name for s in SPECS if is_public_tool(s)],
+            ["rename_function", "add_decorator", "remove_import"],
+        )
+
+    def test_top_k_in_definition_order(self):
+        """The most relevant tools are kept, in the order they are defined."""
+        selected = select_tools(SPECS, TOOLS, "remove the decorator", top_k=2)
+        self.assertEqual(
+            [t["function"]["name"] for t in selected],
+            ["add_decorator", "remove_import"],
+        )
+
+    def test_unmatched_query_keeps_first_tools(self):
+        """Without a match, the first public tools are described."""
+        selected = select_tools(SPECS, TOOLS, "zzz", top_k=1)
+        self.assertEqual(selected, [TOOLS[0]])
+
+    def test_budget_and_compact_rendering(self):
+        """Tools beyond the token budget are dropped; JSON has no whitespace."""
+        size = len(render_tools([TOOLS[3]])) // 4
+        selected = select_tools(SPECS, TOOLS, "decorator", budget=size)
+        self.assertEqual(selected, [TOOLS[3]])
+        rendered = render_tools(selected)
+        self.assertNotIn(" ", rendered.replace(TOOLS[3]["function"]["doc"], ""))
+        self.assertEqual(json.loads(rendered), selected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests for in-process validation of generated code."""
+
+import os
+import tempfile
+import unittest
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from agentix import file_utils
+from agentix.edits import validate
+
+CLEAN = (
+    'import os\n\n\ndef cwd() -> str:\n    """Return the cwd."""\n'
+    "    return os.getcwd()\n"
+)
+
+
+class TestValidateSource(unittest.TestCase):
+    """Test validate_source and validate_sources."""
+
+    def test_clean_source_has_no_diagnostics(self):
+        """Formatted, lint-free code validates cleanly."""
+        result = validate.validate_source(CLEAN, "clean.py")
+        self.assertTrue(result.ok)
+        self.assertEqual(result.formatted, CLEAN)
+
+    def test_diagnostics_from_each_tool(self):
+        """isort, black and flake8 findings are reported with their codes."""
+        result = validate.validate_source("import sys\nimport os\nx=y\n", "bad.py")
+        codes = {(d.tool, d.code) for d in result.diagnostics}
+        self.assertIn(("isort", "I001"), codes)
+        self.assertIn(("black", "BLK100"), codes)
+        self.assertIn(("flake8", "F401"), codes)
+        self.assertIn(("flake8", "F821"), codes)
+        self.assertIn(("flake8", "E225"), codes)
+        self.assertEqual(result.formatted, "import os\nimport sys\n\nx = y\n")
+        self.assertEqual(result.to_dict()["path"], "bad.py")
+
+    def test_syntax_error_stops_validation(self):
+        """Code that does not parse gets a single error diagnostic."""
+        result = validate.validate_source("def f(:\n", "broken.py")
+        self.assertEqual([d.code for d in result.diagnostics], ["E999"])
+        self.assertEqual(result.diagnostics[0].severity, "error")
+        self.assertIsNone(result.formatted)
+
+    def test_results_cached_by_content(self):
+        """The same content is validated once, whatever its path."""
+        source = "value = 42\n"
+        validate.validate_source(source, "one.py")
+        with patch.object(validate, "_validate") as run:
+            result = validate.validate_source(source, "two.py")
+            batch = validate.validate_sources({"three.py": source})
+            run.assert_not_called()
+        self.assertEqual(result.path, "two.py")
+        self.assertTrue(batch["three.py"].ok)
+
+    def test_cache_is_bounded(self):
+        """Only the most recently used results are kept."""
+        with (
+            patch.object(validate, "_RESULTS", OrderedDict()) as results,
+            patch.object(validate, "VALIDATION_CACHE_SIZE", 2),
+        ):
+            for source in ("a = 1\n", "b = 2\n", "a = 1\n", "c = 3\n"):
+                validate.validate_source(source, validators=("syntax",))
+            self.assertEqual(len(results), 2)
+            with patch.object(validate, "_validate") as run:
+                validate.validate_source("a = 1\n", validators=("syntax",))
+            run.assert_not_called()
+
+    def test_validate_sources_in_order(self):
+        """Batches come back keyed by path in input order."""
+        results = validate.validate_sources(
+            {"b.py": "import os\n", "a.py": CLEAN}, max_workers=1
+        )
+        self.assertEqual(list(results), ["b.py", "a.py"])
+        self.assertEqual(
+            validate.format_diagnostics(list(results.values())),
+            "b.py:1:1: F401 'os' imported but unused",
+        )
+
+
+class TestValidateEdits(unittest.TestCase):
+    """Test validation of replaced files."""
+
+    def test_replace_file_content_returns_diagnostics(self):
+        """With validate_edits, the replaced file's diagnostics are returned."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mod.py")
+            args = SimpleNamespace(file_path=[path], validate_edits=True)
+            with patch("sys.stderr"):
+                result = file_utils.replace_file_content(
+                    args, {"name": path, "data": "import os\n"}
+                )
+        self.assertEqual([d.code for d in result.diagnostics], ["F401"])
+
+
+if __name__ == "__main__":
+    unittest.main()